@@ -0,0 +1,138 @@
+"""
+Management command untuk benchmark forecasting dengan series sintetis
+Usage: python manage.py benchmark_prediksi [--lengths 36,60,120] [--series 1,10]
+       [--methods SES,DES,TES,TES_BATCH,HYBRID] [--repeat 5] [--format json|markdown]
+       [--output laporan.json] [--baseline baseline.json --tolerance 1.5]
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crud.services.benchmark_service import BenchmarkService
+from crud.services.exponential_smoothing import DEFAULT_SPEED, SPEED_PRESETS
+
+
+def _int_list(value):
+    try:
+        return [int(v) for v in value.split(',') if v.strip()]
+    except ValueError:
+        raise CommandError(f'Daftar angka tidak valid: {value}')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark waktu fit, forecast, dan metrik (p50/p95, peak memori) dengan series sintetis'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lengths',
+            default=','.join(map(str, BenchmarkService.DEFAULT_LENGTHS)),
+            help='Panjang series (bulan), dipisah koma (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--series',
+            default=','.join(map(str, BenchmarkService.DEFAULT_SERIES)),
+            help='Jumlah series per kasus, dipisah koma (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--methods',
+            default=','.join(BenchmarkService.METHODS),
+            help='Metode yang di-benchmark, dipisah koma (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=BenchmarkService.DEFAULT_REPEAT,
+            help='Jumlah pengukuran per fase (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--speed',
+            choices=list(SPEED_PRESETS),
+            default=DEFAULT_SPEED,
+            help='Preset kecepatan fitting (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed series sintetis (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['json', 'markdown'],
+            default='markdown',
+            help='Format laporan (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Tulis laporan ke file (default: stdout)'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Laporan JSON sebelumnya; gagal jika p50 melebihi tolerance x baseline'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=1.5,
+            help='Rasio p50 terhadap baseline yang dianggap regresi (default: %(default)s)'
+        )
+
+    def handle(self, *args, **options):
+        methods = [m.strip().upper() for m in options['methods'].split(',') if m.strip()]
+        invalid = [m for m in methods if m not in BenchmarkService.METHODS]
+        if invalid:
+            raise CommandError(
+                f"Metode tidak valid: {', '.join(invalid)}. "
+                f"Pilihan: {', '.join(BenchmarkService.METHODS)}"
+            )
+        series_counts = _int_list(options['series'])
+        if not series_counts or min(series_counts) < 1:
+            raise CommandError('--series minimal 1')
+
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Baseline tidak bisa dibaca: {e}')
+
+        progress = lambda label: self.stderr.write(f'  {label}')
+        try:
+            report = BenchmarkService.run(
+                methods=methods,
+                lengths=_int_list(options['lengths']),
+                series_counts=series_counts,
+                repeat=options['repeat'],
+                speed=options['speed'],
+                seed=options['seed'],
+                progress=progress if options['verbosity'] > 1 else None,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if baseline is not None:
+            report['regressions'] = BenchmarkService.compare(report, baseline, options['tolerance'])
+
+        if options['format'] == 'json':
+            content = json.dumps(report, indent=2) + '\n'
+        else:
+            content = BenchmarkService.to_markdown(report)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(content)
+            self.stdout.write(self.style.SUCCESS(
+                f"Laporan {len(report['results'])} baris ditulis ke {options['output']}"
+            ))
+        else:
+            self.stdout.write(content, ending='')
+
+        regressions = report.get('regressions')
+        if regressions:
+            for row in regressions:
+                self.stderr.write(
+                    f"  {row['method']} panjang={row['length']} series={row['series']} {row['phase']}: "
+                    f"p50 {row['p50_ms']:.3f} ms vs baseline {row['baseline_p50_ms']:.3f} ms ({row['ratio']}x)"
+                )
+            raise CommandError(f'{len(regressions)} regresi melebihi tolerance {options["tolerance"]}x')
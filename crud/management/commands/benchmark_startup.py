@@ -0,0 +1,106 @@
+"""
+Management command untuk mengukur waktu startup aplikasi (import fera.wsgi)
+Usage: python manage.py benchmark_startup [--repeat 5] [--json]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Modul berat yang seharusnya tidak ikut ter-load saat startup
+HEAVY_MODULES = ('statsmodels', 'scipy', 'pandas', 'numpy')
+
+# Dijalankan di proses Python baru supaya tidak ada modul yang sudah ter-cache
+PROBE = '''
+import json, sys, time
+HEAVY = {heavy!r}
+phases = []
+def mark(name, start):
+    phases.append({{
+        'phase': name,
+        'ms': (time.perf_counter() - start) * 1000,
+        'heavy_loaded': [m for m in HEAVY if m in sys.modules],
+    }})
+start = time.perf_counter()
+import fera.wsgi
+mark('wsgi', start)
+start = time.perf_counter()
+from django.conf import settings
+__import__(settings.ROOT_URLCONF)
+mark('urlconf', start)
+start = time.perf_counter()
+from crud.services.engine_registry import EngineRegistry
+EngineRegistry.preload()
+mark('engine', start)
+print(json.dumps(phases))
+'''
+
+PHASE_LABELS = {
+    'wsgi': 'import fera.wsgi (worker boot)',
+    'urlconf': 'import ROOT_URLCONF (request pertama / system check)',
+    'engine': 'load engine forecasting (prediksi pertama)',
+}
+
+
+class Command(BaseCommand):
+    help = 'Mengukur waktu import fera.wsgi, URLconf, dan engine forecasting di proses baru'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Jumlah pengukuran (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Tampilkan hasil dalam format JSON'
+        )
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        if repeat < 1:
+            raise CommandError('--repeat minimal 1')
+
+        env = os.environ.copy()
+        env['DJANGO_SETTINGS_MODULE'] = settings.SETTINGS_MODULE
+        base_dir = str(settings.BASE_DIR)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [base_dir, env.get('PYTHONPATH')]))
+        code = PROBE.format(heavy=HEAVY_MODULES)
+
+        runs = []
+        for _ in range(repeat):
+            completed = subprocess.run(
+                [sys.executable, '-c', code],
+                cwd=base_dir, env=env, capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                raise CommandError(f'Probe startup gagal:\n{completed.stderr}')
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+        report = []
+        for index, phase in enumerate(runs[0]):
+            timings = [run[index]['ms'] for run in runs]
+            report.append({
+                'phase': phase['phase'],
+                'median_ms': round(statistics.median(timings), 1),
+                'min_ms': round(min(timings), 1),
+                'heavy_loaded': phase['heavy_loaded'],
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps({'repeat': repeat, 'phases': report}, indent=2))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'Startup benchmark ({repeat}x, proses baru)'))
+        for row in report:
+            heavy = ', '.join(row['heavy_loaded']) or '-'
+            self.stdout.write(
+                f"  {PHASE_LABELS[row['phase']]:<55} median {row['median_ms']:>8.1f} ms  "
+                f"min {row['min_ms']:>8.1f} ms  modul berat: {heavy}"
+            )
@@ -16,6 +16,7 @@ from crud.models import (
     Kecamatan, Kelurahan, JenisKendaraan, MerekKendaraan, TypeKendaraan,
     WajibPajak, KendaraanBermotor, DataPajakKendaraan, TransaksiPajak
 )
+from crud.services.agregat_service import AgregatService
 
 
 class Command(BaseCommand):
@@ -94,9 +95,14 @@ class Command(BaseCommand):
                 'skipped': 0
             }
 
+            agregat = None
             if not dry_run:
                 with transaction.atomic():
-                    self._import_data(df, stats, skip_errors, skip_incomplete)
+                    # Agregat tidak dipelihara per baris; periode yang berubah
+                    # di-rebuild sekali setelah semua baris diimport
+                    with AgregatService.deferred() as periods:
+                        self._import_data(df, stats, skip_errors, skip_incomplete)
+                    agregat = AgregatService.rebuild_periods(periods)
             else:
                 self._import_data(df, stats, skip_errors, skip_incomplete)
 
@@ -107,6 +113,8 @@ class Command(BaseCommand):
             self.stdout.write(f'  Updated: {stats["updated"]}')
             self.stdout.write(f'  Errors: {stats["errors"]}')
             self.stdout.write(f'  Skipped: {stats["skipped"]}')
+            if agregat is not None:
+                self.stdout.write(f'  Agregat di-rebuild: {len(agregat["periods"])} periode')
             self.stdout.write('='*50)
 
         except Exception as e:
@@ -0,0 +1,91 @@
+"""
+Management command untuk precompute prediksi semua series x metode (dijadwalkan malam hari)
+Usage: python manage.py precompute_prediksi [--metode SES,DES,TES] [--horizon 12] [--workers 4] [--jenis ID] [--online]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from crud.services.precompute_service import PrecomputeService
+from crud.services.worker_pool import WorkerPool
+
+
+class Command(BaseCommand):
+    help = 'Precompute prediksi semua series (global + per jenis) x metode untuk N bulan ke depan ke HasilPrediksi'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metode',
+            default=','.join(PrecomputeService.METHODS),
+            help='Daftar metode dipisah koma (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--horizon',
+            type=int,
+            default=PrecomputeService.DEFAULT_HORIZON,
+            help='Jumlah bulan setelah data agregat terakhir (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=WorkerPool.DEFAULT_MAX_WORKERS,
+            help='Jumlah process worker, 1 = serial (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--jenis',
+            type=int,
+            help='Hanya precompute series jenis kendaraan ini'
+        )
+        parser.add_argument(
+            '--seasonal-periods',
+            type=int,
+            default=12,
+            help='Periode musiman TES (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--online',
+            action='store_true',
+            help='Forecast dari state tersimpan yang dimajukan dengan bulan baru (tanpa fitting ulang)'
+        )
+
+    def handle(self, *args, **options):
+        # Command berjalan single-thread: fork aman dan worker mewarisi modul yang sudah di-load
+        WorkerPool.configure('fork')
+        methods = [m.strip().upper() for m in options['metode'].split(',') if m.strip()]
+        invalid = [m for m in methods if m not in PrecomputeService.METHODS]
+        if not methods or invalid:
+            raise CommandError('Metode harus salah satu dari: ' + ', '.join(PrecomputeService.METHODS))
+        if not 1 <= options['horizon'] <= 24:
+            raise CommandError('--horizon harus antara 1 dan 24')
+        if options['workers'] < 1:
+            raise CommandError('--workers minimal 1')
+
+        try:
+            result = PrecomputeService.precompute(
+                methods=methods,
+                horizon=options['horizon'],
+                jenis_kendaraan_id=options['jenis'],
+                seasonal_periods=options['seasonal_periods'],
+                workers=options['workers'],
+                online=options['online']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        periods = result['periods']
+        self.stdout.write(
+            f"Periode {periods[0]['tahun']}-{periods[0]['bulan']:02d} s/d "
+            f"{periods[-1]['tahun']}-{periods[-1]['bulan']:02d}, "
+            f"{result['series']} series x {len(methods)} metode"
+        )
+        online = result['online']
+        if online:
+            self.stdout.write(
+                f"State: {online['update']} update online, {online['fit']} fit baru, "
+                f"{online['refit']} fit ulang, {online['unchanged']} tidak berubah"
+            )
+        for task, message in result['errors'].items():
+            self.stdout.write(self.style.WARNING(f'  {task}: {message}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai dalam {result['elapsed_ms'] / 1000:.1f} detik. "
+            f"{result['created']} dibuat, {result['updated']} diperbarui, {len(result['errors'])} gagal"
+        ))
@@ -0,0 +1,39 @@
+"""
+Management command untuk rebuild AgregatPendapatanBulanan pada periode dirty
+Usage: python manage.py refresh_agregat [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+
+from crud.services.agregat_service import AgregatService
+from crud.services.model_cache import FittedModelCache
+
+
+class Command(BaseCommand):
+    help = 'Rebuild agregat pendapatan bulanan hanya untuk periode yang berubah (dirty)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Tampilkan periode dirty tanpa melakukan rebuild'
+        )
+
+    def handle(self, *args, **options):
+        periods = AgregatService.dirty_periods()
+
+        if not periods:
+            self.stdout.write(self.style.SUCCESS('Tidak ada periode dirty'))
+            return
+
+        self.stdout.write(f'{len(periods)} periode dirty: ' + ', '.join(f'{t}-{b:02d}' for t, b in periods))
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - Tidak ada agregat yang di-rebuild'))
+            return
+
+        result = AgregatService.rebuild_periods(periods)
+        FittedModelCache.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Selesai. {result["records"]} record per-jenis dan '
+            f'{result["global_records"]} record global dibuat ulang'
+        ))
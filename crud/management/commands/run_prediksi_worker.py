@@ -0,0 +1,107 @@
+"""
+Management command untuk menjalankan worker antrian PrediksiJob
+Usage: python manage.py run_prediksi_worker [--workers 4] [--poll-interval 2] [--once]
+"""
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from crud.services.prediksi_job_service import PrediksiJobService, run_job
+from crud.services.worker_pool import WorkerPool
+
+
+class Command(BaseCommand):
+    help = 'Menjalankan worker lokal yang memproses antrian PrediksiJob di process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=WorkerPool.DEFAULT_MAX_WORKERS,
+            help='Jumlah process worker (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Jeda (detik) antar pengecekan job baru (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Proses job yang ada lalu berhenti'
+        )
+
+    def handle(self, *args, **options):
+        # Command berjalan single-thread: fork aman dan worker mewarisi modul yang sudah di-load
+        WorkerPool.configure('fork')
+        workers = WorkerPool.resolve_workers(options['workers'])
+        poll_interval = options['poll_interval']
+        once = options['once']
+        worker_name = f'{socket.gethostname()}:{os.getpid()}'
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Worker {worker_name} berjalan dengan {workers} process')
+        )
+
+        executor = WorkerPool.get(workers)
+        running = {}
+        processed = 0
+
+        try:
+            while True:
+                PrediksiJobService.requeue_stale()
+                job_ids = PrediksiJobService.claim(workers - len(running), worker_name)
+
+                # Tutup koneksi sebelum fork agar proses worker tidak berbagi socket database
+                connections.close_all()
+
+                for job_id in job_ids:
+                    running[executor.submit(run_job, job_id)] = job_id
+                    self.stdout.write(f'Job #{job_id} diproses')
+
+                if not running:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job_id = running.pop(future)
+                    processed += 1
+                    try:
+                        job_status = future.result()
+                    except BrokenProcessPool as e:
+                        broken = True
+                        PrediksiJobService.release(job_id, str(e) or 'Process worker berhenti')
+                        self.stdout.write(self.style.WARNING(f'Job #{job_id} diantrikan ulang (process pool rusak)'))
+                        continue
+                    except Exception as e:
+                        PrediksiJobService.release(job_id, str(e))
+                        self.stdout.write(self.style.ERROR(f'Job #{job_id} error: {e}'))
+                        continue
+
+                    style = self.style.SUCCESS if job_status == 'SUCCESS' else self.style.ERROR
+                    self.stdout.write(style(f'Job #{job_id} {job_status}'))
+
+                # Pool rusak: job yang masih berjalan diantrikan ulang dan pool dibuat ulang
+                if broken:
+                    for job_id in running.values():
+                        PrediksiJobService.release(job_id, 'Process pool rusak')
+                    running.clear()
+                    WorkerPool.reset()
+                    executor = WorkerPool.get(workers)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Worker dihentikan, menunggu job yang sedang berjalan...'))
+            wait(running)
+        finally:
+            WorkerPool.reset()
+
+        self.stdout.write(self.style.SUCCESS(f'Selesai. {processed} job diproses'))
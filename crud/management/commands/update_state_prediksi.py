@@ -0,0 +1,86 @@
+"""
+Management command untuk memajukan state model smoothing dengan data agregat terbaru
+Usage: python manage.py update_state_prediksi [--metode SES,DES,TES] [--jenis ID]
+       [--refit-every 12] [--drift-factor 1.5] [--force-refit]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from crud.services.online_state_service import OnlineStateService
+
+
+class Command(BaseCommand):
+    help = 'Update online state SES/DES/TES dengan bulan baru; fit penuh sesuai jadwal atau saat drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metode',
+            default=','.join(OnlineStateService.METHODS),
+            help='Daftar metode dipisah koma (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--jenis',
+            type=int,
+            help='Hanya series jenis kendaraan ini'
+        )
+        parser.add_argument(
+            '--seasonal-periods',
+            type=int,
+            default=12,
+            help='Periode musiman TES (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--refit-every',
+            type=int,
+            default=OnlineStateService.REFIT_EVERY,
+            help='Fit penuh ulang setelah sekian update online (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--drift-factor',
+            type=float,
+            default=OnlineStateService.DRIFT_FACTOR,
+            help='Fit penuh ulang jika error online > faktor x MAPE fit (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--force-refit',
+            action='store_true',
+            help='Fit penuh semua series tanpa melihat jadwal/drift'
+        )
+
+    def handle(self, *args, **options):
+        methods = [m.strip().upper() for m in options['metode'].split(',') if m.strip()]
+        invalid = [m for m in methods if m not in OnlineStateService.METHODS]
+        if not methods or invalid:
+            raise CommandError('Metode harus salah satu dari: ' + ', '.join(OnlineStateService.METHODS))
+        if options['refit_every'] < 1:
+            raise CommandError('--refit-every minimal 1')
+        if options['drift_factor'] <= 0:
+            raise CommandError('--drift-factor harus lebih dari 0')
+
+        try:
+            result = OnlineStateService.sync(
+                methods=methods,
+                jenis_kendaraan_id=options['jenis'],
+                seasonal_periods=options['seasonal_periods'],
+                refit_every=options['refit_every'],
+                drift_factor=options['drift_factor'],
+                force_refit=options['force_refit']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for (key, metode), obj in result['states'].items():
+            self.stdout.write(
+                f"  {key if key is not None else 'global'}-{metode}: data s/d "
+                f"{obj.data_training_sampai:%Y-%m}, {obj.jumlah_update} update sejak fit"
+            )
+        for reason, count in result['refit_reasons'].items():
+            self.stdout.write(f'  Fit ulang ({reason}): {count}')
+        for task, message in result['errors'].items():
+            self.stdout.write(self.style.WARNING(f'  {task}: {message}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai dalam {result['elapsed_ms'] / 1000:.1f} detik. "
+            f"{result['update']} update online, {result['fit']} fit baru, "
+            f"{result['refit']} fit ulang, {result['unchanged']} tidak berubah, "
+            f"{len(result['errors'])} gagal"
+        ))
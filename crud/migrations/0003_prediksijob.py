@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-16 22:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0002_remove_kendaraanbermotor_merek'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrediksiJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipe', models.CharField(choices=[('PREDIKSI', 'Prediksi SES/DES/TES'), ('HYBRID', 'Prediksi Hybrid')], max_length=10)),
+                ('parameter', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('PENDING', 'Menunggu'), ('RUNNING', 'Diproses'), ('SUCCESS', 'Selesai'), ('FAILED', 'Gagal')], db_index=True, default='PENDING', max_length=10)),
+                ('percobaan', models.IntegerField(default=0)),
+                ('worker', models.CharField(blank=True, max_length=100, null=True)),
+                ('hasil', models.JSONField(blank=True, null=True)),
+                ('pesan_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Prediksi Job',
+                'verbose_name_plural': 'Prediksi Job',
+                'db_table': 'prediksi_job',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='hasilprediksi',
+            name='metode',
+            field=models.CharField(choices=[('SES', 'Simple Exponential Smoothing'), ('DES', 'Double Exponential Smoothing (Holt)'), ('TES', 'Triple Exponential Smoothing (Holt-Winters)')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='prediksijob',
+            name='dibuat_oleh',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='prediksijob',
+            name='hasil_prediksi',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='crud.hasilprediksi'),
+        ),
+        migrations.AddIndex(
+            model_name='prediksijob',
+            index=models.Index(fields=['status', 'created_at'], name='prediksi_jo_status_18cf37_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-16 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0003_prediksijob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgregatDirtyPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tahun', models.IntegerField()),
+                ('bulan', models.IntegerField()),
+                ('ditandai_pada', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Agregat Dirty Period',
+                'verbose_name_plural': 'Agregat Dirty Period',
+                'db_table': 'agregat_dirty_period',
+                'ordering': ['tahun', 'bulan'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='agregatdirtyperiod',
+            unique_together={('tahun', 'bulan')},
+        ),
+    ]
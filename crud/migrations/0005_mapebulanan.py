@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-16 22:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0004_agregatdirtyperiod'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapeBulanan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tahun', models.IntegerField()),
+                ('bulan', models.IntegerField()),
+                ('mape', models.FloatField(blank=True, null=True)),
+                ('jumlah_tahun', models.IntegerField(default=0)),
+                ('tanggal_hitung', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'MAPE Bulanan',
+                'verbose_name_plural': 'MAPE Bulanan',
+                'db_table': 'mape_bulanan',
+                'ordering': ['-tahun', 'bulan'],
+            },
+        ),
+        migrations.AddField(
+            model_name='mapebulanan',
+            name='jenis_kendaraan',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='crud.jeniskendaraan'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mapebulanan',
+            unique_together={('tahun', 'bulan', 'jenis_kendaraan')},
+        ),
+    ]
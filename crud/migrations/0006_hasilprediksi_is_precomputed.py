@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-16 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0005_mapebulanan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hasilprediksi',
+            name='is_precomputed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='hasilprediksi',
+            index=models.Index(fields=['is_precomputed', 'jenis_kendaraan', 'tahun_prediksi', 'bulan_prediksi', 'metode'], name='hasil_predi_is_prec_fe6e1c_idx'),
+        ),
+    ]
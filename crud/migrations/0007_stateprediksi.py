@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-16 23:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0006_hasilprediksi_is_precomputed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatePrediksi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metode', models.CharField(choices=[('SES', 'Simple Exponential Smoothing'), ('DES', 'Double Exponential Smoothing (Holt)'), ('TES', 'Triple Exponential Smoothing (Holt-Winters)')], max_length=20)),
+                ('seasonal_periods', models.IntegerField(default=12)),
+                ('alpha', models.FloatField()),
+                ('beta', models.FloatField(blank=True, null=True)),
+                ('gamma', models.FloatField(blank=True, null=True)),
+                ('best_config', models.CharField(blank=True, max_length=50, null=True)),
+                ('state', models.JSONField()),
+                ('data_training_dari', models.DateField()),
+                ('data_training_sampai', models.DateField()),
+                ('jumlah_data_training', models.IntegerField()),
+                ('fingerprint', models.CharField(max_length=40)),
+                ('mape', models.FloatField(blank=True, null=True)),
+                ('mae', models.FloatField(blank=True, null=True)),
+                ('rmse', models.FloatField(blank=True, null=True)),
+                ('error_online', models.JSONField(default=list)),
+                ('jumlah_update', models.IntegerField(default=0)),
+                ('tanggal_fit', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'State Prediksi',
+                'verbose_name_plural': 'State Prediksi',
+                'db_table': 'state_prediksi',
+                'ordering': ['metode'],
+            },
+        ),
+        migrations.AddField(
+            model_name='stateprediksi',
+            name='jenis_kendaraan',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='crud.jeniskendaraan'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='stateprediksi',
+            unique_together={('jenis_kendaraan', 'metode', 'seasonal_periods')},
+        ),
+    ]
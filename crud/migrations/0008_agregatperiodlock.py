@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0007_stateprediksi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgregatPeriodLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tahun', models.IntegerField()),
+                ('bulan', models.IntegerField()),
+            ],
+            options={
+                'verbose_name': 'Agregat Period Lock',
+                'verbose_name_plural': 'Agregat Period Lock',
+                'db_table': 'agregat_period_lock',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='agregatperiodlock',
+            unique_together={('tahun', 'bulan')},
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
 from decimal import Decimal
@@ -204,7 +204,17 @@ class KendaraanBermotor(models.Model):
         return self.data_pajak.dp_pkb_saat_ini if hasattr(self, 'data_pajak') and self.data_pajak else 0
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        # Pindahkan kontribusi transaksi ke grup agregat jenis baru (import lokal: service mengimport models)
+        from crud.services.agregat_service import AgregatService
+        
+        with transaction.atomic():
+            old_jenis_id = None
+            if self.pk:
+                old_jenis_id = KendaraanBermotor.objects.filter(pk=self.pk).values_list('jenis_id', flat=True).first()
+            super().save(*args, **kwargs)
+            if old_jenis_id is not None:
+                AgregatService.move_kendaraan(self.pk, old_jenis_id, self.jenis_id)
+        
         # Auto calculate DP PKB di DataPajakKendaraan jika ada
         if hasattr(self, 'data_pajak') and self.data_pajak:
             if self.data_pajak.njkb_saat_ini and self.data_pajak.bobot_saat_ini:
@@ -327,7 +337,23 @@ class TransaksiPajak(models.Model):
             self.opsen_pokok_bbnkb +
             self.opsen_denda_bbnkb
         )
-        super().save(*args, **kwargs)
+        
+        # Terapkan selisih ke AgregatPendapatanBulanan (import lokal: service mengimport models)
+        from crud.services.agregat_service import AgregatService
+        
+        with transaction.atomic():
+            old = AgregatService.snapshot_from_db(self.pk) if self.pk else None
+            super().save(*args, **kwargs)
+            AgregatService.apply(old, AgregatService.snapshot(self))
+    
+    def delete(self, *args, **kwargs):
+        from crud.services.agregat_service import AgregatService
+        
+        with transaction.atomic():
+            old = AgregatService.snapshot_from_db(self.pk)
+            result = super().delete(*args, **kwargs)
+            AgregatService.apply(old, None)
+        return result
 
 
 # ============================================
@@ -374,6 +400,72 @@ class AgregatPendapatanBulanan(models.Model):
         return f"{self.tahun}-{self.bulan:02d} - Rp {self.total_pendapatan:,.0f}"
 
 
+class AgregatDirtyPeriod(models.Model):
+    """Periode (tahun, bulan) yang transaksinya berubah sejak agregat terakhir di-rebuild"""
+    
+    # Periode
+    tahun = models.IntegerField()
+    bulan = models.IntegerField()
+    
+    # Metadata
+    ditandai_pada = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'agregat_dirty_period'
+        verbose_name = 'Agregat Dirty Period'
+        verbose_name_plural = 'Agregat Dirty Period'
+        unique_together = ['tahun', 'bulan']
+        ordering = ['tahun', 'bulan']
+    
+    def __str__(self):
+        return f"{self.tahun}-{self.bulan:02d}"
+
+
+class AgregatPeriodLock(models.Model):
+    """Baris kunci per periode (tahun, bulan) untuk menserialisasi update incremental agregat"""
+    
+    # Periode
+    tahun = models.IntegerField()
+    bulan = models.IntegerField()
+    
+    class Meta:
+        db_table = 'agregat_period_lock'
+        verbose_name = 'Agregat Period Lock'
+        verbose_name_plural = 'Agregat Period Lock'
+        unique_together = ['tahun', 'bulan']
+    
+    def __str__(self):
+        return f"{self.tahun}-{self.bulan:02d}"
+
+
+class MapeBulanan(models.Model):
+    """MAPE year-over-year per bulan (materialisasi untuk HybridPredictionService.get_monthly_mape)"""
+    
+    # ForeignKey (NULL = global)
+    jenis_kendaraan = models.ForeignKey(JenisKendaraan, on_delete=models.CASCADE, blank=True, null=True)
+    
+    # Tahun target prediksi; window data = tahun-tahun sebelumnya
+    tahun = models.IntegerField()
+    bulan = models.IntegerField()
+    
+    # Hasil (NULL = data window tidak cukup)
+    mape = models.FloatField(blank=True, null=True)
+    jumlah_tahun = models.IntegerField(default=0)
+    
+    # Metadata
+    tanggal_hitung = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'mape_bulanan'
+        verbose_name = 'MAPE Bulanan'
+        verbose_name_plural = 'MAPE Bulanan'
+        unique_together = ['tahun', 'bulan', 'jenis_kendaraan']
+        ordering = ['-tahun', 'bulan']
+    
+    def __str__(self):
+        return f"{self.tahun}-{self.bulan:02d} - MAPE {self.mape}"
+
+
 class HasilPrediksi(models.Model):
     """Model untuk menyimpan hasil prediksi"""
     
@@ -390,8 +482,8 @@ class HasilPrediksi(models.Model):
     tahun_prediksi = models.IntegerField(db_index=True)
     bulan_prediksi = models.IntegerField(db_index=True)
     
-    # Metode
-    metode = models.CharField(max_length=10, choices=METODE_CHOICES)
+    # Metode (termasuk HYBRID_<SCENARIO>)
+    metode = models.CharField(max_length=20, choices=METODE_CHOICES)
     
     # Hasil Prediksi
     nilai_prediksi = models.DecimalField(max_digits=20, decimal_places=2)
@@ -417,6 +509,9 @@ class HasilPrediksi(models.Model):
     jumlah_data_training = models.IntegerField()
     keterangan = models.TextField(blank=True, null=True)
     
+    # Hasil precompute terjadwal (manage.py precompute_prediksi), bukan prediksi manual
+    is_precomputed = models.BooleanField(default=False)
+    
     class Meta:
         db_table = 'hasil_prediksi'
         verbose_name = 'Hasil Prediksi'
@@ -425,6 +520,8 @@ class HasilPrediksi(models.Model):
         indexes = [
             models.Index(fields=['tahun_prediksi', 'bulan_prediksi']),
             models.Index(fields=['metode']),
+            # Lookup endpoint prediksi/precomputed/ (jenis, tahun, bulan, metode)
+            models.Index(fields=['is_precomputed', 'jenis_kendaraan', 'tahun_prediksi', 'bulan_prediksi', 'metode']),
         ]
     
     def __str__(self):
@@ -442,4 +539,97 @@ class HasilPrediksi(models.Model):
         """Menghitung selisih antara aktual dan prediksi"""
         if self.nilai_aktual:
             return float(self.nilai_aktual - self.nilai_prediksi)
-        return None
\ No newline at end of file
+        return None
+
+
+class PrediksiJob(models.Model):
+    """Antrian job prediksi yang diproses worker lokal (manage.py run_prediksi_worker)"""
+    
+    TIPE_CHOICES = [
+        ('PREDIKSI', 'Prediksi SES/DES/TES'),
+        ('HYBRID', 'Prediksi Hybrid'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Menunggu'),
+        ('RUNNING', 'Diproses'),
+        ('SUCCESS', 'Selesai'),
+        ('FAILED', 'Gagal'),
+    ]
+    
+    # Job
+    tipe = models.CharField(max_length=10, choices=TIPE_CHOICES)
+    parameter = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    percobaan = models.IntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, null=True)
+    
+    # Hasil
+    hasil_prediksi = models.ForeignKey(HasilPrediksi, on_delete=models.SET_NULL, blank=True, null=True)
+    hasil = models.JSONField(blank=True, null=True)
+    pesan_error = models.TextField(blank=True, null=True)
+    
+    # Metadata
+    dibuat_oleh = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'prediksi_job'
+        verbose_name = 'Prediksi Job'
+        verbose_name_plural = 'Prediksi Job'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Job #{self.pk} {self.tipe} - {self.status}"
+
+
+class StatePrediksi(models.Model):
+    """State akhir model smoothing per series untuk update online bulanan (manage.py update_state_prediksi)"""
+    
+    # ForeignKey (NULL = global)
+    jenis_kendaraan = models.ForeignKey(JenisKendaraan, on_delete=models.CASCADE, blank=True, null=True)
+    
+    # Model
+    metode = models.CharField(max_length=20, choices=HasilPrediksi.METODE_CHOICES)
+    seasonal_periods = models.IntegerField(default=12)
+    alpha = models.FloatField()
+    beta = models.FloatField(blank=True, null=True)
+    gamma = models.FloatField(blank=True, null=True)
+    best_config = models.CharField(max_length=50, blank=True, null=True)
+    
+    # State akhir (level, trend, season, phi, trend_type, seasonal_type)
+    state = models.JSONField()
+    
+    # Data yang sudah masuk state; fingerprint untuk mendeteksi perubahan data lama
+    data_training_dari = models.DateField()
+    data_training_sampai = models.DateField()
+    jumlah_data_training = models.IntegerField()
+    fingerprint = models.CharField(max_length=40)
+    
+    # Metrik in-sample saat fit penuh (acuan deteksi drift)
+    mape = models.FloatField(blank=True, null=True)
+    mae = models.FloatField(blank=True, null=True)
+    rmse = models.FloatField(blank=True, null=True)
+    
+    # Error 1-langkah (APE %) dari update online sejak fit penuh terakhir
+    error_online = models.JSONField(default=list)
+    jumlah_update = models.IntegerField(default=0)
+    
+    # Metadata
+    tanggal_fit = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'state_prediksi'
+        verbose_name = 'State Prediksi'
+        verbose_name_plural = 'State Prediksi'
+        unique_together = ['jenis_kendaraan', 'metode', 'seasonal_periods']
+        ordering = ['metode']
+    
+    def __str__(self):
+        return f"{self.metode} - {self.jenis_kendaraan_id or 'global'} s/d {self.data_training_sampai:%Y-%m}"
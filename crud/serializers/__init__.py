@@ -9,6 +9,7 @@ from .data_pajak_kendaraan_serializer import DataPajakKendaraanSerializer
 from .transaksi_pajak_serializer import TransaksiPajakSerializer
 from .agregat_pendapatan_bulanan_serializer import AgregatPendapatanBulananSerializer
 from .hasil_prediksi_serializer import HasilPrediksiSerializer
+from .prediksi_job_serializer import PrediksiJobSerializer
 
 __all__ = [
     'JenisKendaraanSerializer', 
@@ -21,5 +22,6 @@ __all__ = [
     'DataPajakKendaraanSerializer',
     'TransaksiPajakSerializer',
     'AgregatPendapatanBulananSerializer',
-    'HasilPrediksiSerializer'
+    'HasilPrediksiSerializer',
+    'PrediksiJobSerializer'
 ]
@@ -28,12 +28,12 @@ class HasilPrediksiSerializer(serializers.ModelSerializer):
             'nilai_aktual',
             # Metadata
             'tanggal_prediksi', 'data_training_dari', 'data_training_sampai',
-            'jumlah_data_training', 'keterangan',
+            'jumlah_data_training', 'keterangan', 'is_precomputed',
             # Computed
             'akurasi_persen', 'selisih'
         ]
         read_only_fields = [
-            'id', 'tanggal_prediksi', 'akurasi_persen', 'selisih',
+            'id', 'tanggal_prediksi', 'is_precomputed', 'akurasi_persen', 'selisih',
             'jenis_kendaraan_nama', 'jenis_kendaraan_kategori', 'metode_display'
         ]
     
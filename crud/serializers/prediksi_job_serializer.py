@@ -0,0 +1,24 @@
+from rest_framework import serializers
+from crud.models import PrediksiJob
+
+
+class PrediksiJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer untuk PrediksiJob (read-only, job dibuat lewat PrediksiJobService)
+    """
+    tipe_display = serializers.CharField(source='get_tipe_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    dibuat_oleh_username = serializers.CharField(source='dibuat_oleh.username', read_only=True)
+    
+    class Meta:
+        model = PrediksiJob
+        fields = [
+            'id', 'tipe', 'tipe_display', 'parameter',
+            'status', 'status_display', 'percobaan', 'worker',
+            # Hasil
+            'hasil_prediksi', 'hasil', 'pesan_error',
+            # Metadata
+            'dibuat_oleh', 'dibuat_oleh_username',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
@@ -1,14 +1,31 @@
-from .exponential_smoothing import (
-    SimpleExponentialSmoothing,
-    DoubleExponentialSmoothing,
-    TripleExponentialSmoothing
-)
-from .prediction_service import PredictionService
-
-__all__ = [
-    'SimpleExponentialSmoothing',
-    'DoubleExponentialSmoothing',
-    'TripleExponentialSmoothing',
-    'PredictionService'
-]
+"""
+Service layer crud
 
+Export di bawah ini di-load lazy (PEP 562) supaya import salah satu service
+ringan (misalnya crud.services.agregat_service) tidak ikut meng-import
+seluruh engine forecasting.
+"""
+import importlib
+
+_EXPORTS = {
+    'SimpleExponentialSmoothing': 'crud.services.exponential_smoothing',
+    'DoubleExponentialSmoothing': 'crud.services.exponential_smoothing',
+    'TripleExponentialSmoothing': 'crud.services.exponential_smoothing',
+    'HoltWintersEngine': 'crud.services.holt_winters_engine',
+    'EngineRegistry': 'crud.services.engine_registry',
+    'PredictionService': 'crud.services.prediction_service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
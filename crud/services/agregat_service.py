@@ -0,0 +1,428 @@
+"""
+Service untuk pemeliharaan incremental AgregatPendapatanBulanan
+
+Setiap create/update/delete TransaksiPajak (lewat save()/delete()) menerapkan
+selisihnya ke baris agregat (tahun, bulan, jenis) yang terdampak dan ke baris
+global (jenis_kendaraan=NULL), sehingga agregat selalu terkini tanpa harus
+regenerate penuh.
+
+Penulisan yang melewati pemeliharaan per baris (import massal dengan
+deferred()) mencatat periodenya di AgregatDirtyPeriod. Refresh berkala
+(regenerate mode=dirty / manage.py refresh_agregat) cukup membangun ulang
+periode tersebut, sehingga biayanya sebanding dengan volume perubahan,
+bukan ukuran tabel. Periode yang selisihnya sudah diterapkan tidak
+ditandai dirty karena agregatnya sudah terkini.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from crud.models import AgregatDirtyPeriod, AgregatPendapatanBulanan, AgregatPeriodLock, TransaksiPajak
+from crud.services.mape_bulanan_service import MapeBulananService
+from crud.services.model_cache import AgregatVersion
+
+
+# Periode yang dikumpulkan oleh blok deferred() yang sedang aktif (per thread)
+_deferred = threading.local()
+
+
+class AgregatService:
+    """
+    Service untuk menerapkan perubahan TransaksiPajak ke AgregatPendapatanBulanan
+    """
+
+    # Field agregat -> field TransaksiPajak yang dijumlahkan (sama seperti regenerate)
+    FIELD_MAP = {
+        'total_pendapatan': ('total_bayar',),
+        'total_pokok_pkb': ('pokok_pkb',),
+        'total_denda_pkb': ('denda_pkb',),
+        'total_swdkllj': ('pokok_swdkllj', 'denda_swdkllj'),
+        'total_bbnkb': ('pokok_bbnkb', 'denda_bbnkb'),
+        'total_opsen': ('opsen_pokok_pkb', 'opsen_denda_pkb', 'opsen_pokok_bbnkb', 'opsen_denda_bbnkb'),
+    }
+
+    # Field yang ditulis ulang saat regenerate/rebuild
+    AGREGAT_FIELDS = [
+        'total_pendapatan', 'total_pokok_pkb', 'total_denda_pkb', 'total_swdkllj',
+        'total_bbnkb', 'total_opsen', 'jumlah_transaksi', 'jumlah_kendaraan',
+    ]
+
+    @staticmethod
+    def _source_fields():
+        return sorted({field for fields in AgregatService.FIELD_MAP.values() for field in fields})
+
+    @staticmethod
+    def snapshot(transaksi: TransaksiPajak) -> Dict:
+        """
+        Kontribusi satu transaksi (instance di memori) terhadap agregat
+
+        Returns:
+            Dictionary dengan keys: key (tahun, bulan, jenis_id), kendaraan_id, totals
+        """
+        totals = {
+            agregat_field: sum(
+                (Decimal(str(getattr(transaksi, field) or 0)) for field in fields),
+                Decimal('0')
+            )
+            for agregat_field, fields in AgregatService.FIELD_MAP.items()
+        }
+        return {
+            'key': (int(transaksi.tahun), int(transaksi.bulan), transaksi.kendaraan.jenis_id),
+            'kendaraan_id': transaksi.kendaraan_id,
+            'totals': totals,
+        }
+
+    @staticmethod
+    def snapshot_from_db(pk) -> Optional[Dict]:
+        """
+        Kontribusi transaksi sebagaimana tersimpan di database (sebelum diubah)
+
+        Returns:
+            Snapshot, atau None jika transaksi belum ada
+        """
+        row = TransaksiPajak.objects.filter(pk=pk).values(
+            'tahun', 'bulan', 'kendaraan_id', 'kendaraan__jenis_id', *AgregatService._source_fields()
+        ).first()
+        if row is None:
+            return None
+
+        totals = {
+            agregat_field: sum((row[field] or Decimal('0') for field in fields), Decimal('0'))
+            for agregat_field, fields in AgregatService.FIELD_MAP.items()
+        }
+        return {
+            'key': (row['tahun'], row['bulan'], row['kendaraan__jenis_id']),
+            'kendaraan_id': row['kendaraan_id'],
+            'totals': totals,
+        }
+
+    @staticmethod
+    def apply(old: Optional[Dict] = None, new: Optional[Dict] = None):
+        """
+        Menerapkan perubahan transaksi (old -> new) ke agregat
+
+        Args:
+            old: Snapshot sebelum perubahan (None untuk create)
+            new: Snapshot sesudah perubahan (None untuk delete)
+        """
+        deltas = defaultdict(lambda: {'totals': defaultdict(Decimal), 'jumlah_transaksi': 0})
+        for snapshot, sign in ((old, -1), (new, 1)):
+            if snapshot is None:
+                continue
+            delta = deltas[snapshot['key']]
+            for field, value in snapshot['totals'].items():
+                delta['totals'][field] += sign * value
+            delta['jumlah_transaksi'] += sign * snapshot.get('jumlah_transaksi', 1)
+
+        # Jika transaksi tetap di grup yang sama dan kendaraan tidak berubah,
+        # jumlah kendaraan distinct tidak mungkin berubah
+        recount = not (
+            old is not None and new is not None and
+            old['key'] == new['key'] and old['kendaraan_id'] == new['kendaraan_id']
+        )
+
+        periods = {key[:2] for key in deltas}
+
+        # Di dalam deferred(): cukup catat periodenya, rebuild dilakukan di akhir
+        stack = getattr(_deferred, 'stack', None)
+        if stack:
+            for deferred_periods in stack:
+                deferred_periods.update(periods)
+            return
+
+        with transaction.atomic():
+            AgregatService.lock_periods(periods)
+            for key, delta in deltas.items():
+                AgregatService._apply_group(key, delta['totals'], delta['jumlah_transaksi'], recount)
+            MapeBulananService.invalidate(deltas.keys())
+            transaction.on_commit(AgregatVersion.bump)
+
+    @staticmethod
+    def lock_periods(periods: Iterable[Tuple[int, int]]):
+        """
+        Mengunci periode (tahun, bulan) sampai transaksi database selesai
+
+        Baris global (jenis_kendaraan=NULL) tidak dilindungi unique_together,
+        sehingga dua get_or_create bersamaan bisa membuat baris ganda. Baris
+        AgregatPeriodLock selalu ada setelah upsert dan unik per periode;
+        menguncinya menserialisasi semua penulisan ke periode yang sama.
+        """
+        periods = sorted(set(periods))
+        records = [AgregatPeriodLock(tahun=tahun, bulan=bulan) for tahun, bulan in periods]
+        AgregatService.upsert(AgregatPeriodLock, records, ['tahun', 'bulan'], ['bulan'])
+        list(AgregatPeriodLock.objects.select_for_update().filter(
+            AgregatService.period_filter(periods)
+        ).order_by('tahun', 'bulan'))
+
+    @staticmethod
+    def move_kendaraan(kendaraan_id: int, old_jenis_id: int, new_jenis_id: int):
+        """
+        Memindahkan kontribusi semua transaksi kendaraan ke grup jenis barunya
+
+        Dipanggil setelah jenis kendaraan diubah dan disimpan. Untuk setiap
+        periode transaksi kendaraan, totalnya dikurangi dari grup jenis lama
+        dan ditambahkan ke grup jenis baru (baris global tetap, jumlah
+        kendaraan kedua grup dihitung ulang).
+        """
+        if old_jenis_id == new_jenis_id:
+            return
+
+        totals = {
+            agregat_field: Sum(sum((F(field) for field in fields[1:]), F(fields[0])))
+            for agregat_field, fields in AgregatService.FIELD_MAP.items()
+        }
+        queryset = TransaksiPajak.objects.filter(kendaraan_id=kendaraan_id).values(
+            'tahun', 'bulan'
+        ).annotate(jumlah_transaksi=Count('id'), **totals).order_by('tahun', 'bulan')
+
+        for item in queryset:
+            contribution = {
+                'kendaraan_id': kendaraan_id,
+                'jumlah_transaksi': item['jumlah_transaksi'],
+                'totals': {field: item[field] or Decimal('0') for field in AgregatService.FIELD_MAP},
+            }
+            AgregatService.apply(
+                {**contribution, 'key': (item['tahun'], item['bulan'], old_jenis_id)},
+                {**contribution, 'key': (item['tahun'], item['bulan'], new_jenis_id)},
+            )
+
+    @staticmethod
+    def _apply_group(key: Tuple[int, int, int], totals: Dict, jumlah_transaksi: int, recount: bool):
+        """
+        Menerapkan selisih ke baris per-jenis dan baris global untuk satu grup
+        """
+        tahun, bulan, jenis_kendaraan_id = key
+        if not recount and jumlah_transaksi == 0 and not any(totals.values()):
+            return
+
+        now = timezone.now()
+        increments = {field: F(field) + value for field, value in totals.items()}
+        increments['jumlah_transaksi'] = F('jumlah_transaksi') + jumlah_transaksi
+        increments['tanggal_agregasi'] = now
+
+        row, _ = AgregatPendapatanBulanan.objects.select_for_update().get_or_create(
+            tahun=tahun,
+            bulan=bulan,
+            jenis_kendaraan_id=jenis_kendaraan_id
+        )
+        global_row, _ = AgregatPendapatanBulanan.objects.select_for_update().get_or_create(
+            tahun=tahun,
+            bulan=bulan,
+            jenis_kendaraan=None
+        )
+
+        # Jumlah kendaraan distinct tidak bisa di-delta, hitung ulang untuk grup ini
+        kendaraan_delta = 0
+        row_updates = dict(increments)
+        if recount:
+            jumlah_kendaraan = TransaksiPajak.objects.filter(
+                tahun=tahun,
+                bulan=bulan,
+                kendaraan__jenis_id=jenis_kendaraan_id
+            ).aggregate(n=Count('kendaraan', distinct=True))['n'] or 0
+            kendaraan_delta = jumlah_kendaraan - row.jumlah_kendaraan
+            row_updates['jumlah_kendaraan'] = jumlah_kendaraan
+
+        AgregatPendapatanBulanan.objects.filter(pk=row.pk).update(**row_updates)
+        AgregatPendapatanBulanan.objects.filter(pk=global_row.pk).update(
+            jumlah_kendaraan=F('jumlah_kendaraan') + kendaraan_delta,
+            **increments
+        )
+
+        # Grup tanpa transaksi tidak punya baris agregat (sama seperti hasil regenerate)
+        AgregatPendapatanBulanan.objects.filter(
+            pk__in=[row.pk, global_row.pk],
+            jumlah_transaksi__lte=0
+        ).delete()
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """
+        Menunda pemeliharaan incremental selama blok (untuk import massal)
+
+        Perubahan TransaksiPajak di dalam blok hanya mencatat periode yang
+        terdampak. Periode tersebut ditandai dirty saat blok selesai tanpa
+        error, lalu bisa dibangun ulang sekaligus dengan rebuild_periods().
+
+        Yields:
+            Set (tahun, bulan) yang berubah selama blok
+        """
+        periods = set()
+        if getattr(_deferred, 'stack', None) is None:
+            _deferred.stack = []
+        _deferred.stack.append(periods)
+        try:
+            yield periods
+        finally:
+            _deferred.stack.remove(periods)
+        AgregatService.mark_dirty(periods)
+
+    @staticmethod
+    def upsert(model, records: List, unique_fields: List[str], update_fields: List[str]):
+        """
+        Insert atau update record dalam batch (INSERT ... ON CONFLICT /
+        ON DUPLICATE KEY UPDATE)
+        """
+        if not records:
+            return
+        kwargs = {
+            'update_conflicts': True,
+            'update_fields': update_fields,
+            'batch_size': 1000,
+        }
+        # MySQL (ON DUPLICATE KEY UPDATE) tidak menerima target kolom unik
+        if connection.features.supports_update_conflicts_with_target:
+            kwargs['unique_fields'] = unique_fields
+
+        model.objects.bulk_create(records, **kwargs)
+
+    @staticmethod
+    def mark_dirty(periods: Iterable[Tuple[int, int]]):
+        """
+        Menandai periode (tahun, bulan) sebagai dirty (satu query)
+        """
+        records = [AgregatDirtyPeriod(tahun=tahun, bulan=bulan) for tahun, bulan in sorted(set(periods))]
+        AgregatService.upsert(AgregatDirtyPeriod, records, ['tahun', 'bulan'], ['ditandai_pada'])
+
+    @staticmethod
+    def dirty_periods() -> List[Tuple[int, int]]:
+        """
+        List periode (tahun, bulan) yang menunggu rebuild
+        """
+        return list(AgregatDirtyPeriod.objects.order_by('tahun', 'bulan').values_list('tahun', 'bulan'))
+
+    @staticmethod
+    def period_filter(periods: Iterable[Tuple[int, int]]) -> Q:
+        """
+        Filter Q untuk sekumpulan periode (dikelompokkan per tahun)
+        """
+        by_year = defaultdict(list)
+        for tahun, bulan in sorted(set(periods)):
+            by_year[tahun].append(bulan)
+
+        q = Q()
+        for tahun, bulan_list in by_year.items():
+            q |= Q(tahun=tahun, bulan__in=bulan_list)
+        return q
+
+    @staticmethod
+    def query_groups(periods: Optional[Iterable[Tuple[int, int]]] = None,
+                     jenis_kendaraan_id: Optional[int] = None,
+                     **filters) -> List[Dict]:
+        """
+        Agregasi TransaksiPajak per (tahun, bulan, jenis kendaraan) dalam satu query
+
+        Args:
+            periods: Batasi ke periode tertentu (opsional)
+            jenis_kendaraan_id: Batasi ke jenis kendaraan tertentu (opsional)
+            **filters: Filter tambahan untuk TransaksiPajak (mis. tahun, bulan)
+
+        Returns:
+            List dictionary siap dipakai sebagai kwargs AgregatPendapatanBulanan
+        """
+        totals = {
+            agregat_field: Sum(sum((F(field) for field in fields[1:]), F(fields[0])))
+            for agregat_field, fields in AgregatService.FIELD_MAP.items()
+        }
+
+        queryset = TransaksiPajak.objects.filter(kendaraan__isnull=False, **filters)
+        if periods is not None:
+            queryset = queryset.filter(AgregatService.period_filter(periods))
+        if jenis_kendaraan_id:
+            queryset = queryset.filter(kendaraan__jenis_id=jenis_kendaraan_id)
+
+        queryset = queryset.values(
+            'tahun', 'bulan', 'kendaraan__jenis'
+        ).annotate(
+            jumlah_transaksi=Count('id'),
+            jumlah_kendaraan=Count('kendaraan', distinct=True),
+            **totals
+        ).order_by('tahun', 'bulan', 'kendaraan__jenis')
+
+        groups = []
+        for item in queryset:
+            group = {
+                'tahun': item['tahun'],
+                'bulan': item['bulan'],
+                'jenis_kendaraan_id': item['kendaraan__jenis'],
+                'jumlah_transaksi': item['jumlah_transaksi'] or 0,
+                'jumlah_kendaraan': item['jumlah_kendaraan'] or 0,
+            }
+            for field in AgregatService.FIELD_MAP:
+                group[field] = item[field] or Decimal('0')
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def global_records(groups: Iterable[Dict]) -> List[AgregatPendapatanBulanan]:
+        """
+        Record global (jenis_kendaraan=NULL) sebagai SUM dari grup per-jenis
+
+        Returns:
+            List AgregatPendapatanBulanan yang belum disimpan, satu per bulan
+        """
+        monthly_totals = {}
+        for item in groups:
+            totals = monthly_totals.setdefault(
+                (item['tahun'], item['bulan']), dict.fromkeys(AgregatService.AGREGAT_FIELDS, 0)
+            )
+            for field in AgregatService.AGREGAT_FIELDS:
+                totals[field] += item[field] or 0
+
+        records = []
+        for (tahun, bulan), totals in sorted(monthly_totals.items()):
+            for field in AgregatService.FIELD_MAP:
+                totals[field] = Decimal(totals[field])
+            records.append(AgregatPendapatanBulanan(tahun=tahun, bulan=bulan, jenis_kendaraan=None, **totals))
+        return records
+
+    @staticmethod
+    def rebuild_periods(periods: Iterable[Tuple[int, int]]) -> Dict:
+        """
+        Membangun ulang agregat per-jenis dan global untuk periode tertentu
+
+        Semua baris periode tersebut dihapus dan dibuat ulang dari TransaksiPajak
+        dalam satu transaksi, lalu tanda dirty-nya dihapus. Baris MapeBulanan yang
+        bergantung pada periode tersebut hanya diinvalidasi dan dihitung ulang saat
+        dibaca (get_monthly_mape). Tanda yang diperbarui oleh penulisan lain selama
+        rebuild tetap dipertahankan.
+
+        Returns:
+            Dictionary dengan keys: periods, records, global_records
+        """
+        periods = sorted(set(periods))
+        if not periods:
+            return {'periods': [], 'records': 0, 'global_records': 0}
+
+        started = timezone.now()
+        period_q = AgregatService.period_filter(periods)
+
+        with transaction.atomic():
+            existing = AgregatPendapatanBulanan.objects.filter(period_q)
+            # Jenis yang hilang dari periode juga mengubah MapeBulanan-nya
+            mape_keys = set(existing.values_list('tahun', 'bulan', 'jenis_kendaraan_id'))
+            existing.delete()
+
+            groups = AgregatService.query_groups(periods=periods)
+            records = [AgregatPendapatanBulanan(**group) for group in groups]
+            global_records = AgregatService.global_records(groups)
+            AgregatPendapatanBulanan.objects.bulk_create(records + global_records, batch_size=1000)
+
+            AgregatDirtyPeriod.objects.filter(period_q, ditandai_pada__lte=started).delete()
+            mape_keys.update((g['tahun'], g['bulan'], g['jenis_kendaraan_id']) for g in groups)
+            mape_keys.update((tahun, bulan, None) for tahun, bulan in periods)
+            MapeBulananService.invalidate(mape_keys)
+            transaction.on_commit(AgregatVersion.bump)
+
+        return {
+            'periods': [{'tahun': tahun, 'bulan': bulan} for tahun, bulan in periods],
+            'records': len(records),
+            'global_records': len(global_records),
+        }
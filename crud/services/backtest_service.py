@@ -0,0 +1,427 @@
+"""
+Service untuk backtest rolling-origin (evaluasi out-of-sample)
+
+Untuk setiap origin, model dilatih dengan data sampai origin tersebut lalu
+memprediksi `horizon` bulan ke depan, kemudian dibandingkan dengan nilai
+aktualnya. Semua series (global dan per jenis kendaraan) diproses sekaligus
+dengan engine NumPy:
+
+- Parameter dan state awal dioptimasi ulang setiap `refit_every` origin
+  (seperti predict_*). Di antara itu keduanya dipakai ulang, sehingga state
+  di setiap origin cukup didapat dari satu rekursi yang dilanjutkan
+  (SES/DES/TES, window expanding).
+- HYBRID memakai window training tetap (24 bulan terakhir) seperti
+  predict_hybrid, sehingga window semua origin ditumpuk menjadi satu array
+  dan di-smooth dalam satu rekursi.
+"""
+import time
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from crud.services.exponential_smoothing import TripleExponentialSmoothing
+from crud.services.holt_winters_engine import HoltWintersEngine
+from crud.services.hybrid_prediction_service import HybridPredictionService
+from crud.services.series_store import SeriesStore
+from crud.utils.metrics import calculate_all_metrics
+
+
+class BacktestService:
+    """
+    Backtest rolling-origin untuk SES, DES, TES, dan HYBRID
+    """
+
+    METHODS = ('SES', 'DES', 'TES', 'HYBRID')
+    DEFAULT_ORIGINS = 24
+    DEFAULT_REFIT_EVERY = 6
+    HYBRID_TRAINING_PERIODS = 24
+
+    # Konfigurasi engine per metode (TES/HYBRID memilih konfigurasi terbaik per series)
+    METHOD_CONFIGS = {
+        'SES': ({'name': 'ses', 'trend': None, 'seasonal': None, 'damped': False},),
+        'DES': ({'name': 'add', 'trend': 'add', 'seasonal': None, 'damped': False},),
+        'TES': TripleExponentialSmoothing.BATCH_CONFIGS,
+        'HYBRID': TripleExponentialSmoothing.BATCH_CONFIGS,
+    }
+
+    @staticmethod
+    def load_series(jenis_kendaraan_id: Optional[int] = None,
+                    tahun_akhir: Optional[int] = None,
+                    bulan_akhir: Optional[int] = None) -> Dict[Hashable, List[Dict]]:
+        """
+        Memuat data agregat semua series
+
+        Args:
+            jenis_kendaraan_id: Hanya series jenis ini (None = global + semua jenis)
+            tahun_akhir, bulan_akhir: Batas akhir data (opsional)
+
+        Returns:
+            Dictionary {jenis_kendaraan_id (None = global): list {tahun, bulan, total_pendapatan}}
+        """
+        # Dibaca dari SeriesStore (tanpa query selama versi agregat tidak berubah)
+        end = (tahun_akhir, bulan_akhir) if tahun_akhir and bulan_akhir else None
+        series = SeriesStore.series_by_key(end)
+        if jenis_kendaraan_id is not None:
+            key = int(jenis_kendaraan_id)
+            return {key: series[key]} if key in series else {}
+        return series
+
+    @staticmethod
+    def backtest(jenis_kendaraan_id: Optional[int] = None,
+                 origins: int = DEFAULT_ORIGINS,
+                 horizon: int = 1,
+                 methods: Sequence[str] = METHODS,
+                 seasonal_periods: int = 12,
+                 refit_every: int = DEFAULT_REFIT_EVERY,
+                 tahun_akhir: Optional[int] = None,
+                 bulan_akhir: Optional[int] = None) -> Dict:
+        """
+        Backtest rolling-origin dari data AgregatPendapatanBulanan
+
+        Returns:
+            Hasil run() untuk series yang dimuat
+        """
+        series = BacktestService.load_series(jenis_kendaraan_id, tahun_akhir, bulan_akhir)
+        if not series:
+            raise ValueError('Data agregat tidak ditemukan')
+
+        return BacktestService.run(
+            series, origins=origins, horizon=horizon, methods=methods,
+            seasonal_periods=seasonal_periods, refit_every=refit_every
+        )
+
+    @staticmethod
+    def run(series_by_key: Dict[Hashable, List[Dict]],
+            origins: int = DEFAULT_ORIGINS,
+            horizon: int = 1,
+            methods: Sequence[str] = METHODS,
+            seasonal_periods: int = 12,
+            refit_every: int = DEFAULT_REFIT_EVERY) -> Dict:
+        """
+        Menjalankan backtest rolling-origin untuk data yang sudah dimuat
+
+        Args:
+            series_by_key: Dictionary {key: list {tahun, bulan, total_pendapatan}}
+            origins: Jumlah bulan terakhir yang dievaluasi per series
+            horizon: Jarak prediksi (1 = bulan berikutnya)
+            methods: Metode yang dievaluasi
+            seasonal_periods: Periode musiman untuk TES/HYBRID
+            refit_every: Optimasi ulang parameter setiap N origin
+
+        Returns:
+            Dictionary dengan keys: series (per-origin dan metrik per series),
+            leaderboard (peringkat metode), dan info
+        """
+        if origins < 1:
+            raise ValueError('Jumlah origin minimal 1')
+        if horizon < 1:
+            raise ValueError('Horizon minimal 1')
+        refit_every = max(1, int(refit_every))
+
+        methods = [m for m in BacktestService.METHODS if m in {str(x).upper() for x in methods}]
+        if not methods:
+            raise ValueError('Metode harus salah satu dari: ' + ', '.join(BacktestService.METHODS))
+
+        started = time.perf_counter()
+
+        # Kelompokkan series berdasarkan panjang data agar bisa dijadikan array 2-D
+        groups = defaultdict(list)
+        for key, data in series_by_key.items():
+            groups[len(data)].append(key)
+
+        series_results = {}
+        refits = dict.fromkeys(methods, 0)
+
+        for n_obs, keys in groups.items():
+            data_arr = np.array(
+                [[d['total_pendapatan'] for d in series_by_key[k]] for k in keys], dtype=float
+            )
+
+            # Origin = jumlah data training; target = indeks origin + horizon - 1
+            targets = np.arange(max(0, n_obs - origins), n_obs)
+            origin_arr = targets - horizon + 1
+
+            target_months = np.array(
+                [[series_by_key[k][t]['bulan'] for t in targets] for k in keys], dtype=int
+            ).reshape(len(keys), len(targets))
+
+            forecasts = {}
+            for method in methods:
+                forecasts[method], n_refit = _method_forecasts(
+                    method, data_arr, origin_arr, horizon, seasonal_periods, refit_every, target_months
+                )
+                refits[method] += n_refit
+
+            for i, key in enumerate(keys):
+                series_results[key] = _series_result(
+                    series_by_key[key], data_arr[i], targets, {m: f[i] for m, f in forecasts.items()}
+                )
+
+        return {
+            'series': series_results,
+            'leaderboard': _leaderboard(series_results, methods),
+            'info': {
+                'origins': origins,
+                'horizon': horizon,
+                'refit_every': refit_every,
+                'seasonal_periods': seasonal_periods,
+                'methods': methods,
+                'jumlah_series': len(series_results),
+                'refits': refits,
+                'engine': 'numpy-batch',
+                'waktu_ms': round((time.perf_counter() - started) * 1000, 1),
+            },
+        }
+
+
+def _min_training(method: str, seasonal_periods: int) -> int:
+    """
+    Jumlah data training minimal per metode (sama dengan validasi predict_*)
+    """
+    if method == 'SES':
+        return 2
+    if method == 'DES':
+        return 3
+    if method == 'TES':
+        return 2 * seasonal_periods
+    return max(BacktestService.HYBRID_TRAINING_PERIODS, 2 * seasonal_periods)
+
+
+def _fit_sse(data: np.ndarray, fitted: np.ndarray, seasonal: Optional[str], seasonal_periods: int) -> np.ndarray:
+    """
+    SSE untuk pemilihan konfigurasi (setelah periode seasonal pertama, sama seperti predict_many)
+    """
+    start = seasonal_periods if seasonal else 0
+    with np.errstate(over='ignore', invalid='ignore'):
+        sse = np.sum((data[:, start:] - fitted[:, start:]) ** 2, axis=1)
+    return np.where(np.isfinite(sse), sse, np.inf)
+
+
+def _method_forecasts(method: str, data: np.ndarray, origins: np.ndarray, horizon: int,
+                      seasonal_periods: int, refit_every: int,
+                      target_months: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Forecast h-langkah untuk setiap (series, origin) satu metode
+
+    Args:
+        target_months: Bulan target per (series, origin), untuk monthly adjustment HYBRID
+
+    Returns:
+        Tuple: (array forecast (S x origin), NaN jika data kurang; jumlah optimasi ulang)
+    """
+    n_series = data.shape[0]
+    result = np.full((n_series, len(origins)), np.nan)
+
+    valid = np.flatnonzero(origins >= _min_training(method, seasonal_periods))
+    if not len(valid):
+        return result, 0
+
+    configs = BacktestService.METHOD_CONFIGS[method]
+    window = BacktestService.HYBRID_TRAINING_PERIODS if method == 'HYBRID' else None
+
+    n_refit = 0
+    for block_start in range(0, len(valid), refit_every):
+        block = valid[block_start:block_start + refit_every]
+        block_origins = origins[block]
+        n_refit += 1
+
+        best_sse = np.full(n_series, np.inf)
+        for config in configs:
+            if window:
+                forecast, sse = _sliding_block(data, block_origins, horizon, config, seasonal_periods, window)
+            else:
+                forecast, sse = _expanding_block(data, block_origins, horizon, config, seasonal_periods)
+
+            better = (sse < best_sse) & np.all(np.isfinite(forecast), axis=1)
+            best_sse[better] = sse[better]
+            result[np.ix_(better, block)] = forecast[better]
+
+    if method in ('TES', 'HYBRID'):
+        # Ensure predictions are positive (sama seperti predict)
+        result = np.where(np.isnan(result), np.nan, np.maximum(result, 0.0))
+
+    if method == 'HYBRID':
+        # Scenario base x monthly adjustment untuk bulan target (sama seperti predict_hybrid)
+        factor = HybridPredictionService.SCENARIOS['base']['factor']
+        adjustment = np.vectorize(
+            lambda bulan: HybridPredictionService.MONTHLY_ADJUSTMENTS.get(int(bulan), 1.0),
+            otypes=[float]
+        )(target_months)
+        result = result * factor * adjustment
+
+    return result, n_refit
+
+
+def _expanding_block(data: np.ndarray, block_origins: np.ndarray, horizon: int,
+                     config: Dict, seasonal_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Satu blok origin dengan window expanding
+
+    Parameter dan state awal dioptimasi pada origin pertama blok (seperti
+    predict_*: estimate_initial), lalu rekursi dengan parameter dan state awal
+    tetap dilanjutkan sampai origin terakhir. Dengan refit_every=1 forecast
+    setiap origin sama dengan predict_* pada data sampai origin tersebut
+    (dalam BATCH_TOLERANCE).
+
+    Returns:
+        Tuple: (forecast (S x origin blok), SSE pada origin optimasi (S,))
+    """
+    trend, seasonal = config['trend'], config['seasonal']
+    m = seasonal_periods if seasonal else 0
+
+    train = data[:, :block_origins[0]]
+    fit = HoltWintersEngine.optimize(
+        train, trend=trend, seasonal=seasonal,
+        seasonal_periods=seasonal_periods, damped=config['damped'],
+        estimate_initial=True
+    )
+    sse = _fit_sse(train, fit['fitted'], seasonal, seasonal_periods)
+
+    smoothed = HoltWintersEngine.smooth(
+        data[:, :block_origins[-1]],
+        alpha=fit['alpha'], beta=fit['beta'], gamma=fit['gamma'], phi=fit['phi'],
+        trend=trend, seasonal=seasonal, seasonal_periods=seasonal_periods,
+        l0=fit['l0'], b0=fit['b0'], s0=fit['s0'],
+    )
+    # season_full[:, t:t + m] = m komponen seasonal terakhir setelah t observasi
+    season_full = np.concatenate([fit['s0'], smoothed['season']], axis=1) if m else None
+
+    forecast = np.empty((data.shape[0], len(block_origins)))
+    for j, origin in enumerate(block_origins):
+        season = None
+        if m:
+            # Slot terakhir siklus = komponen sebelum siklus (konvensi forecast statsmodels)
+            season = season_full[:, origin:origin + m].copy()
+            season[:, -1] = season_full[:, origin - 1]
+        forecast[:, j] = HoltWintersEngine.forecast(
+            smoothed['level'][:, origin - 1],
+            smoothed['trend'][:, origin - 1],
+            season,
+            horizon, phi=fit['phi'], trend=trend, seasonal=seasonal
+        )[:, -1]
+
+    return forecast, sse
+
+
+def _sliding_block(data: np.ndarray, block_origins: np.ndarray, horizon: int,
+                   config: Dict, seasonal_periods: int, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Satu blok origin dengan window training tetap (HYBRID)
+
+    Parameter dan state awal dioptimasi pada window origin pertama blok
+    (estimate_initial, seperti predict_*). Window semua origin di blok
+    ditumpuk (series x origin) dan di-smooth dengan parameter tersebut dalam
+    satu rekursi; window origin berikutnya memakai state awal heuristik dari
+    window masing-masing.
+
+    Returns:
+        Tuple: (forecast (S x origin blok), SSE pada origin optimasi (S,))
+    """
+    trend, seasonal = config['trend'], config['seasonal']
+    n_series, n_block = data.shape[0], len(block_origins)
+
+    first = block_origins[0]
+    train = data[:, first - window:first]
+    fit = HoltWintersEngine.optimize(
+        train, trend=trend, seasonal=seasonal,
+        seasonal_periods=seasonal_periods, damped=config['damped'],
+        estimate_initial=True
+    )
+    sse = _fit_sse(train, fit['fitted'], seasonal, seasonal_periods)
+
+    # (S * B, window), baris i * B + j = series i pada origin j
+    windows = np.stack([data[:, o - window:o] for o in block_origins], axis=1).reshape(-1, window)
+    l0, b0, s0 = HoltWintersEngine.heuristic_initial_states(windows, trend, seasonal, seasonal_periods)
+    first_rows = np.arange(n_series) * n_block
+    l0[first_rows], b0[first_rows], s0[first_rows] = fit['l0'], fit['b0'], fit['s0']
+
+    smoothed = HoltWintersEngine.smooth(
+        windows,
+        alpha=np.repeat(fit['alpha'], n_block), beta=np.repeat(fit['beta'], n_block),
+        gamma=np.repeat(fit['gamma'], n_block), phi=np.repeat(fit['phi'], n_block),
+        trend=trend, seasonal=seasonal, seasonal_periods=seasonal_periods,
+        l0=l0, b0=b0, s0=s0,
+    )
+    season = smoothed['final_season']
+    if seasonal:
+        # Slot terakhir siklus = komponen sebelum siklus (konvensi forecast statsmodels)
+        season = season.copy()
+        season[:, -1] = smoothed['season'][:, -seasonal_periods - 1]
+    forecast = HoltWintersEngine.forecast(
+        smoothed['final_level'], smoothed['final_trend'], season,
+        horizon, phi=smoothed['phi'], trend=trend, seasonal=seasonal
+    )[:, -1]
+
+    return forecast.reshape(n_series, n_block), sse
+
+
+def _series_result(history: List[Dict], values: np.ndarray, targets: np.ndarray,
+                   forecasts: Dict[str, np.ndarray]) -> Dict:
+    """
+    Hasil per-origin dan metrik out-of-sample untuk satu series
+    """
+    origin_results = []
+    for j, target in enumerate(targets):
+        period = history[target]
+        aktual = float(values[target])
+        prediksi = {}
+        error_persentase = {}
+        for method, forecast in forecasts.items():
+            value = forecast[j]
+            if np.isnan(value):
+                prediksi[method] = None
+                error_persentase[method] = None
+            else:
+                prediksi[method] = float(value)
+                error_persentase[method] = float(abs(value - aktual) / aktual * 100) if aktual else None
+        origin_results.append({
+            'tahun': period['tahun'],
+            'bulan': period['bulan'],
+            'nilai_aktual': aktual,
+            'prediksi': prediksi,
+            'error_persentase': error_persentase,
+        })
+
+    metrics = {}
+    for method, forecast in forecasts.items():
+        mask = ~np.isnan(forecast)
+        if not mask.any():
+            metrics[method] = None
+            continue
+        actual = values[targets][mask]
+        metrics[method] = calculate_all_metrics(actual.tolist(), forecast[mask].tolist())
+        metrics[method]['jumlah_origin'] = int(mask.sum())
+
+    scored = {m: v['mape'] for m, v in metrics.items() if v is not None}
+    return {
+        'jumlah_data': len(history),
+        'origins': origin_results,
+        'metrics': metrics,
+        'best_method': min(scored, key=scored.get) if scored else None,
+    }
+
+
+def _leaderboard(series_results: Dict[Hashable, Dict], methods: List[str]) -> List[Dict]:
+    """
+    Peringkat metode berdasarkan rata-rata metrik out-of-sample semua series
+    """
+    rows = []
+    for method in methods:
+        metrics = [r['metrics'][method] for r in series_results.values() if r['metrics'].get(method)]
+        if not metrics:
+            continue
+        rows.append({
+            'metode': method,
+            'mape': float(np.mean([m['mape'] for m in metrics])),
+            'mae': float(np.mean([m['mae'] for m in metrics])),
+            'rmse': float(np.mean([m['rmse'] for m in metrics])),
+            'jumlah_series': len(metrics),
+            'jumlah_origin': sum(m['jumlah_origin'] for m in metrics),
+            'menang': sum(1 for r in series_results.values() if r['best_method'] == method),
+        })
+
+    rows.sort(key=lambda row: row['mape'])
+    for rank, row in enumerate(rows, start=1):
+        row['peringkat'] = rank
+    return rows
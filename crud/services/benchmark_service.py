@@ -0,0 +1,314 @@
+"""
+Benchmark jalur forecasting dengan series sintetis (manage.py benchmark_prediksi)
+
+Series pendapatan bulanan sintetis (level x trend x musiman + noise) dibuat
+untuk beberapa panjang data dan jumlah series. Untuk setiap metode diukur
+waktu fit, forecast dari state akhir, dan perhitungan metrik (p50/p95), serta
+puncak alokasi memori (tracemalloc) pada pass terpisah agar tidak
+memperlambat pengukuran waktu.
+
+Model dipanggil langsung (bukan lewat PredictionService) sehingga cache model
+dan database tidak ikut terukur.
+"""
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from crud.services.exponential_smoothing import (
+    DEFAULT_SPEED,
+    DoubleExponentialSmoothing,
+    SimpleExponentialSmoothing,
+    TripleExponentialSmoothing,
+)
+from crud.services.holt_winters_engine import HoltWintersEngine
+from crud.services.hybrid_prediction_service import HybridPredictionService
+from crud.utils.metrics import calculate_all_metrics
+
+
+class BenchmarkService:
+    """
+    Benchmark fit/forecast/metrik SES, DES, TES, TES_BATCH, dan HYBRID
+    """
+
+    METHODS = ('SES', 'DES', 'TES', 'TES_BATCH', 'HYBRID')
+    DEFAULT_LENGTHS = (36, 60, 120)
+    DEFAULT_SERIES = (1, 10)
+    DEFAULT_REPEAT = 5
+    FORECAST_STEPS = 12
+    SEASONAL_PERIODS = 12
+
+    # HYBRID: jendela training dan Monthly MAPE tetap agar tidak membaca database
+    HYBRID_TRAINING_PERIODS = 24
+    HYBRID_MONTHLY_MAPE = 20.0
+
+    @staticmethod
+    def synthetic_series(length: int, n_series: int = 1, seed: int = 0,
+                         level: float = 1_000_000.0, trend: float = 0.004,
+                         seasonal_amplitude: float = 0.15, noise: float = 0.05) -> np.ndarray:
+        """
+        Membuat series pendapatan bulanan sintetis
+
+        Setiap series: level x (1 + trend)^t x (1 + amplitudo musiman x sin) x noise
+        lognormal, dengan level, trend, dan fase musiman acak per series.
+
+        Returns:
+            Array (n_series x length), semua nilai positif
+        """
+        rng = np.random.default_rng(seed)
+        t = np.arange(length)
+        levels = level * rng.uniform(0.5, 1.5, (n_series, 1))
+        trends = trend * rng.uniform(0.0, 2.0, (n_series, 1))
+        phases = rng.uniform(0, 2 * np.pi, (n_series, 1))
+        seasonal = 1 + seasonal_amplitude * np.sin(2 * np.pi * t / BenchmarkService.SEASONAL_PERIODS + phases)
+        noise_factor = rng.lognormal(0.0, noise, (n_series, length))
+        return levels * (1 + trends) ** t * seasonal * noise_factor
+
+    @staticmethod
+    def _fit(method: str, batch: np.ndarray, speed: str) -> List[Tuple[np.ndarray, Dict]]:
+        """
+        Fit semua series dalam batch, mengembalikan (data, info) per series
+        """
+        if method == 'TES_BATCH':
+            fits = TripleExponentialSmoothing.predict_many(
+                {i: list(row) for i, row in enumerate(batch)},
+                seasonal_periods=BenchmarkService.SEASONAL_PERIODS
+            )
+            return [(batch[i], fits[i][4]) for i in range(len(batch))]
+
+        results = []
+        for row in batch:
+            data = list(row)
+            if method == 'SES':
+                info = SimpleExponentialSmoothing.predict(data, speed=speed)[2]
+            elif method == 'DES':
+                info = DoubleExponentialSmoothing.predict(data, speed=speed)[3]
+            elif method == 'TES':
+                info = TripleExponentialSmoothing.predict(
+                    data, seasonal_periods=BenchmarkService.SEASONAL_PERIODS, speed=speed
+                )[4]
+            else:
+                info = BenchmarkService._fit_hybrid(row, speed)
+            results.append((row, info))
+        return results
+
+    @staticmethod
+    def _fit_hybrid(row: np.ndarray, speed: str) -> Dict:
+        """
+        Hybrid dengan data yang sudah dimuat (tanpa database dan cache)
+        """
+        periods = BenchmarkService.HYBRID_TRAINING_PERIODS
+        window = row[-periods:]
+        # Periode sintetis mulai Januari 2000, target = bulan setelah data terakhir
+        historical = [
+            {'tahun': 2000 + i // 12, 'bulan': i % 12 + 1, 'total_pendapatan': float(v)}
+            for i, v in enumerate(window)
+        ]
+        tahun = 2000 + len(window) // 12
+        bulan = len(window) % 12 + 1
+        result = HybridPredictionService.predict_hybrid(
+            tahun_prediksi=tahun, bulan_prediksi=bulan, training_periods=periods,
+            historical_data=historical, monthly_mape=BenchmarkService.HYBRID_MONTHLY_MAPE,
+            actual_value=None, speed=speed
+        )
+        return {'hybrid': result}
+
+    @staticmethod
+    def _forecast(fits: List[Tuple[np.ndarray, Dict]], steps: int) -> List[np.ndarray]:
+        """
+        Forecast `steps` langkah dari state akhir setiap fit
+        """
+        forecasts = []
+        for _, info in fits:
+            state = info.get('state')
+            if state is None:
+                continue
+            forecasts.append(HoltWintersEngine.forecast_state(state, steps))
+        return forecasts
+
+    @staticmethod
+    def _metrics(fits: List[Tuple[np.ndarray, Dict]]) -> List[Dict]:
+        """
+        Metrik in-sample (MAPE/MAE/RMSE) setiap fit
+        """
+        metrics = []
+        for data, info in fits:
+            fitted = info.get('forecast_values')
+            if fitted is None:
+                continue
+            skip = BenchmarkService.SEASONAL_PERIODS if info.get('method') == 'TES' else 1
+            metrics.append(calculate_all_metrics(list(data[skip:]), list(fitted[skip:])))
+        return metrics
+
+    @staticmethod
+    def _time(fn: Callable, repeat: int) -> Tuple[List[float], object]:
+        timings = []
+        result = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, result
+
+    @staticmethod
+    def _peak_kb(fn: Callable) -> float:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak / 1024
+
+    @staticmethod
+    def _summary(timings: List[float]) -> Dict:
+        return {
+            'p50_ms': round(float(np.percentile(timings, 50)), 3),
+            'p95_ms': round(float(np.percentile(timings, 95)), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+        }
+
+    @staticmethod
+    def run_case(method: str, length: int, n_series: int, repeat: int = DEFAULT_REPEAT,
+                 speed: str = DEFAULT_SPEED, seed: int = 0) -> List[Dict]:
+        """
+        Benchmark satu metode untuk satu ukuran data
+
+        Returns:
+            List baris hasil per fase (fit, forecast, metrics)
+        """
+        if method not in BenchmarkService.METHODS:
+            raise ValueError('Metode harus salah satu dari: ' + ', '.join(BenchmarkService.METHODS))
+
+        batch = BenchmarkService.synthetic_series(length, n_series, seed=seed)
+        steps = BenchmarkService.FORECAST_STEPS
+
+        # Pemanasan (import statsmodels/engine) agar tidak masuk pengukuran
+        BenchmarkService._fit(method, batch[:1], speed)
+
+        phases = {
+            'fit': lambda: BenchmarkService._fit(method, batch, speed),
+        }
+        fit_timings, fits = BenchmarkService._time(phases['fit'], repeat)
+        if method != 'HYBRID':
+            phases['forecast'] = lambda: BenchmarkService._forecast(fits, steps)
+            phases['metrics'] = lambda: BenchmarkService._metrics(fits)
+
+        rows = []
+        for phase, fn in phases.items():
+            timings = fit_timings if phase == 'fit' else BenchmarkService._time(fn, repeat)[0]
+            rows.append({
+                'method': method,
+                'length': length,
+                'series': n_series,
+                'phase': phase,
+                **BenchmarkService._summary(timings),
+                'peak_kb': round(BenchmarkService._peak_kb(fn), 1),
+            })
+        return rows
+
+    @staticmethod
+    def run(methods: Sequence[str] = METHODS,
+            lengths: Sequence[int] = DEFAULT_LENGTHS,
+            series_counts: Sequence[int] = DEFAULT_SERIES,
+            repeat: int = DEFAULT_REPEAT,
+            speed: str = DEFAULT_SPEED,
+            seed: int = 0,
+            progress: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Menjalankan seluruh kombinasi metode x panjang data x jumlah series
+
+        Returns:
+            Dictionary laporan: meta (lingkungan & parameter) dan results (baris per fase)
+        """
+        if repeat < 1:
+            raise ValueError('Repeat minimal 1')
+        too_short = [n for n in lengths if n < 2 * BenchmarkService.SEASONAL_PERIODS]
+        if too_short:
+            raise ValueError(f'Panjang series minimal {2 * BenchmarkService.SEASONAL_PERIODS} bulan')
+
+        results = []
+        for method in methods:
+            for length in lengths:
+                for n_series in series_counts:
+                    if progress:
+                        progress(f'{method} panjang={length} series={n_series}')
+                    results.extend(BenchmarkService.run_case(
+                        method, length, n_series, repeat=repeat, speed=speed, seed=seed
+                    ))
+
+        return {
+            'meta': BenchmarkService.environment(repeat=repeat, speed=speed, seed=seed),
+            'results': results,
+        }
+
+    @staticmethod
+    def environment(**params) -> Dict:
+        """
+        Informasi lingkungan untuk laporan (versi Python/NumPy/statsmodels, CPU)
+        """
+        try:
+            from importlib.metadata import version
+            statsmodels_version = version('statsmodels')
+        except Exception:
+            statsmodels_version = None
+
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'statsmodels': statsmodels_version,
+            'machine': platform.machine(),
+            'processor': platform.processor() or None,
+            **params,
+        }
+
+    @staticmethod
+    def compare(report: Dict, baseline: Dict, tolerance: float = 1.5) -> List[Dict]:
+        """
+        Membandingkan p50 laporan dengan baseline
+
+        Returns:
+            List baris yang p50-nya lebih dari tolerance x p50 baseline
+        """
+        key = lambda row: (row['method'], row['length'], row['series'], row['phase'])
+        base_rows = {key(row): row for row in baseline.get('results', [])}
+
+        regressions = []
+        for row in report['results']:
+            base = base_rows.get(key(row))
+            if base and base['p50_ms'] > 0 and row['p50_ms'] > base['p50_ms'] * tolerance:
+                regressions.append({
+                    **row,
+                    'baseline_p50_ms': base['p50_ms'],
+                    'ratio': round(row['p50_ms'] / base['p50_ms'], 2),
+                })
+        return regressions
+
+    @staticmethod
+    def to_markdown(report: Dict) -> str:
+        """
+        Laporan dalam format tabel Markdown
+        """
+        meta = report['meta']
+        lines = [
+            '# Benchmark forecasting',
+            '',
+            f"- Dibuat: {meta['generated_at']}",
+            f"- Python {meta['python']}, NumPy {meta['numpy']}, statsmodels {meta['statsmodels']}",
+            f"- Mesin: {meta['machine']} {meta['processor'] or ''}".rstrip(),
+            f"- Repeat: {meta['repeat']}, speed: {meta['speed']}, seed: {meta['seed']}",
+            '',
+            '| Metode | Panjang | Series | Fase | p50 (ms) | p95 (ms) | Mean (ms) | Peak (KB) |',
+            '|---|---:|---:|---|---:|---:|---:|---:|',
+        ]
+        for row in report['results']:
+            lines.append(
+                f"| {row['method']} | {row['length']} | {row['series']} | {row['phase']} | "
+                f"{row['p50_ms']:.3f} | {row['p95_ms']:.3f} | {row['mean_ms']:.3f} | {row['peak_kb']:.1f} |"
+            )
+        return '\n'.join(lines) + '\n'
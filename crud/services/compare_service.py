@@ -0,0 +1,336 @@
+"""
+Service untuk membandingkan semua metode prediksi (SES, DES, TES, HYBRID)
+
+Data historis, nilai aktual, dan Monthly MAPE dimuat sekali di proses utama,
+lalu keempat model di-fit bersamaan di process pool sehingga latensi
+perbandingan dibatasi oleh model yang paling lambat, bukan jumlah semuanya.
+
+Mode auto_select membatasi latensi dengan budget waktu: baseline murah
+dijalankan lebih dulu, konfigurasi TES hanya selama waktu masih tersedia.
+"""
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from crud.services.exponential_smoothing import DeadlineExceeded
+from crud.services.hybrid_prediction_service import HybridPredictionService
+from crud.services.prediction_service import PredictionService
+from crud.services.worker_pool import WorkerPool
+from crud.utils.metrics import calculate_all_metrics
+
+
+class CompareService:
+    """
+    Pipeline perbandingan metode prediksi dengan satu kali load data
+    """
+
+    METHODS = ('SES', 'DES', 'TES', 'HYBRID')
+    HYBRID_TRAINING_PERIODS = 24
+
+    # Urutan kandidat mode auto_select (dari yang paling murah)
+    AUTO_METHODS = ('SNAIVE', 'SES', 'DES', 'TES')
+
+    @staticmethod
+    def load_history(jenis_kendaraan_id: Optional[int], tahun_prediksi: int,
+                     bulan_prediksi: int, seasonal_periods: int = 12) -> List[Dict]:
+        """
+        Memuat data historis sampai bulan sebelum target (sekali untuk semua metode)
+
+        Dicoba dengan syarat periode TES terlebih dulu agar fallback ke data
+        real-time ikut berlaku; jika tetap kurang, dimuat ulang dengan syarat
+        minimal DES dan masing-masing metode memvalidasi panjang datanya sendiri.
+        """
+        if bulan_prediksi == 1:
+            end_date = date(tahun_prediksi - 1, 12, 1)
+        else:
+            end_date = date(tahun_prediksi, bulan_prediksi - 1, 1)
+
+        try:
+            return PredictionService.get_historical_data(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                end_date=end_date,
+                min_periods=2 * seasonal_periods
+            )
+        except ValueError:
+            return PredictionService.get_historical_data(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                end_date=end_date,
+                min_periods=3
+            )
+
+    @staticmethod
+    def build_tasks(historical: List[Dict], tahun_prediksi: int, bulan_prediksi: int,
+                    jenis_kendaraan_id: Optional[int] = None,
+                    seasonal_periods: int = 12,
+                    actual_value: Optional[float] = None,
+                    monthly_mape: Optional[float] = None,
+                    parallel: bool = False) -> List[Tuple[str, Dict]]:
+        """
+        Menyusun argumen untuk setiap metode dari data yang sudah dimuat
+
+        Returns:
+            List tuple (metode, kwargs) untuk _run_method
+        """
+        common = {
+            'jenis_kendaraan_id': jenis_kendaraan_id,
+            'tahun_prediksi': tahun_prediksi,
+            'bulan_prediksi': bulan_prediksi,
+        }
+
+        # Hybrid hanya memakai window training N periode terakhir
+        end_date = date(tahun_prediksi, bulan_prediksi, 1) - timedelta(days=1)
+        start_date = HybridPredictionService.training_start_date(
+            CompareService.HYBRID_TRAINING_PERIODS, end_date
+        )
+        hybrid_history = [
+            d for d in historical
+            if (d['tahun'], d['bulan']) >= (start_date.year, start_date.month)
+        ]
+
+        return [
+            ('SES', dict(common, optimize=True, historical=historical, actual_value=actual_value)),
+            ('DES', dict(common, optimize=True, historical=historical, actual_value=actual_value)),
+            ('TES', dict(common, seasonal_periods=seasonal_periods, optimize=True, parallel=parallel,
+                         historical=historical, actual_value=actual_value)),
+            ('HYBRID', dict(common, training_periods=CompareService.HYBRID_TRAINING_PERIODS,
+                            selected_scenario='base', return_details=True,
+                            historical_data=hybrid_history, monthly_mape=monthly_mape,
+                            actual_value=actual_value)),
+        ]
+
+    @staticmethod
+    def compare(tahun_prediksi: int, bulan_prediksi: int,
+                jenis_kendaraan_id: Optional[int] = None,
+                seasonal_periods: int = 12,
+                concurrent: bool = True,
+                parallel: bool = False,
+                max_workers: Optional[int] = None) -> Tuple[Dict, Optional[float]]:
+        """
+        Menjalankan keempat metode prediksi untuk satu periode
+
+        Args:
+            tahun_prediksi: Tahun yang akan diprediksi
+            bulan_prediksi: Bulan yang akan diprediksi
+            jenis_kendaraan_id: ID jenis kendaraan (None = semua)
+            seasonal_periods: Periode musiman untuk TES
+            concurrent: Jalankan keempat metode bersamaan di process pool
+            parallel: Evaluasi konfigurasi TES bersamaan (hanya saat concurrent=False)
+            max_workers: Batas jumlah worker process
+
+        Returns:
+            Tuple: (results per metode, nilai aktual atau None)
+        """
+        actual_value = PredictionService.get_actual_value(
+            tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+        )
+
+        try:
+            historical = CompareService.load_history(
+                jenis_kendaraan_id, tahun_prediksi, bulan_prediksi, seasonal_periods
+            )
+        except ValueError as e:
+            return {method: {'error': str(e)} for method in CompareService.METHODS}, actual_value
+
+        monthly_mape = HybridPredictionService.get_monthly_mape(
+            target_month=bulan_prediksi,
+            target_year=tahun_prediksi,
+            jenis_kendaraan_id=jenis_kendaraan_id
+        )
+
+        tasks = CompareService.build_tasks(
+            historical, tahun_prediksi, bulan_prediksi,
+            jenis_kendaraan_id=jenis_kendaraan_id,
+            seasonal_periods=seasonal_periods,
+            actual_value=actual_value,
+            monthly_mape=monthly_mape,
+            # Worker process tidak boleh membuat pool bersarang
+            parallel=parallel and not concurrent
+        )
+
+        results = None
+        if concurrent:
+            results = _run_methods_parallel(tasks, max_workers)
+        if results is None:
+            results = [_run_method(method, kwargs) for method, kwargs in tasks]
+
+        return {method: result for (method, _), result in zip(tasks, results)}, actual_value
+
+    @staticmethod
+    def seasonal_naive(historical: List[Dict], tahun_prediksi: int, bulan_prediksi: int,
+                       seasonal_periods: int = 12, actual_value: Optional[float] = None) -> Dict:
+        """
+        Baseline seasonal naive: prediksi = nilai bulan yang sama satu musim sebelumnya
+
+        Format hasil sama dengan PredictionService.predict_*, MAPE in-sample
+        dihitung dari pasangan y[t] dan y[t - seasonal_periods].
+        """
+        values = [d['total_pendapatan'] for d in historical]
+        if len(values) <= seasonal_periods:
+            raise ValueError(f"Data historis minimal {seasonal_periods + 1} periode untuk seasonal naive")
+
+        steps = PredictionService._calculate_steps(historical, tahun_prediksi, bulan_prediksi)
+        future_forecasts = [
+            float(values[len(values) - seasonal_periods + (h % seasonal_periods)])
+            for h in range(steps)
+        ]
+        prediction = future_forecasts[-1]
+        forecast_values = values[:-seasonal_periods]
+        metrics = calculate_all_metrics(values[seasonal_periods:], forecast_values)
+
+        return {
+            'nilai_prediksi': Decimal(str(prediction)),
+            'metode': 'SNAIVE',
+            'alpha': None,
+            'beta': None,
+            'gamma': None,
+            'seasonal_periods': seasonal_periods,
+            'mape': Decimal(str(metrics['mape'])),
+            'mae': Decimal(str(metrics['mae'])),
+            'rmse': Decimal(str(metrics['rmse'])),
+            'data_training_dari': date(historical[0]['tahun'], historical[0]['bulan'], 1),
+            'data_training_sampai': date(historical[-1]['tahun'], historical[-1]['bulan'], 1),
+            'jumlah_data_training': len(historical),
+            'nilai_aktual': Decimal(str(actual_value)) if actual_value is not None else None,
+            'info': {
+                'forecast_values': [float(v) for v in forecast_values],
+                'future_forecasts': future_forecasts,
+                'steps': steps,
+                'method': 'SNAIVE',
+            },
+        }
+
+    @staticmethod
+    def auto_select(tahun_prediksi: int, bulan_prediksi: int,
+                    jenis_kendaraan_id: Optional[int] = None,
+                    seasonal_periods: int = 12,
+                    budget_ms: int = 800) -> Tuple[Dict, Optional[float], Dict]:
+        """
+        Pemilihan metode otomatis dengan batas latensi
+
+        Kandidat dijalankan berurutan sesuai AUTO_METHODS. Seasonal naive selalu
+        dijalankan; SES dan DES selama budget belum habis; konfigurasi TES hanya
+        selama sisa waktu cukup (lihat TripleExponentialSmoothing.predict). Metode
+        terbaik dipilih dari MAPE in-sample terkecil di antara yang sempat selesai.
+
+        Args:
+            tahun_prediksi: Tahun yang akan diprediksi
+            bulan_prediksi: Bulan yang akan diprediksi
+            jenis_kendaraan_id: ID jenis kendaraan (None = semua)
+            seasonal_periods: Periode musiman
+            budget_ms: Budget waktu total (milidetik), termasuk load data
+
+        Returns:
+            Tuple: (results per metode, nilai aktual atau None, info auto) dengan
+            info auto berisi best_method, best_mape, partial, skipped, dan waktu
+        """
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000
+
+        actual_value = PredictionService.get_actual_value(
+            tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+        )
+
+        results = {}
+        skipped = []
+        try:
+            historical = CompareService.load_history(
+                jenis_kendaraan_id, tahun_prediksi, bulan_prediksi, seasonal_periods
+            )
+        except ValueError as e:
+            historical = None
+            results = {method: {'error': str(e)} for method in CompareService.AUTO_METHODS}
+
+        if historical is not None:
+            common = {
+                'jenis_kendaraan_id': jenis_kendaraan_id,
+                'tahun_prediksi': tahun_prediksi,
+                'bulan_prediksi': bulan_prediksi,
+                'historical': historical,
+                'actual_value': actual_value,
+            }
+            for method in CompareService.AUTO_METHODS:
+                if method != 'SNAIVE' and time.perf_counter() >= deadline:
+                    skipped.append(method)
+                    continue
+                try:
+                    if method == 'SNAIVE':
+                        results[method] = CompareService.seasonal_naive(
+                            historical, tahun_prediksi, bulan_prediksi,
+                            seasonal_periods=seasonal_periods, actual_value=actual_value
+                        )
+                    elif method == 'SES':
+                        results[method] = PredictionService.predict_ses(optimize=True, **common)
+                    elif method == 'DES':
+                        results[method] = PredictionService.predict_des(optimize=True, **common)
+                    else:
+                        results[method] = PredictionService.predict_tes(
+                            seasonal_periods=seasonal_periods, optimize=True,
+                            deadline=deadline, **common
+                        )
+                except DeadlineExceeded:
+                    skipped.append(method)
+                except Exception as e:
+                    results[method] = {'error': str(e)}
+
+        best_method = None
+        best_mape = None
+        for method, result in results.items():
+            if 'error' in result or result.get('mape') is None:
+                continue
+            mape = float(result['mape'])
+            if best_mape is None or mape < best_mape:
+                best_method = method
+                best_mape = mape
+
+        tes_info = results.get('TES', {}).get('info', {})
+        partial = bool(skipped) or bool(tes_info.get('partial'))
+
+        auto = {
+            'budget_ms': budget_ms,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            'best_method': best_method,
+            'best_mape': best_mape,
+            'partial': partial,
+            'skipped': skipped,
+            'tes_configs_tried': tes_info.get('configs_tried'),
+        }
+        return results, actual_value, auto
+
+
+def _run_method(method: str, kwargs: Dict) -> Dict:
+    """
+    Menjalankan satu metode prediksi dengan data yang sudah dimuat
+
+    Didefinisikan di level modul agar bisa dijalankan di process pool. Tidak
+    ada query database di sini karena history/aktual/MAPE sudah diberikan.
+    """
+    try:
+        if method == 'SES':
+            return PredictionService.predict_ses(**kwargs)
+        if method == 'DES':
+            return PredictionService.predict_des(**kwargs)
+        if method == 'TES':
+            return PredictionService.predict_tes(**kwargs)
+        return HybridPredictionService.predict_hybrid(**kwargs)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _run_methods_parallel(tasks: List[Tuple[str, Dict]],
+                          max_workers: Optional[int] = None) -> Optional[List[Dict]]:
+    """
+    Menjalankan _run_method untuk semua metode secara bersamaan
+
+    Returns:
+        List hasil (urutan sama dengan tasks), atau None jika process pool
+        tidak tersedia sehingga pemanggil perlu fallback ke mode serial
+    """
+    try:
+        executor = WorkerPool.get(max_workers)
+        futures = [executor.submit(_run_method, method, kwargs) for method, kwargs in tasks]
+        return [future.result() for future in futures]
+    except (BrokenProcessPool, OSError, RuntimeError):
+        WorkerPool.reset()
+        return None
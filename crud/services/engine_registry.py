@@ -0,0 +1,81 @@
+"""
+Registry engine forecasting yang di-import saat pertama kali dipakai
+
+statsmodels (beserta scipy dan pandas) membutuhkan lebih dari satu detik
+untuk di-import. Dengan registry ini modul tersebut tidak ikut ter-load saat
+worker gunicorn start atau saat manage.py command yang tidak melakukan
+prediksi (migrate, create_admin, import_excel) dijalankan.
+"""
+import importlib
+import sys
+import threading
+from typing import Any, Dict, List, Tuple
+
+
+class EngineRegistry:
+    """
+    Pemetaan nama engine -> (modul, atribut) dengan import lazy
+    """
+
+    ENGINES: Dict[str, Tuple[str, str]] = {
+        'holt_winters': ('statsmodels.tsa.holtwinters', 'ExponentialSmoothing'),
+    }
+
+    _loaded: Dict[str, Any] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get(name: str) -> Any:
+        """
+        Mengambil engine berdasarkan nama (import modul pada pemanggilan pertama)
+
+        Args:
+            name: Nama engine di ENGINES
+
+        Returns:
+            Objek engine (misalnya class ExponentialSmoothing statsmodels)
+        """
+        engine = EngineRegistry._loaded.get(name)
+        if engine is not None:
+            return engine
+
+        if name not in EngineRegistry.ENGINES:
+            raise KeyError(f"Engine '{name}' tidak terdaftar")
+
+        module_name, attr = EngineRegistry.ENGINES[name]
+        with EngineRegistry._lock:
+            if name not in EngineRegistry._loaded:
+                module = importlib.import_module(module_name)
+                EngineRegistry._loaded[name] = getattr(module, attr)
+            return EngineRegistry._loaded[name]
+
+    @staticmethod
+    def preload(*names: str) -> List[str]:
+        """
+        Meng-import engine lebih awal (semua engine jika names kosong)
+
+        Dipakai sebelum membuat process pool 'fork' (dan di initializer worker
+        forkserver) supaya setiap worker memakai modul yang sudah ter-load.
+
+        Returns:
+            List nama engine yang di-load
+        """
+        names = names or tuple(EngineRegistry.ENGINES)
+        for name in names:
+            EngineRegistry.get(name)
+        return list(names)
+
+    @staticmethod
+    def modules() -> List[str]:
+        """
+        Nama modul semua engine (untuk preload forkserver)
+        """
+        return [module_name for module_name, _ in EngineRegistry.ENGINES.values()]
+
+    @staticmethod
+    def is_loaded(name: str) -> bool:
+        """
+        Mengecek apakah modul engine sudah ada di sys.modules
+        """
+        module_name, _ = EngineRegistry.ENGINES[name]
+        return name in EngineRegistry._loaded or module_name in sys.modules
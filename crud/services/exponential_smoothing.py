@@ -1,16 +1,87 @@
 """
 Implementasi algoritma Exponential Smoothing untuk prediksi
-Menggunakan statsmodels untuk optimasi parameter yang lebih baik (MLE)
+Menggunakan statsmodels untuk optimasi parameter yang lebih baik (MLE).
+statsmodels di-import lazy melalui EngineRegistry saat fitting pertama.
 
 - Simple Exponential Smoothing (SES)
 - Double Exponential Smoothing (DES/Holt)
 - Triple Exponential Smoothing (TES/Holt-Winters)
 """
 import numpy as np
+import time
 import warnings
-from typing import List, Tuple, Optional
+from collections import defaultdict
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, Hashable, List, Tuple, Optional
 from decimal import Decimal
-from statsmodels.tsa.holtwinters import ExponentialSmoothing as HoltWinters
+
+from crud.services.engine_registry import EngineRegistry
+from crud.services.holt_winters_engine import HoltWintersEngine
+from crud.services.worker_pool import WorkerPool
+from crud.utils.metrics import calculate_mape
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing as HoltWinters
+
+
+# Preset kecepatan optimizer statsmodels ('accurate' = default statsmodels)
+# method: optimizer, use_brute: grid brute-force untuk titik awal,
+# maxiter: batas iterasi/evaluasi optimizer, tes_configs: konfigurasi TES yang dicoba
+SPEED_PRESETS = {
+    'fast': {
+        'method': 'least_squares', 'use_brute': False, 'maxiter': 20,
+        'tes_configs': ('add+mul', 'add+add'),
+    },
+    'balanced': {
+        'method': 'least_squares', 'use_brute': False, 'maxiter': 100,
+        'tes_configs': None,
+    },
+    'accurate': {
+        'method': None, 'use_brute': True, 'maxiter': None,
+        'tes_configs': None,
+    },
+}
+DEFAULT_SPEED = 'accurate'
+
+
+def speed_fit_kwargs(speed: str) -> dict:
+    """
+    Menyusun argumen fit() statsmodels untuk preset kecepatan
+    
+    Args:
+        speed: Nama preset ('fast', 'balanced', 'accurate')
+    
+    Returns:
+        Dictionary argumen tambahan untuk fit(optimized=True)
+    """
+    if speed not in SPEED_PRESETS:
+        raise ValueError(f"Speed harus salah satu dari: {', '.join(SPEED_PRESETS)}")
+    
+    preset = SPEED_PRESETS[speed]
+    kwargs = {}
+    if preset['method']:
+        kwargs['method'] = preset['method']
+    if not preset['use_brute']:
+        kwargs['use_brute'] = False
+    if preset['maxiter']:
+        if preset['method'] == 'least_squares':
+            kwargs['minimize_kwargs'] = {'max_nfev': preset['maxiter']}
+        else:
+            kwargs['minimize_kwargs'] = {'options': {'maxiter': preset['maxiter']}}
+    return kwargs
+
+
+# Default prediction interval hasil simulasi (lihat simulate_interval)
+INTERVAL_PATHS = 10000
+INTERVAL_MAX_PATHS = 100000
+INTERVAL_QUANTILES = (0.025, 0.975)
+INTERVAL_SEED = 0
+
+
+class DeadlineExceeded(ValueError):
+    """
+    Tidak ada konfigurasi yang sempat di-fit sebelum deadline
+    """
 
 
 class SimpleExponentialSmoothing:
@@ -22,7 +93,8 @@ class SimpleExponentialSmoothing:
     
     @staticmethod
     def predict(data: List[float], alpha: Optional[float] = None, 
-                optimize: bool = True, steps: int = 1) -> Tuple[float, float, dict]:
+                optimize: bool = True, steps: int = 1,
+                speed: str = DEFAULT_SPEED) -> Tuple[float, float, dict]:
         """
         Melakukan prediksi menggunakan Simple Exponential Smoothing
         
@@ -31,6 +103,7 @@ class SimpleExponentialSmoothing:
             alpha: Parameter smoothing (0-1), jika None akan dioptimasi
             optimize: Jika True, akan mencari alpha optimal
             steps: Jumlah langkah ke depan yang diprediksi (default: 1)
+            speed: Preset optimizer (lihat SPEED_PRESETS)
         
         Returns:
             Tuple: (prediksi, alpha_optimal, info)
@@ -42,19 +115,38 @@ class SimpleExponentialSmoothing:
             raise ValueError("Steps minimal 1")
         
         data_arr = np.array(data, dtype=float)
+        speed_kwargs = speed_fit_kwargs(speed)
+        started = time.perf_counter()
+        
+        # Parameter tetap: hitung langsung dengan NumPy tanpa statsmodels
+        if alpha is not None:
+            fixed = _predict_fixed(data_arr, steps, float(alpha))
+            info = {
+                'alpha': float(alpha),
+                'forecast_values': fixed['forecast_values'],
+                'future_forecasts': fixed['future_forecasts'],
+                'steps': steps,
+                'method': 'SES',
+                'state': fixed['state'],
+                'engine': 'numpy-fixed',
+                'speed': speed,
+                'fit_time_ms': (time.perf_counter() - started) * 1000,
+            }
+            return fixed['future_forecasts'][0], float(alpha), info
         
         # Build model
+        HoltWinters = EngineRegistry.get('holt_winters')
         model = HoltWinters(data_arr, trend=None, seasonal=None)
         
         # Fit model
         fit_kwargs = {'optimized': optimize}
-        if alpha is not None:
-            fit_kwargs['smoothing_level'] = float(alpha)
-            fit_kwargs['optimized'] = False
+        if optimize:
+            fit_kwargs.update(speed_kwargs)
         
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             fit = model.fit(**fit_kwargs)
+        fit_time_ms = (time.perf_counter() - started) * 1000
         
         alpha_opt = float(fit.params.get('smoothing_level', 0.5))
         
@@ -72,7 +164,10 @@ class SimpleExponentialSmoothing:
             'forecast_values': forecast_values,
             'future_forecasts': future_forecasts,
             'steps': steps,
-            'method': 'SES'
+            'method': 'SES',
+            'state': _statsmodels_state(fit),
+            'speed': speed,
+            'fit_time_ms': fit_time_ms,
         }
         
         return float(next_prediction), alpha_opt, info
@@ -88,7 +183,7 @@ class DoubleExponentialSmoothing:
     @staticmethod
     def predict(data: List[float], alpha: Optional[float] = None,
                 beta: Optional[float] = None, optimize: bool = True, 
-                steps: int = 1) -> Tuple[float, float, float, dict]:
+                steps: int = 1, speed: str = DEFAULT_SPEED) -> Tuple[float, float, float, dict]:
         """
         Melakukan prediksi menggunakan Double Exponential Smoothing
         
@@ -98,6 +193,7 @@ class DoubleExponentialSmoothing:
             beta: Parameter smoothing trend (0-1)
             optimize: Jika True, akan mencari alpha dan beta optimal
             steps: Jumlah langkah ke depan yang diprediksi (default: 1)
+            speed: Preset optimizer (lihat SPEED_PRESETS)
         
         Returns:
             Tuple: (prediksi, alpha_optimal, beta_optimal, info)
@@ -109,8 +205,30 @@ class DoubleExponentialSmoothing:
             raise ValueError("Steps minimal 1")
         
         data_arr = np.array(data, dtype=float)
+        speed_kwargs = speed_fit_kwargs(speed)
+        started = time.perf_counter()
+        
+        # Parameter tetap: hitung langsung dengan NumPy tanpa statsmodels
+        if alpha is not None and beta is not None:
+            fixed = _predict_fixed(data_arr, steps, float(alpha), float(beta))
+            info = {
+                'alpha': float(alpha),
+                'beta': float(beta),
+                'level_values': fixed['level_values'],
+                'trend_values': fixed['trend_values'],
+                'forecast_values': fixed['forecast_values'],
+                'future_forecasts': fixed['future_forecasts'],
+                'steps': steps,
+                'method': 'DES',
+                'state': fixed['state'],
+                'engine': 'numpy-fixed',
+                'speed': speed,
+                'fit_time_ms': (time.perf_counter() - started) * 1000,
+            }
+            return fixed['future_forecasts'][0], float(alpha), float(beta), info
         
         # Build model with additive trend
+        HoltWinters = EngineRegistry.get('holt_winters')
         model = HoltWinters(data_arr, trend='add', seasonal=None)
         
         # Fit model
@@ -119,12 +237,13 @@ class DoubleExponentialSmoothing:
             fit_kwargs['smoothing_level'] = float(alpha)
         if beta is not None:
             fit_kwargs['smoothing_trend'] = float(beta)
-        if alpha is not None and beta is not None:
-            fit_kwargs['optimized'] = False
+        if fit_kwargs['optimized']:
+            fit_kwargs.update(speed_kwargs)
         
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             fit = model.fit(**fit_kwargs)
+        fit_time_ms = (time.perf_counter() - started) * 1000
         
         alpha_opt = float(fit.params.get('smoothing_level', 0.5))
         beta_opt = float(fit.params.get('smoothing_trend', 0.3))
@@ -150,7 +269,10 @@ class DoubleExponentialSmoothing:
             'forecast_values': forecast_values,
             'future_forecasts': future_forecasts,
             'steps': steps,
-            'method': 'DES'
+            'method': 'DES',
+            'state': _statsmodels_state(fit, trend='add'),
+            'speed': speed,
+            'fit_time_ms': fit_time_ms,
         }
         
         return float(next_prediction), alpha_opt, beta_opt, info
@@ -162,12 +284,45 @@ class TripleExponentialSmoothing:
     Cocok untuk data dengan trend dan seasonality
     Menggunakan statsmodels dengan dukungan multiplicative seasonal
     """
+
+    # Konfigurasi statsmodels yang dicoba (urutan prioritas)
+    CONFIGS = (
+        ('add+mul', {'trend': 'add', 'seasonal': 'mul'}),
+        ('mul+mul', {'trend': 'mul', 'seasonal': 'mul'}),
+        ('add+add', {'trend': 'add', 'seasonal': 'add'}),
+        ('damped_add+mul', {'trend': 'add', 'seasonal': 'mul', 'damped_trend': True}),
+    )
+    MANUAL_CONFIG = ('manual', {'trend': 'add', 'seasonal': 'mul'})
+    
+    # Warm start ditolak jika MAPE in-sample lebih buruk dari MAPE tersimpan x toleransi
+    WARM_START_TOLERANCE = 1.10
+    WARM_START_PHI = 0.98
+    
+    # Perkiraan durasi satu konfigurasi (detik) sebelum ada yang terukur, untuk deadline
+    CONFIG_ESTIMATE_SECONDS = 0.15
+    
+    # Konfigurasi untuk engine batch NumPy (urutan prioritas sama dengan predict)
+    BATCH_CONFIGS = (
+        {'name': 'add+mul', 'trend': 'add', 'seasonal': 'mul', 'damped': False},
+        {'name': 'mul+mul', 'trend': 'mul', 'seasonal': 'mul', 'damped': False},
+        {'name': 'add+add', 'trend': 'add', 'seasonal': 'add', 'damped': False},
+        {'name': 'damped_add+mul', 'trend': 'add', 'seasonal': 'mul', 'damped': True},
+    )
+    
+    # Toleransi predict_many terhadap predict: selisih relatif forecast per langkah
+    # maksimal BATCH_TOLERANCE, kecuali SSE in-sample predict_many lebih kecil
+    # (optimizer statsmodels berhenti di optimum yang lebih buruk)
+    BATCH_TOLERANCE = 0.01
     
     @staticmethod
     def predict(data: List[float], seasonal_periods: int = 12,
                 alpha: Optional[float] = None, beta: Optional[float] = None,
                 gamma: Optional[float] = None, optimize: bool = True, 
-                steps: int = 1) -> Tuple[float, float, float, float, dict]:
+                steps: int = 1, parallel: bool = False,
+                max_workers: Optional[int] = None,
+                warm_start: Optional[Dict] = None,
+                deadline: Optional[float] = None,
+                speed: str = DEFAULT_SPEED) -> Tuple[float, float, float, float, dict]:
         """
         Melakukan prediksi menggunakan Triple Exponential Smoothing
         
@@ -175,6 +330,7 @@ class TripleExponentialSmoothing:
         1. Additive trend + Multiplicative seasonal (biasa terbaik untuk data bertumbuh)
         2. Multiplicative trend + Multiplicative seasonal
         3. Additive trend + Additive seasonal
+        4. Damped additive trend + Multiplicative seasonal
         
         Args:
             data: List data historis (minimal 2 * seasonal_periods)
@@ -184,6 +340,15 @@ class TripleExponentialSmoothing:
             gamma: Parameter smoothing seasonal (0-1)
             optimize: Jika True, akan mencari parameter optimal
             steps: Jumlah langkah ke depan yang diprediksi (default: 1)
+            parallel: Jika True, konfigurasi dievaluasi bersamaan di process pool
+            max_workers: Batas jumlah worker process (None = WorkerPool.DEFAULT_MAX_WORKERS)
+            warm_start: Parameter dari prediksi sebelumnya sebagai titik awal optimizer,
+                        dict dengan keys alpha, beta, gamma, dan mape (opsional).
+                        Jika hasilnya lebih buruk, otomatis fallback ke cold start.
+            deadline: Batas waktu (time.perf_counter) untuk mode serial. Konfigurasi
+                      berikutnya tidak dijalankan jika diperkirakan melewati batas;
+                      hasil terbaik sejauh ini dikembalikan dengan info['partial'] = True.
+            speed: Preset optimizer (lihat SPEED_PRESETS), termasuk konfigurasi yang dicoba
         
         Returns:
             Tuple: (prediksi, alpha_optimal, beta_optimal, gamma_optimal, info)
@@ -195,100 +360,486 @@ class TripleExponentialSmoothing:
             raise ValueError("Steps minimal 1")
         
         data_arr = np.array(data, dtype=float)
+        speed_kwargs = speed_fit_kwargs(speed)
+        started = time.perf_counter()
         
-        # Konfigurasi yang akan dicoba (urutan prioritas)
-        configs = [
-            {'trend': 'add', 'seasonal': 'mul', 'name': 'add+mul'},
-            {'trend': 'mul', 'seasonal': 'mul', 'name': 'mul+mul'},
-            {'trend': 'add', 'seasonal': 'add', 'name': 'add+add'},
-            {'trend': 'add', 'seasonal': 'mul', 'damped_trend': True, 'name': 'damped_add+mul'},
-        ]
+        fit_kwargs = {'optimized': optimize}
+        if alpha is not None:
+            fit_kwargs['smoothing_level'] = float(alpha)
+        if beta is not None:
+            fit_kwargs['smoothing_trend'] = float(beta)
+        if gamma is not None:
+            fit_kwargs['smoothing_seasonal'] = float(gamma)
         
         # Jika alpha/beta/gamma diberikan manual, hanya gunakan 1 config
+        configs = TripleExponentialSmoothing.CONFIGS
         if alpha is not None and beta is not None and gamma is not None:
-            configs = [{'trend': 'add', 'seasonal': 'mul', 'name': 'manual'}]
+            configs = (TripleExponentialSmoothing.MANUAL_CONFIG,)
+            fit_kwargs['optimized'] = False
         
-        best_fit = None
-        best_sse = float('inf')
-        best_config_name = ''
+        if fit_kwargs['optimized']:
+            fit_kwargs.update(speed_kwargs)
+            preset_configs = SPEED_PRESETS[speed]['tes_configs']
+            if preset_configs:
+                configs = tuple(c for c in configs if c[0] in preset_configs)
         
-        for config in configs:
-            try:
-                config_name = config.pop('name')
-                model = HoltWinters(
-                    data_arr, 
-                    seasonal_periods=seasonal_periods,
-                    **config
-                )
-                
-                fit_kwargs = {'optimized': optimize}
-                if alpha is not None:
-                    fit_kwargs['smoothing_level'] = float(alpha)
-                if beta is not None:
-                    fit_kwargs['smoothing_trend'] = float(beta)
-                if gamma is not None:
-                    fit_kwargs['smoothing_seasonal'] = float(gamma)
-                if alpha is not None and beta is not None and gamma is not None:
-                    fit_kwargs['optimized'] = False
-                
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    fit = model.fit(**fit_kwargs)
-                
-                # Hitung SSE (Sum of Squared Errors) untuk membandingkan konfigurasi
-                fitted = fit.fittedvalues
-                residuals = data_arr - fitted
-                sse = float(np.sum(residuals[seasonal_periods:] ** 2))
-                
-                if sse < best_sse:
-                    best_sse = sse
-                    best_fit = fit
-                    best_config_name = config_name
-                    
-                config['name'] = config_name
-            except Exception:
-                config['name'] = config.get('name', config_name)
-                continue
-        
-        if best_fit is None:
-            raise ValueError("Tidak dapat membangun model TES untuk data ini")
+        # Warm start hanya berlaku untuk optimasi penuh
+        if not optimize or any(p is not None for p in (alpha, beta, gamma)):
+            warm_start = None
         
-        fit = best_fit
-        alpha_opt = float(fit.params.get('smoothing_level', 0.5))
-        beta_opt = float(fit.params.get('smoothing_trend', 0.3))
-        gamma_opt = float(fit.params.get('smoothing_seasonal', 0.2))
+        tasks = [
+            (data_arr, seasonal_periods, config_name, model_kwargs, fit_kwargs, steps, warm_start)
+            for config_name, model_kwargs in configs
+        ]
         
-        # Forecast
-        forecast_future = fit.forecast(steps)
-        next_prediction = float(forecast_future[0])
-        future_forecasts = [float(f) for f in forecast_future]
+        results = None
+        if parallel and len(tasks) > 1 and deadline is None:
+            results = _fit_tes_configs_parallel(tasks, max_workers)
+        if results is None and deadline is not None:
+            results = _fit_tes_configs_until(tasks, deadline)
+            if not results:
+                raise DeadlineExceeded("Waktu tidak cukup untuk fitting TES")
+        if results is None:
+            results = [_fit_tes_config(*task) for task in tasks]
+        
+        # Pilih konfigurasi dengan SSE terkecil (urutan prioritas menang jika sama)
+        best = None
+        for result in results:
+            if result is not None and (best is None or result['sse'] < best['sse']):
+                best = result
+        
+        if best is None and warm_start is None:
+            raise ValueError("Tidak dapat membangun model TES untuk data ini")
         
-        # Ensure predictions are positive
-        future_forecasts = [max(0.0, f) for f in future_forecasts]
-        next_prediction = max(0.0, next_prediction)
+        # Fallback ke cold start jika warm start gagal atau hasilnya lebih buruk
+        if warm_start is not None and not _warm_start_accepted(best, data_arr, seasonal_periods, warm_start):
+            result = TripleExponentialSmoothing.predict(
+                data, seasonal_periods=seasonal_periods, optimize=optimize,
+                steps=steps, parallel=parallel, max_workers=max_workers, speed=speed
+            )
+            result[-1]['warm_start'] = 'fallback'
+            return result
         
-        # Fitted values
-        fitted = fit.fittedvalues
-        forecast_values = [float(f) for f in fitted]
+        alpha_opt = best['alpha']
+        beta_opt = best['beta']
+        gamma_opt = best['gamma']
         
-        # Extract components
-        level_values = [float(v) for v in fit.level]
-        trend_values = [float(v) for v in fit.trend]
-        seasonal_values = [float(v) for v in fit.season]
+        # Ensure predictions are positive
+        future_forecasts = [max(0.0, float(f)) for f in best['forecast']]
+        next_prediction = future_forecasts[0]
         
         info = {
             'alpha': alpha_opt,
             'beta': beta_opt,
             'gamma': gamma_opt,
             'seasonal_periods': seasonal_periods,
-            'level_values': level_values,
-            'trend_values': trend_values,
-            'seasonal_values': seasonal_values,
-            'forecast_values': forecast_values,
+            'level_values': [float(v) for v in best['level']],
+            'trend_values': [float(v) for v in best['trend']],
+            'seasonal_values': [float(v) for v in best['season']],
+            'forecast_values': [float(f) for f in best['fitted']],
             'future_forecasts': future_forecasts,
             'steps': steps,
             'method': 'TES',
-            'best_config': best_config_name,
+            'best_config': best['name'],
+            'state': best['state'],
+            'warm_start': 'warm' if warm_start is not None else 'cold',
+            'speed': speed,
+            'fit_time_ms': (time.perf_counter() - started) * 1000,
         }
+        if deadline is not None:
+            info['configs_tried'] = len(results)
+            info['partial'] = len(results) < len(tasks)
         
         return float(next_prediction), alpha_opt, beta_opt, gamma_opt, info
+    
+    @staticmethod
+    def predict_many(series_by_key: Dict[Hashable, List[float]], seasonal_periods: int = 12,
+                     steps: int = 1) -> Dict[Hashable, Tuple[float, float, float, float, dict]]:
+        """
+        Prediksi TES untuk banyak series sekaligus menggunakan engine NumPy
+        
+        Semua series dengan panjang yang sama di-fit dalam satu rekursi 2-D
+        (series x waktu) per konfigurasi, lalu konfigurasi terbaik dipilih per
+        series berdasarkan SSE (sama seperti predict). Seperti statsmodels,
+        optimasi dimulai dari state awal heuristik dan state awal ikut
+        dioptimasi (HoltWintersEngine.optimize dengan estimate_initial), dan
+        forecast memakai urutan seasonal yang sama. Forecast berada dalam
+        BATCH_TOLERANCE dari predict, atau SSE in-sample-nya lebih kecil.
+        
+        Args:
+            series_by_key: Dictionary {key: list data historis}, misal key = jenis_kendaraan_id
+            seasonal_periods: Periode musiman (default: 12 untuk data bulanan)
+            steps: Jumlah langkah ke depan yang diprediksi (default: 1)
+        
+        Returns:
+            Dictionary {key: (prediksi, alpha, beta, gamma, info)} dengan format
+            yang sama seperti hasil predict
+        """
+        if steps < 1:
+            raise ValueError("Steps minimal 1")
+        
+        # Kelompokkan series berdasarkan panjang data agar bisa dijadikan array 2-D
+        groups = defaultdict(list)
+        for key, data in series_by_key.items():
+            if len(data) < 2 * seasonal_periods:
+                raise ValueError(
+                    f"Data historis minimal {2 * seasonal_periods} periode untuk TES (series {key})"
+                )
+            groups[len(data)].append(key)
+        
+        results = {}
+        for keys in groups.values():
+            data_arr = np.array([series_by_key[k] for k in keys], dtype=float)
+            n_series = len(keys)
+            
+            best_fit = [None] * n_series
+            best_sse = np.full(n_series, np.inf)
+            best_config = [''] * n_series
+            
+            for config in TripleExponentialSmoothing.BATCH_CONFIGS:
+                fit = HoltWintersEngine.optimize(
+                    data_arr,
+                    trend=config['trend'],
+                    seasonal=config['seasonal'],
+                    seasonal_periods=seasonal_periods,
+                    damped=config['damped'],
+                    estimate_initial=True
+                )
+                
+                # SSE dihitung setelah periode seasonal pertama (sama seperti predict)
+                residuals = data_arr - fit['fitted']
+                sse = np.sum(residuals[:, seasonal_periods:] ** 2, axis=1)
+                sse = np.where(np.isfinite(sse), sse, np.inf)
+                
+                # Slot terakhir siklus = komponen sebelum siklus (konvensi forecast statsmodels)
+                season_lag = fit['season'][:, -seasonal_periods - 1]
+                forecast_season = fit['final_season'].copy()
+                forecast_season[:, -1] = season_lag
+                forecast = HoltWintersEngine.forecast(
+                    fit['final_level'], fit['final_trend'], forecast_season,
+                    steps, phi=fit['phi'], trend=config['trend'], seasonal=config['seasonal']
+                )
+                
+                for i in range(n_series):
+                    if sse[i] < best_sse[i] and np.all(np.isfinite(forecast[i])):
+                        best_sse[i] = sse[i]
+                        best_config[i] = config['name']
+                        best_fit[i] = {
+                            'alpha': float(fit['alpha'][i]),
+                            'beta': float(fit['beta'][i]),
+                            'gamma': float(fit['gamma'][i]),
+                            'fitted': fit['fitted'][i],
+                            'level': fit['level'][i],
+                            'trend': fit['trend'][i],
+                            'season': fit['season'][i],
+                            'forecast': forecast[i],
+                            'state': {
+                                'level': float(fit['final_level'][i]),
+                                'trend': float(fit['final_trend'][i]),
+                                'season': [float(v) for v in fit['final_season'][i]],
+                                'season_lag': float(season_lag[i]),
+                                'phi': float(fit['phi'][i]),
+                                'trend_type': config['trend'],
+                                'seasonal_type': config['seasonal'],
+                            },
+                        }
+            
+            for i, key in enumerate(keys):
+                fit = best_fit[i]
+                if fit is None:
+                    raise ValueError(f"Tidak dapat membangun model TES untuk series {key}")
+                
+                # Ensure predictions are positive
+                future_forecasts = [max(0.0, float(f)) for f in fit['forecast']]
+                next_prediction = future_forecasts[0]
+                
+                info = {
+                    'alpha': fit['alpha'],
+                    'beta': fit['beta'],
+                    'gamma': fit['gamma'],
+                    'seasonal_periods': seasonal_periods,
+                    'level_values': [float(v) for v in fit['level']],
+                    'trend_values': [float(v) for v in fit['trend']],
+                    'seasonal_values': [float(v) for v in fit['season']],
+                    'forecast_values': [float(f) for f in fit['fitted']],
+                    'future_forecasts': future_forecasts,
+                    'steps': steps,
+                    'method': 'TES',
+                    'best_config': best_config[i],
+                    'engine': 'numpy-batch',
+                    'state': fit['state'],
+                }
+                
+                results[key] = (next_prediction, fit['alpha'], fit['beta'], fit['gamma'], info)
+        
+        return results
+
+
+def _fit_tes_config(data_arr: np.ndarray, seasonal_periods: int, config_name: str,
+                    model_kwargs: dict, fit_kwargs: dict, steps: int,
+                    warm_start: Optional[dict] = None) -> Optional[dict]:
+    """
+    Fit satu konfigurasi TES dengan statsmodels
+    
+    Didefinisikan di level modul agar bisa dijalankan di process pool. Yang
+    dikembalikan hanya array hasil (bukan objek fit statsmodels) supaya murah
+    untuk dikirim antar proses.
+    
+    Dengan warm_start, optimizer dimulai dari parameter tersimpan (tanpa brute
+    force grid). Jika optimizer tidak konvergen, konfigurasi di-fit ulang cold.
+    
+    Returns:
+        Dictionary hasil fit, atau None jika konfigurasi gagal
+    """
+    try:
+        HoltWinters = EngineRegistry.get('holt_winters')
+        model = HoltWinters(
+            data_arr,
+            seasonal_periods=seasonal_periods,
+            **model_kwargs
+        )
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fit = None
+            if warm_start is not None:
+                try:
+                    fit = model.fit(
+                        start_params=_warm_start_params(model, warm_start, model_kwargs.get('damped_trend', False)),
+                        **dict(fit_kwargs, use_brute=False)
+                    )
+                    if not getattr(fit.mle_retvals, 'success', False):
+                        fit = None
+                except Exception:
+                    fit = None
+            if fit is None:
+                fit = model.fit(**fit_kwargs)
+        
+        # Hitung SSE (Sum of Squared Errors) untuk membandingkan konfigurasi
+        fitted = np.asarray(fit.fittedvalues, dtype=float)
+        residuals = data_arr - fitted
+        sse = float(np.sum(residuals[seasonal_periods:] ** 2))
+        if not np.isfinite(sse):
+            return None
+        
+        return {
+            'name': config_name,
+            'sse': sse,
+            'alpha': float(fit.params.get('smoothing_level', 0.5)),
+            'beta': float(fit.params.get('smoothing_trend', 0.3)),
+            'gamma': float(fit.params.get('smoothing_seasonal', 0.2)),
+            'fitted': fitted,
+            'level': np.asarray(fit.level, dtype=float),
+            'trend': np.asarray(fit.trend, dtype=float),
+            'season': np.asarray(fit.season, dtype=float),
+            'forecast': np.asarray(fit.forecast(steps), dtype=float),
+            'state': _statsmodels_state(
+                fit,
+                trend=model_kwargs.get('trend'),
+                seasonal=model_kwargs.get('seasonal'),
+                seasonal_periods=seasonal_periods,
+                damped=model_kwargs.get('damped_trend', False)
+            ),
+        }
+    except Exception:
+        return None
+
+
+def _fit_tes_configs_until(tasks: List[tuple], deadline: float) -> List[Optional[dict]]:
+    """
+    Menjalankan _fit_tes_config secara berurutan selama waktu masih cukup
+    
+    Konfigurasi berikutnya hanya dijalankan jika sisa waktu sampai deadline
+    lebih besar dari durasi konfigurasi terlama sejauh ini (atau
+    CONFIG_ESTIMATE_SECONDS jika belum ada yang terukur).
+    
+    Returns:
+        List hasil untuk konfigurasi yang sempat dijalankan (urutan sama dengan tasks)
+    """
+    results = []
+    estimate = TripleExponentialSmoothing.CONFIG_ESTIMATE_SECONDS
+    longest = 0.0
+    for task in tasks:
+        if deadline - time.perf_counter() < (longest or estimate):
+            break
+        started = time.perf_counter()
+        results.append(_fit_tes_config(*task))
+        longest = max(longest, time.perf_counter() - started)
+    return results
+
+
+def _warm_start_params(model: 'HoltWinters', warm_start: dict, damped: bool = False) -> np.ndarray:
+    """
+    Menyusun start_params statsmodels dari parameter tersimpan
+    
+    Urutan mengikuti statsmodels: alpha, beta, gamma, initial_level,
+    initial_trend, (damping_trend), initial_seasons. Initial state diambil
+    dari estimasi awal model untuk data saat ini.
+    """
+    low, high = HoltWintersEngine.PARAM_BOUNDS
+    initial_level, initial_trend, initial_seasons = model.initial_values()
+    
+    start = [
+        float(np.clip(warm_start['alpha'], low, high)),
+        float(np.clip(warm_start['beta'], low, high)),
+        float(np.clip(warm_start['gamma'], low, high)),
+        float(initial_level),
+        float(initial_trend),
+    ]
+    if damped:
+        start.append(TripleExponentialSmoothing.WARM_START_PHI)
+    start.extend(float(s) for s in initial_seasons)
+    return np.array(start)
+
+
+def _warm_start_accepted(best: Optional[dict], data_arr: np.ndarray,
+                         seasonal_periods: int, warm_start: dict) -> bool:
+    """
+    Mengecek apakah hasil warm start layak dipakai
+    
+    Ditolak jika tidak ada konfigurasi yang berhasil, atau MAPE in-sample
+    lebih buruk dari MAPE prediksi tersimpan x WARM_START_TOLERANCE.
+    """
+    if best is None:
+        return False
+    
+    stored_mape = warm_start.get('mape')
+    if stored_mape is None:
+        return True
+    
+    mape = calculate_mape(
+        data_arr[seasonal_periods:].tolist(),
+        best['fitted'][seasonal_periods:].tolist()
+    )
+    return mape <= float(stored_mape) * TripleExponentialSmoothing.WARM_START_TOLERANCE
+
+
+def _fit_tes_configs_parallel(tasks: List[tuple], max_workers: Optional[int] = None) -> Optional[List[Optional[dict]]]:
+    """
+    Menjalankan _fit_tes_config untuk semua konfigurasi secara bersamaan
+    
+    Returns:
+        List hasil (urutan sama dengan tasks), atau None jika process pool
+        tidak tersedia sehingga pemanggil perlu fallback ke mode serial
+    """
+    try:
+        executor = WorkerPool.get(max_workers)
+        futures = [executor.submit(_fit_tes_config, *task) for task in tasks]
+        return [future.result() for future in futures]
+    except (BrokenProcessPool, OSError, RuntimeError):
+        WorkerPool.reset()
+        return None
+
+
+def _predict_fixed(data_arr: np.ndarray, steps: int, alpha: float,
+                   beta: Optional[float] = None) -> dict:
+    """
+    SES (beta None) atau DES dengan parameter tetap menggunakan HoltWintersEngine
+
+    Setara dengan fit(optimized=False) pada statsmodels: state awal diambil
+    dari HoltWintersEngine.estimated_initial_states sehingga fitted values,
+    level, trend, dan forecast identik, tanpa biaya konstruksi model.
+    """
+    trend = 'add' if beta is not None else None
+    l0, b0 = HoltWintersEngine.estimated_initial_states(data_arr, trend)
+    result = HoltWintersEngine.smooth(
+        data_arr, alpha=alpha, beta=beta, trend=trend, l0=l0, b0=b0
+    )
+    future = HoltWintersEngine.forecast(
+        result['final_level'], result['final_trend'], result['final_season'],
+        steps, trend=trend
+    )[0]
+
+    return {
+        'forecast_values': result['fitted'][0].tolist(),
+        'future_forecasts': future.tolist(),
+        'level_values': result['level'][0].tolist(),
+        'trend_values': result['trend'][0].tolist(),
+        'state': {
+            'level': float(result['final_level'][0]),
+            'trend': float(result['final_trend'][0]) if trend else 0.0,
+            'season': [],
+            'phi': 1.0,
+            'trend_type': trend,
+            'seasonal_type': None,
+        },
+    }
+
+
+def simulate_interval(info: dict, residuals, steps: int,
+                      paths: int = INTERVAL_PATHS,
+                      quantiles=INTERVAL_QUANTILES,
+                      seed: Optional[int] = INTERVAL_SEED) -> dict:
+    """
+    Prediction interval dari simulasi path masa depan (HoltWintersEngine.simulate)
+    
+    State akhir dan parameter diambil dari info hasil predict(); error 1-langkah
+    diasumsikan N(0, sigma) dengan sigma = RMSE residual in-sample.
+    
+    Args:
+        info: Info hasil predict() (SES/DES/TES) dengan 'state' dan parameter
+        residuals: Residual in-sample (aktual - fitted)
+        steps: Jumlah langkah ke depan
+        paths: Jumlah path simulasi
+        quantiles: Kuantil yang dihitung (0-1)
+        seed: Seed random generator (default tetap agar hasil bisa diulang)
+    
+    Returns:
+        Dictionary: paths, sigma, dan quantiles {label kuantil: list nilai per langkah}
+    """
+    quantiles = [float(q) for q in quantiles]
+    if not quantiles or any(not 0 < q < 1 for q in quantiles):
+        raise ValueError("Kuantil interval harus di antara 0 dan 1")
+    if paths < 1:
+        raise ValueError("Jumlah path simulasi minimal 1")
+    
+    residuals = np.asarray(residuals, dtype=float)
+    residuals = residuals[np.isfinite(residuals)]
+    sigma = float(np.sqrt(np.mean(residuals ** 2))) if residuals.size else 0.0
+    
+    state = info['state']
+    simulated = HoltWintersEngine.simulate(
+        state['level'], state['trend'], HoltWintersEngine.forecast_season(state), steps,
+        alpha=info['alpha'], beta=info.get('beta'), gamma=info.get('gamma'),
+        phi=state['phi'], trend=state['trend_type'], seasonal=state['seasonal_type'],
+        sigma=sigma, paths=paths, seed=seed
+    )
+    values = np.quantile(simulated, quantiles, axis=0)
+    
+    return {
+        'paths': paths,
+        'sigma': sigma,
+        'quantiles': {f'{q:g}': [float(v) for v in row] for q, row in zip(quantiles, values)},
+    }
+
+
+def _statsmodels_state(fit, trend: Optional[str] = None, seasonal: Optional[str] = None,
+                       seasonal_periods: int = 0, damped: bool = False) -> dict:
+    """
+    Mengambil state akhir (level, trend, seasonal) dari hasil fit statsmodels
+    
+    State ini cukup untuk menghitung ulang forecast berapa pun langkahnya
+    (HoltWintersEngine.forecast_state) maupun memajukan state dengan
+    observasi baru (HoltWintersEngine.update) tanpa fitting ulang.
+    
+    'season' berisi m komponen seasonal terakhir (siklus sebenarnya).
+    statsmodels saat forecast mengganti slot terakhir siklus dengan komponen
+    sebelumnya; nilai tersebut disimpan sebagai 'season_lag' agar forecast
+    dari state identik dengan fit.forecast().
+    """
+    phi = float(fit.params.get('damping_trend', 1.0)) if damped else 1.0
+    state = {
+        'level': float(fit.level[-1]),
+        'trend': float(fit.trend[-1]) if trend else 0.0,
+        'season': [],
+        'phi': phi,
+        'trend_type': trend,
+        'seasonal_type': seasonal,
+    }
+    if seasonal:
+        fitted_season = np.asarray(fit.season, dtype=float)
+        m = seasonal_periods
+        state['season'] = [float(v) for v in fitted_season[-m:]]
+        state['season_lag'] = float(fitted_season[-m - 1])
+    
+    return state
@@ -0,0 +1,799 @@
+"""
+Engine NumPy untuk rekursi Exponential Smoothing (Holt-Winters)
+
+Semua perhitungan dilakukan pada array 2-D (series x waktu) sehingga
+banyak series (misalnya seluruh jenis kendaraan) dapat diproses sekaligus
+dalam satu kali loop waktu. Bentuk rekursi mengikuti
+statsmodels.tsa.holtwinters agar hasilnya dapat dibandingkan langsung.
+
+- trend: None | 'add' | 'mul'
+- seasonal: None | 'add' | 'mul'
+- damped: faktor redaman phi untuk komponen trend
+"""
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class HoltWintersEngine:
+    """
+    Engine vectorized untuk Holt-Winters (termasuk SES dan DES)
+    Tidak bergantung pada statsmodels maupun Django
+    """
+
+    # Batas parameter smoothing (sama dengan statsmodels: 0-1)
+    PARAM_BOUNDS = (0.0001, 0.9999)
+    PHI_BOUNDS = (0.8, 0.995)
+
+    # Grid awal untuk pencarian parameter (dievaluasi untuk semua series sekaligus)
+    ALPHA_GRID = (0.1, 0.3, 0.5, 0.7, 0.9)
+    BETA_GRID = (0.01, 0.05, 0.15, 0.3)
+    GAMMA_GRID = (0.01, 0.1, 0.3, 0.5)
+    PHI_GRID = (0.85, 0.92, 0.98)
+
+    @staticmethod
+    def initial_states(data: np.ndarray, trend: Optional[str] = None,
+                       seasonal: Optional[str] = None,
+                       seasonal_periods: int = 12) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Menghitung state awal (level, trend, seasonal) untuk setiap series
+
+        Menggunakan inisialisasi sederhana (Hyndman & Athanasopoulos, 7.6)
+        seperti initialization_method='simple' pada statsmodels.
+
+        Args:
+            data: Array (series x waktu)
+            trend: Tipe trend (None, 'add', 'mul')
+            seasonal: Tipe seasonal (None, 'add', 'mul')
+            seasonal_periods: Periode musiman
+
+        Returns:
+            Tuple: (level awal (S,), trend awal (S,), seasonal awal (S, m))
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_series = data.shape[0]
+        m = seasonal_periods if seasonal else 0
+
+        if seasonal:
+            first = data[:, :m]
+            second = data[:, m:2 * m]
+            l0 = first.mean(axis=1)
+            if trend == 'mul':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    b0 = (second.mean(axis=1) / l0) ** (1.0 / m)
+            elif trend == 'add':
+                b0 = ((second - first) / m).mean(axis=1)
+            else:
+                b0 = np.zeros(n_series)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                s0 = first / l0[:, None] if seasonal == 'mul' else first - l0[:, None]
+        else:
+            l0 = data[:, 0].copy()
+            if trend == 'mul':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    b0 = data[:, 1] / data[:, 0]
+            elif trend == 'add':
+                b0 = data[:, 1] - data[:, 0]
+            else:
+                b0 = np.zeros(n_series)
+            s0 = np.zeros((n_series, 0))
+
+        return l0, b0, s0
+
+    # Jumlah observasi awal untuk inisialisasi heuristik statsmodels (non-seasonal)
+    HEURISTIC_OBS = 10
+
+    @staticmethod
+    def estimated_initial_states(data: np.ndarray,
+                                 trend: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        State awal (level, trend) non-seasonal yang sama dengan statsmodels
+        initialization_method='estimated' saat fit(optimized=False)
+
+        Pada mode tersebut statsmodels tidak mengestimasi state awal, tetapi
+        memakai nilai awal konstruksi model: inisialisasi sederhana jika data
+        kurang dari HEURISTIC_OBS, selain itu regresi linear pada
+        HEURISTIC_OBS observasi pertama (intercept = level, slope = trend).
+
+        Args:
+            data: Array (series x waktu)
+            trend: Tipe trend (None, 'add', 'mul')
+
+        Returns:
+            Tuple: (level awal (S,), trend awal (S,))
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_obs = HoltWintersEngine.HEURISTIC_OBS
+
+        if data.shape[1] < n_obs:
+            l0, b0, _ = HoltWintersEngine.initial_states(data, trend)
+            return l0, b0
+
+        exog = np.c_[np.ones(n_obs), np.arange(n_obs) + 1.0]
+        beta = data[:, :n_obs] @ np.linalg.pinv(exog).T
+        l0 = beta[:, 0].copy()
+        if trend == 'mul':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                b0 = 1.0 + beta[:, 1] / beta[:, 0]
+        elif trend == 'add':
+            b0 = beta[:, 1].copy()
+        else:
+            b0 = np.zeros(data.shape[0])
+
+        return l0, b0
+
+    @staticmethod
+    def heuristic_initial_states(data: np.ndarray, trend: Optional[str] = None,
+                                 seasonal: Optional[str] = None,
+                                 seasonal_periods: int = 12) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        State awal heuristik (Hyndman et al., 2.6) untuk semua series sekaligus
+
+        Sama dengan nilai awal statsmodels initialization_method='estimated'
+        (titik awal optimasi): seasonal dari rata-rata data yang di-detrend
+        dengan moving average terpusat pada maksimal 5 siklus pertama, lalu
+        level dan trend dari regresi linear HEURISTIC_OBS nilai moving average
+        pertama. Data yang terlalu pendek memakai initial_states (sederhana).
+
+        Returns:
+            Tuple: (level awal (S,), trend awal (S,), seasonal awal (S, m))
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_obs = data.shape[1]
+        n_reg = HoltWintersEngine.HEURISTIC_OBS
+        m = seasonal_periods if seasonal else 0
+        min_obs = n_reg + 2 * (m // 2)
+        if n_obs < min_obs or (m and n_obs < 2 * m):
+            return HoltWintersEngine.initial_states(data, trend, seasonal, seasonal_periods)
+        if not seasonal:
+            l0, b0 = HoltWintersEngine.estimated_initial_states(data, trend)
+            return l0, b0, np.zeros((data.shape[0], 0))
+
+        k_cycles = max(min(5, n_obs // m), int(np.ceil(min_obs / m)))
+        series = data[:, :m * k_cycles]
+        window = np.lib.stride_tricks.sliding_window_view(series, m, axis=1).mean(axis=2)
+        if m % 2 == 0:
+            # Moving average 2 x m terpusat
+            moving = (window[:, :-1] + window[:, 1:]) / 2
+            offset = m // 2
+        else:
+            moving = window
+            offset = (m - 1) // 2
+        centered = series[:, offset:offset + moving.shape[1]]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            detrended = centered / moving if seasonal == 'mul' else centered - moving
+            # Rata-rata efek seasonal per posisi siklus (posisi data ke-i = i mod m)
+            position = (np.arange(moving.shape[1]) + offset) % m
+            s0 = np.stack([detrended[:, position == j].mean(axis=1) for j in range(m)], axis=1)
+            if seasonal == 'mul':
+                s0 = s0 / s0.mean(axis=1, keepdims=True)
+            else:
+                s0 = s0 - s0.mean(axis=1, keepdims=True)
+
+        l0, b0 = HoltWintersEngine.estimated_initial_states(moving[:, :n_reg], trend)
+        return l0, b0, s0
+
+    @staticmethod
+    def smooth(data: np.ndarray, alpha: np.ndarray, beta: Optional[np.ndarray] = None,
+               gamma: Optional[np.ndarray] = None, phi: Optional[np.ndarray] = None,
+               trend: Optional[str] = None, seasonal: Optional[str] = None,
+               seasonal_periods: int = 12, l0: Optional[np.ndarray] = None,
+               b0: Optional[np.ndarray] = None, s0: Optional[np.ndarray] = None) -> Dict:
+        """
+        Menjalankan rekursi level/trend/seasonal untuk semua series sekaligus
+
+        Args:
+            data: Array (series x waktu)
+            alpha, beta, gamma, phi: Parameter per series, shape (S,)
+            trend: Tipe trend (None, 'add', 'mul')
+            seasonal: Tipe seasonal (None, 'add', 'mul')
+            seasonal_periods: Periode musiman
+            l0, b0, s0: State awal (None = dihitung dengan initial_states)
+
+        Returns:
+            Dictionary berisi fitted, level, trend, season (S x T), sse (S,)
+            serta state akhir (final_level, final_trend, final_season)
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_series, n_obs = data.shape
+        m = seasonal_periods if seasonal else 0
+
+        if l0 is None or (trend and b0 is None) or (seasonal and s0 is None):
+            init_l0, init_b0, init_s0 = HoltWintersEngine.initial_states(
+                data, trend, seasonal, seasonal_periods
+            )
+            l0 = init_l0 if l0 is None else l0
+            b0 = init_b0 if b0 is None else b0
+            s0 = init_s0 if s0 is None else s0
+
+        alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_series,))
+        beta = np.broadcast_to(np.asarray(0.0 if beta is None else beta, dtype=float), (n_series,))
+        gamma = np.broadcast_to(np.asarray(0.0 if gamma is None else gamma, dtype=float), (n_series,))
+        phi = np.broadcast_to(np.asarray(1.0 if phi is None else phi, dtype=float), (n_series,))
+
+        level = np.empty((n_series, n_obs))
+        trend_arr = np.zeros((n_series, n_obs))
+        fitted = np.empty((n_series, n_obs))
+        # season[:, t] = komponen seasonal yang dipakai untuk observasi t
+        # season[:, t + m] = komponen seasonal hasil update pada observasi t
+        season = np.empty((n_series, n_obs + m))
+        if m:
+            season[:, :m] = s0
+
+        lvl_prev = np.asarray(l0, dtype=float).copy()
+        b_prev = np.zeros(n_series) if not trend else np.asarray(b0, dtype=float).copy()
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for t in range(n_obs):
+                fitted[:, t], lvl, b_new, s_new = HoltWintersEngine.step(
+                    data[:, t], lvl_prev, b_prev, season[:, t] if m else None,
+                    alpha, beta, gamma, phi, trend, seasonal
+                )
+                if m:
+                    season[:, t + m] = s_new
+
+                level[:, t] = lvl
+                trend_arr[:, t] = b_new
+                lvl_prev = lvl
+                b_prev = b_new
+
+            residuals = data - fitted
+            sse = np.sum(residuals ** 2, axis=1)
+
+        sse = np.where(np.isfinite(sse), sse, np.inf)
+
+        return {
+            'fitted': fitted,
+            'level': level,
+            'trend': trend_arr,
+            'season': season[:, m:] if m else np.zeros((n_series, n_obs)),
+            'sse': sse,
+            'final_level': level[:, -1].copy(),
+            'final_trend': trend_arr[:, -1].copy(),
+            'final_season': season[:, n_obs:n_obs + m].copy(),
+            'phi': np.array(phi, dtype=float),
+        }
+
+    @staticmethod
+    def step(y: Optional[np.ndarray], lvl_prev: np.ndarray, b_prev: np.ndarray,
+             s_prev: Optional[np.ndarray], alpha: np.ndarray, beta: np.ndarray,
+             gamma: np.ndarray, phi: np.ndarray, trend: Optional[str] = None,
+             seasonal: Optional[str] = None,
+             error: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Satu langkah rekursi: forecast 1-langkah lalu update state dengan observasi y
+
+        Jika y None (simulasi), observasi = forecast 1-langkah + error.
+
+        Returns:
+            Tuple: (forecast 1-langkah, level baru, trend baru, seasonal baru atau None)
+        """
+        if trend == 'mul':
+            damped = b_prev ** phi
+            base = lvl_prev * damped
+        elif trend == 'add':
+            damped = phi * b_prev
+            base = lvl_prev + damped
+        else:
+            base = lvl_prev
+
+        if seasonal == 'mul':
+            fitted = base * s_prev
+        elif seasonal == 'add':
+            fitted = base + s_prev
+        else:
+            fitted = base
+
+        if y is None:
+            y = fitted + error
+
+        s_new = None
+        if seasonal == 'mul':
+            lvl = alpha * (y / s_prev) + (1 - alpha) * base
+            s_new = gamma * (y / base) + (1 - gamma) * s_prev
+        elif seasonal == 'add':
+            lvl = alpha * (y - s_prev) + (1 - alpha) * base
+            s_new = gamma * (y - base) + (1 - gamma) * s_prev
+        else:
+            lvl = alpha * y + (1 - alpha) * base
+
+        if trend == 'mul':
+            b_new = beta * (lvl / lvl_prev) + (1 - beta) * damped
+        elif trend == 'add':
+            b_new = beta * (lvl - lvl_prev) + (1 - beta) * damped
+        else:
+            b_new = b_prev
+
+        return fitted, lvl, b_new, s_new
+
+    @staticmethod
+    def update(state: Dict, y: float, alpha: float, beta: Optional[float] = None,
+               gamma: Optional[float] = None) -> Tuple[float, Dict]:
+        """
+        Update state akhir satu series dengan satu observasi baru (O(1))
+
+        Parameter smoothing tidak diubah. Siklus seasonal digeser satu sehingga
+        komponen untuk periode berikutnya kembali berada di indeks 0 (format
+        state sama seperti info['state'] hasil predict(), siap untuk forecast).
+        Jika state memiliki 'season_lag', nilainya diganti komponen yang keluar
+        dari siklus (lihat forecast_state).
+
+        Args:
+            state: State akhir (level, trend, season, [season_lag], phi, trend_type, seasonal_type)
+            y: Observasi baru
+            alpha, beta, gamma: Parameter smoothing hasil fit
+
+        Returns:
+            Tuple: (forecast 1-langkah sebelum update, state baru)
+        """
+        season = list(state['season'])
+        fitted, lvl, b_new, s_new = HoltWintersEngine.step(
+            float(y), state['level'], state['trend'], season[0] if season else None,
+            alpha, beta, gamma, state['phi'],
+            trend=state['trend_type'], seasonal=state['seasonal_type']
+        )
+        new_state = dict(state)
+        new_state['level'] = float(lvl)
+        new_state['trend'] = float(b_new)
+        if season:
+            new_state['season'] = season[1:] + [float(s_new)]
+            if state.get('season_lag') is not None:
+                new_state['season_lag'] = float(season[0])
+        return float(fitted), new_state
+
+    @staticmethod
+    def forecast_season(state: Dict) -> List[float]:
+        """
+        Siklus seasonal state dalam urutan forecast (slot terakhir = season_lag jika ada)
+        """
+        season = list(state['season'])
+        if season and state.get('season_lag') is not None:
+            season[-1] = state['season_lag']
+        return season
+
+    @staticmethod
+    def forecast_state(state: Dict, steps: int) -> np.ndarray:
+        """
+        Forecast h-langkah satu series dari dict state (format info['state'])
+
+        state['season'] adalah siklus seasonal sebenarnya (dipakai update).
+        statsmodels memakai komponen sebelum siklus tersebut untuk slot terakhir
+        saat forecast; state hasil statsmodels menyimpannya sebagai 'season_lag'
+        sehingga forecast di sini identik dengan fit.forecast().
+
+        Returns:
+            Array forecast (steps,)
+        """
+        season = [HoltWintersEngine.forecast_season(state)] if state['seasonal_type'] else None
+        return HoltWintersEngine.forecast(
+            [state['level']], [state['trend']], season, steps,
+            phi=[state['phi']], trend=state['trend_type'], seasonal=state['seasonal_type']
+        )[0]
+
+    @staticmethod
+    def forecast(final_level: np.ndarray, final_trend: np.ndarray,
+                 final_season: np.ndarray, steps: int, phi: Optional[np.ndarray] = None,
+                 trend: Optional[str] = None, seasonal: Optional[str] = None) -> np.ndarray:
+        """
+        Menghitung forecast h-langkah dari state akhir
+
+        Args:
+            final_level: Level akhir (S,)
+            final_trend: Trend akhir (S,)
+            final_season: m komponen seasonal terakhir (S, m)
+            steps: Jumlah langkah ke depan
+            phi: Faktor redaman per series (None = tanpa redaman)
+            trend: Tipe trend (None, 'add', 'mul')
+            seasonal: Tipe seasonal (None, 'add', 'mul')
+
+        Returns:
+            Array forecast (S x steps)
+        """
+        final_level = np.atleast_1d(np.asarray(final_level, dtype=float))
+        n_series = final_level.shape[0]
+        final_trend = np.broadcast_to(np.asarray(final_trend, dtype=float), (n_series,))
+        phi = np.broadcast_to(np.asarray(1.0 if phi is None else phi, dtype=float), (n_series,))
+
+        h = np.arange(1, steps + 1)
+        # Jumlah kumulatif phi^1 + ... + phi^h untuk setiap h (S x steps)
+        phi_cum = np.cumsum(phi[:, None] ** h[None, :], axis=1)
+
+        with np.errstate(over='ignore', invalid='ignore'):
+            if trend == 'mul':
+                base = final_level[:, None] * final_trend[:, None] ** phi_cum
+            elif trend == 'add':
+                base = final_level[:, None] + phi_cum * final_trend[:, None]
+            else:
+                base = np.repeat(final_level[:, None], steps, axis=1)
+
+        if seasonal:
+            final_season = np.atleast_2d(np.asarray(final_season, dtype=float))
+            m = final_season.shape[1]
+            idx = (h - 1) % m
+            s = final_season[:, idx]
+            return base * s if seasonal == 'mul' else base + s
+
+        return base
+
+    # Jumlah path per chunk simulasi (membatasi array sementara state dan noise)
+    SIMULATION_CHUNK = 2000
+
+    @staticmethod
+    def simulate(final_level: float, final_trend: float, final_season, steps: int,
+                 alpha: float, beta: Optional[float] = None, gamma: Optional[float] = None,
+                 phi: Optional[float] = None, trend: Optional[str] = None,
+                 seasonal: Optional[str] = None, sigma: float = 1.0, paths: int = 1000,
+                 seed: Optional[int] = None, chunk_size: Optional[int] = None) -> np.ndarray:
+        """
+        Simulasi path masa depan satu series dari state akhir
+
+        Setiap langkah: observasi = forecast 1-langkah + N(0, sigma), lalu state
+        di-update dengan rekursi yang sama seperti smooth. Path diproses per
+        chunk_size sehingga memori sementara tidak bergantung pada jumlah path.
+
+        Args:
+            final_level, final_trend: State akhir
+            final_season: m komponen seasonal terakhir (urutan seperti forecast)
+            steps: Jumlah langkah ke depan
+            alpha, beta, gamma, phi: Parameter smoothing hasil fit
+            trend, seasonal: Tipe komponen
+            sigma: Standar deviasi error 1-langkah (dari residual in-sample)
+            paths: Jumlah path simulasi
+            seed: Seed random generator
+            chunk_size: Jumlah path per chunk (None = SIMULATION_CHUNK)
+
+        Returns:
+            Array (paths x steps)
+        """
+        chunk_size = chunk_size or HoltWintersEngine.SIMULATION_CHUNK
+        rng = np.random.default_rng(seed)
+        season0 = np.asarray(final_season if seasonal else [], dtype=float).ravel()
+        m = season0.size
+
+        alpha = float(alpha)
+        beta = float(beta or 0.0)
+        gamma = float(gamma or 0.0)
+        phi = 1.0 if phi is None else float(phi)
+
+        result = np.empty((paths, steps))
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for start in range(0, paths, chunk_size):
+                n = min(chunk_size, paths - start)
+                lvl = np.full(n, float(final_level))
+                b = np.full(n, float(final_trend))
+                season = np.empty((n, steps + m))
+                season[:, :m] = season0
+                noise = rng.standard_normal((n, steps))
+                noise *= sigma
+
+                for h in range(steps):
+                    fitted, lvl, b, s_new = HoltWintersEngine.step(
+                        None, lvl, b, season[:, h] if m else None,
+                        alpha, beta, gamma, phi, trend, seasonal, error=noise[:, h]
+                    )
+                    if m:
+                        season[:, h + m] = s_new
+                    result[start:start + n, h] = fitted + noise[:, h]
+
+        return result
+
+    @staticmethod
+    def optimize(data: np.ndarray, trend: Optional[str] = None,
+                 seasonal: Optional[str] = None, seasonal_periods: int = 12,
+                 damped: bool = False, max_iter: int = 60,
+                 tol: float = 1e-4, estimate_initial: bool = False) -> Dict:
+        """
+        Mencari parameter optimal (SSE minimum) untuk semua series sekaligus
+
+        Tahap 1: grid search pada titik yang sama untuk semua series.
+        Tahap 2: pattern search (compass search) per series, di mana seluruh
+        kandidat tetangga dari semua series dievaluasi dalam satu rekursi.
+        Tahap 3 (estimate_initial): dimulai dari state awal heuristik,
+        parameter dan state awal dioptimasi bersama dengan least squares
+        (lihat estimate_jointly), seperti initialization_method='estimated'
+        pada statsmodels. Tanpa estimate_initial, state awal sederhana
+        (initial_states) dipakai tetap.
+
+        Args:
+            data: Array (series x waktu)
+            trend: Tipe trend (None, 'add', 'mul')
+            seasonal: Tipe seasonal (None, 'add', 'mul')
+            seasonal_periods: Periode musiman
+            damped: Jika True, phi ikut dioptimasi
+            max_iter: Iterasi maksimum pattern search
+            tol: Ukuran langkah minimum sebelum berhenti
+            estimate_initial: Jika True, state awal ikut dioptimasi (tahap 3)
+
+        Returns:
+            Dictionary berisi alpha, beta, gamma, phi (S,), state awal
+            (l0, b0, s0) yang dipakai, dan hasil smooth()
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_series = data.shape[0]
+        initial = HoltWintersEngine.heuristic_initial_states if estimate_initial else HoltWintersEngine.initial_states
+        l0, b0, s0 = initial(data, trend, seasonal, seasonal_periods)
+
+        # Dimensi parameter yang dioptimasi: alpha, [beta], [gamma], [phi]
+        grids = [HoltWintersEngine.ALPHA_GRID]
+        names = ['alpha']
+        if trend:
+            grids.append(HoltWintersEngine.BETA_GRID)
+            names.append('beta')
+        if seasonal:
+            grids.append(HoltWintersEngine.GAMMA_GRID)
+            names.append('gamma')
+        if trend and damped:
+            grids.append(HoltWintersEngine.PHI_GRID)
+            names.append('phi')
+
+        lower = np.array([
+            HoltWintersEngine.PHI_BOUNDS[0] if n == 'phi' else HoltWintersEngine.PARAM_BOUNDS[0]
+            for n in names
+        ])
+        upper = np.array([
+            HoltWintersEngine.PHI_BOUNDS[1] if n == 'phi' else HoltWintersEngine.PARAM_BOUNDS[1]
+            for n in names
+        ])
+
+        def evaluate(candidates: np.ndarray) -> np.ndarray:
+            """SSE untuk kandidat (S, K, D) -> (S, K)"""
+            n_cand = candidates.shape[1]
+            flat = candidates.reshape(n_series * n_cand, -1)
+            params = {n: flat[:, i] for i, n in enumerate(names)}
+            result = HoltWintersEngine.smooth(
+                np.repeat(data, n_cand, axis=0),
+                alpha=params['alpha'],
+                beta=params.get('beta'),
+                gamma=params.get('gamma'),
+                phi=params.get('phi'),
+                trend=trend,
+                seasonal=seasonal,
+                seasonal_periods=seasonal_periods,
+                l0=np.repeat(l0, n_cand),
+                b0=np.repeat(b0, n_cand),
+                s0=np.repeat(s0, n_cand, axis=0),
+            )
+            return result['sse'].reshape(n_series, n_cand)
+
+        # Tahap 1: grid search
+        mesh = np.stack(np.meshgrid(*grids, indexing='ij'), axis=-1).reshape(-1, len(names))
+        grid_sse = evaluate(np.broadcast_to(mesh, (n_series,) + mesh.shape))
+        best_idx = np.argmin(grid_sse, axis=1)
+        best = mesh[best_idx].copy()
+        best_sse = grid_sse[np.arange(n_series), best_idx]
+
+        # Tahap 2: pattern search vectorized
+        n_dim = len(names)
+        directions = np.concatenate([np.eye(n_dim), -np.eye(n_dim)])
+        step = np.full(n_series, 0.1)
+
+        for _ in range(max_iter):
+            active = step >= tol
+            if not active.any():
+                break
+
+            candidates = best[:, None, :] + step[:, None, None] * directions[None, :, :]
+            candidates = np.clip(candidates, lower, upper)
+            cand_sse = evaluate(candidates)
+
+            idx = np.argmin(cand_sse, axis=1)
+            cand_best_sse = cand_sse[np.arange(n_series), idx]
+            improved = active & (cand_best_sse < best_sse)
+
+            best[improved] = candidates[improved, idx[improved]]
+            best_sse[improved] = cand_best_sse[improved]
+            step[active & ~improved] /= 2
+
+        params = {n: best[:, i] for i, n in enumerate(names)}
+        if estimate_initial:
+            params, l0, b0, s0 = HoltWintersEngine.estimate_jointly(
+                data, params, l0, b0, s0, trend, seasonal, seasonal_periods
+            )
+        result = HoltWintersEngine.smooth(
+            data,
+            alpha=params['alpha'],
+            beta=params.get('beta'),
+            gamma=params.get('gamma'),
+            phi=params.get('phi'),
+            trend=trend,
+            seasonal=seasonal,
+            seasonal_periods=seasonal_periods,
+            l0=l0, b0=b0, s0=s0,
+        )
+        result['alpha'] = params['alpha']
+        result['beta'] = params.get('beta', np.zeros(n_series))
+        result['gamma'] = params.get('gamma', np.zeros(n_series))
+        result['phi'] = params.get('phi', np.ones(n_series))
+        result['l0'], result['b0'], result['s0'] = l0, b0, s0
+        return result
+
+    # Iterasi maksimum dan batas konvergensi least squares estimate_jointly
+    JOINT_MAX_ITER = 100
+    JOINT_FTOL = 1e-9
+    JOINT_MAX_DAMPING = 1e6
+
+    @staticmethod
+    def estimate_jointly(data: np.ndarray, params: Dict[str, np.ndarray],
+                         l0: np.ndarray, b0: np.ndarray, s0: np.ndarray,
+                         trend: Optional[str] = None, seasonal: Optional[str] = None,
+                         seasonal_periods: int = 12,
+                         max_iter: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Optimasi bersama parameter smoothing dan sebagian state awal (SSE minimum)
+
+        Mengikuti hasil statsmodels initialization_method='estimated': vektor
+        yang dioptimasi berisi alpha, beta/alpha, gamma/(1 - alpha), [phi],
+        [level awal tanpa seasonal], [trend awal], dan [m seasonal awal 'mul']
+        dengan batas yang sama (beta <= alpha, gamma <= 1 - alpha, state
+        multiplicative tidak negatif). Pada model seasonal, level awal dan
+        seasonal awal additive (serta trend awal additive pada seasonal 'mul')
+        tetap pada titik awal heuristik: pada skala data pendapatan optimizer
+        statsmodels praktis tidak menggesernya, sehingga ikut mengoptimasinya
+        justru menjauhkan hasil dari predict(). Pada SES/DES level awal
+        menentukan residual pertama dan statsmodels menggesernya, sehingga
+        ikut dioptimasi.
+
+        Optimizer: Levenberg-Marquardt dengan Jacobian beda hingga, di mana
+        semua series dan semua kolom Jacobian dievaluasi dalam satu rekursi
+        smooth().
+
+        Args:
+            data: Array (series x waktu)
+            params: Titik awal {alpha, [beta], [gamma], [phi]} per series (S,)
+            l0, b0, s0: State awal heuristik (titik awal komponen yang dioptimasi)
+            trend, seasonal, seasonal_periods: Konfigurasi model
+            max_iter: Iterasi maksimum (None = JOINT_MAX_ITER)
+
+        Returns:
+            Tuple: (params, l0, b0, s0) hasil optimasi
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_series = data.shape[0]
+        m = seasonal_periods if seasonal else 0
+        max_iter = max_iter or HoltWintersEngine.JOINT_MAX_ITER
+        low, high = HoltWintersEngine.PARAM_BOUNDS
+        names = [n for n in ('alpha', 'beta', 'gamma', 'phi') if n in params]
+        l0 = np.asarray(l0, dtype=float)
+        b0 = np.asarray(b0, dtype=float)
+        s0 = np.asarray(s0, dtype=float).reshape(n_series, m)
+
+        alpha = np.clip(params['alpha'], low, high)
+        columns = [alpha]
+        lower, upper = [low], [high]
+        if 'beta' in params:
+            columns.append(np.clip(np.minimum(params['beta'], alpha) / alpha, low, high))
+            lower.append(low)
+            upper.append(high)
+        if 'gamma' in params:
+            columns.append(np.clip(np.minimum(params['gamma'], 1 - alpha) / (1 - alpha), low, high))
+            lower.append(low)
+            upper.append(high)
+        if 'phi' in params:
+            columns.append(np.clip(params['phi'], *HoltWintersEngine.PHI_BOUNDS))
+            lower.append(HoltWintersEngine.PHI_BOUNDS[0])
+            upper.append(HoltWintersEngine.PHI_BOUNDS[1])
+        # Level dan trend awal additive dinormalisasi skala data agar Jacobian seimbang
+        scale = np.abs(data).mean(axis=1)
+        scale = np.where(scale > 0, scale, 1.0)
+        # Tanpa seasonal (SES/DES) statsmodels menggeser level awal (dan trend awal)
+        free_level = not seasonal
+        if free_level:
+            columns.append(l0 / scale)
+            lower.append(-np.inf)
+            upper.append(np.inf)
+        free_trend = trend == 'mul' or (trend == 'add' and seasonal != 'mul')
+        if free_trend:
+            columns.append(b0 if trend == 'mul' else b0 / scale)
+            lower.append(0.0 if trend == 'mul' else -np.inf)
+            upper.append(np.inf)
+        free_season = seasonal == 'mul'
+        if free_season:
+            columns.extend(s0.T)
+            lower.extend([0.0] * m)
+            upper.extend([np.inf] * m)
+
+        x = np.column_stack(columns)
+        lower, upper = np.array(lower), np.array(upper)
+        n_params = x.shape[1]
+
+        def unpack(x: np.ndarray, rows: np.ndarray) -> Dict:
+            """Vektor (N, P) untuk baris series `rows` -> argumen smooth()"""
+            kwargs = {'alpha': x[:, 0], 'l0': l0[rows], 'b0': b0[rows], 's0': s0[rows]}
+            col = 1
+            if 'beta' in params:
+                kwargs['beta'] = x[:, col] * x[:, 0]
+                col += 1
+            if 'gamma' in params:
+                kwargs['gamma'] = x[:, col] * (1 - x[:, 0])
+                col += 1
+            if 'phi' in params:
+                kwargs['phi'] = x[:, col]
+                col += 1
+            if free_level:
+                kwargs['l0'] = x[:, col] * scale[rows]
+                col += 1
+            if free_trend:
+                kwargs['b0'] = x[:, col] if trend == 'mul' else x[:, col] * scale[rows]
+                col += 1
+            if free_season:
+                kwargs['s0'] = x[:, col:col + m]
+            return kwargs
+
+        def residuals(x: np.ndarray, rows: np.ndarray) -> np.ndarray:
+            """Residual (N, T) untuk vektor (N, P) milik baris series `rows`"""
+            fitted = HoltWintersEngine.smooth(
+                data[rows], trend=trend, seasonal=seasonal,
+                seasonal_periods=seasonal_periods, **unpack(x, rows)
+            )['fitted']
+            return data[rows] - fitted
+
+        def sse(resid: np.ndarray) -> np.ndarray:
+            with np.errstate(over='ignore', invalid='ignore'):
+                value = np.sum(resid ** 2, axis=1)
+            return np.where(np.isfinite(value), value, np.inf)
+
+        resid = residuals(x, np.arange(n_series))
+        current = sse(resid)
+        damping = np.full(n_series, 1e-3)
+        active = np.isfinite(current)
+        eye = np.eye(n_params)
+        lambdas = np.array([0.1, 1.0, 10.0])
+
+        for _ in range(max_iter):
+            rows = np.flatnonzero(active)
+            if not rows.size:
+                break
+            xa, n_rows = x[rows], rows.size
+
+            # Jacobian beda hingga maju (mundur jika melewati batas atas)
+            h = 1e-6 * np.maximum(np.abs(xa), 1.0)
+            h = np.where(xa + h > upper, -h, h)
+            perturbed = xa[:, None, :] + h[:, :, None] * eye
+            base = resid[rows]
+            shifted = residuals(perturbed.reshape(-1, n_params), np.repeat(rows, n_params))
+            jac = (base[:, None, :] - shifted.reshape(n_rows, n_params, -1)) / h[:, :, None]
+            jac = np.where(np.isfinite(jac), jac, 0.0)
+
+            jtj = np.einsum('spt,sqt->spq', jac, jac)
+            grad = np.einsum('spt,st->sp', jac, base)
+
+            # Variabel di batas yang langkahnya mengarah keluar dibekukan
+            frozen = ((xa <= lower) & (grad < 0)) | ((xa >= upper) & (grad > 0))
+            keep = ~frozen
+            jtj = jtj * keep[:, :, None] * keep[:, None, :]
+            grad = np.where(frozen, 0.0, grad)
+            diag = np.einsum('spp->sp', jtj)
+            diag = np.where(diag > 0, diag, 1.0)
+
+            # Tiga kandidat damping dievaluasi dalam satu rekursi
+            trial_damping = damping[rows, None] * lambdas
+            system = jtj[:, None] + trial_damping[:, :, None, None] * (diag[:, None, :, None] * eye)
+            with np.errstate(all='ignore'):
+                try:
+                    delta = np.linalg.solve(system, grad[:, None, :, None])[..., 0]
+                except np.linalg.LinAlgError:
+                    delta = (np.linalg.pinv(system) @ grad[:, None, :, None])[..., 0]
+            delta = np.where(np.isfinite(delta), delta, 0.0)
+            trial = np.clip(xa[:, None, :] + delta, lower, upper)
+            trial_resid = residuals(trial.reshape(-1, n_params), np.repeat(rows, len(lambdas)))
+            trial_resid = trial_resid.reshape(n_rows, len(lambdas), -1)
+            trial_sse = sse(trial_resid.reshape(n_rows * len(lambdas), -1)).reshape(n_rows, len(lambdas))
+
+            pick = np.argmin(trial_sse, axis=1)
+            best_sse = trial_sse[np.arange(n_rows), pick]
+            improved = best_sse < current[rows]
+            gain = (current[rows] - best_sse) / np.maximum(current[rows], np.finfo(float).tiny)
+
+            accept = rows[improved]
+            x[accept] = trial[improved, pick[improved]]
+            resid[accept] = trial_resid[improved, pick[improved]]
+            current[accept] = best_sse[improved]
+            damping[accept] = np.maximum(trial_damping[improved, pick[improved]] / 3, 1e-12)
+            damping[rows[~improved]] *= 10
+
+            done = (improved & (gain < HoltWintersEngine.JOINT_FTOL)) | (damping[rows] > HoltWintersEngine.JOINT_MAX_DAMPING)
+            active[rows[done]] = False
+
+        kwargs = unpack(x, np.arange(n_series))
+        fitted_params = {n: kwargs[n] for n in names}
+        return fitted_params, kwargs['l0'], kwargs['b0'], kwargs['s0']
@@ -2,14 +2,17 @@
 Service untuk Hybrid Prediction Approach
 Menggabungkan TES + Business Rules + Monthly MAPE untuk akurasi maksimal
 """
+import copy
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 
 from crud.models import AgregatPendapatanBulanan, HasilPrediksi
-from crud.services.exponential_smoothing import TripleExponentialSmoothing
-from crud.services.prediction_service import PredictionService
+from crud.services.exponential_smoothing import DEFAULT_SPEED, TripleExponentialSmoothing, simulate_interval
+from crud.services.mape_bulanan_service import MapeBulananService
+from crud.services.model_cache import HybridResultCache
+from crud.services.prediction_service import PredictionService, UNSET
 from crud.utils.metrics import calculate_all_metrics
 
 
@@ -70,7 +73,7 @@ class HybridPredictionService:
         if end_date is None:
             end_date = date.today()
         
-        start_date = end_date - timedelta(days=periods * 30)
+        start_date = HybridPredictionService.training_start_date(periods, end_date)
         
         return PredictionService.get_historical_data(
             jenis_kendaraan_id=jenis_kendaraan_id,
@@ -78,22 +81,32 @@ class HybridPredictionService:
             end_date=end_date
         )
     
+    @staticmethod
+    def training_start_date(periods: int, end_date: date) -> date:
+        """
+        Tanggal awal window training untuk N periode terakhir
+        """
+        return end_date - timedelta(days=periods * 30)
+    
     @staticmethod
     def get_monthly_mape(target_month: int,
                          target_year: int,
                          jenis_kendaraan_id: Optional[int] = None) -> Optional[float]:
         """
         Menghitung MAPE untuk bulan spesifik dari data historis
+        
+        Dibaca dari tabel MapeBulanan (satu query). Jika belum ada (tahun target
+        di luar jangkauan tabel atau baru diinvalidasi), dihitung langsung dari
+        AgregatPendapatanBulanan lalu disimpan.
         """
-        end_date = date(target_year, target_month, 1) - timedelta(days=1)
+        found, mape = MapeBulananService.get(target_year, target_month, jenis_kendaraan_id)
+        if found:
+            return mape
         
         # Ambil data untuk bulan yang sama dari tahun-tahun sebelumnya
-        from crud.models import AgregatPendapatanBulanan
-        from django.db.models import Q
-        
         data = AgregatPendapatanBulanan.objects.filter(
             bulan=target_month,
-            tahun__gte=target_year - 3,
+            tahun__gte=target_year - MapeBulananService.WINDOW_YEARS,
             tahun__lt=target_year
         )
         
@@ -102,23 +115,14 @@ class HybridPredictionService:
         else:
             data = data.filter(jenis_kendaraan__isnull=True)
         
-        data = data.order_by('tahun')
-        
-        if data.count() < 2:
-            return None
+        # Use simple method: prediksi tahun ini = tahun lalu
+        values_by_year = {tahun: float(total) for tahun, total in data.values_list('tahun', 'total_pendapatan')}
+        mape, jumlah_tahun = MapeBulananService.compute_one(values_by_year, target_year)
         
-        # Hitung MAPE sederhana (prediksi moving average vs aktual)
-        values = [float(d.total_pendapatan) for d in data]
+        if jumlah_tahun:
+            MapeBulananService.store(target_year, target_month, jenis_kendaraan_id, mape, jumlah_tahun)
         
-        # Use simple method: prediksi tahun ini = tahun lalu
-        mape_values = []
-        for i in range(1, len(values)):
-            prediksi = values[i-1]  # Tahun lalu
-            aktual = values[i]      # Tahun ini
-            error_pct = abs(prediksi - aktual) / aktual * 100
-            mape_values.append(error_pct)
-        
-        return float(np.mean(mape_values)) if mape_values else None
+        return mape
     
     @staticmethod
     def predict_hybrid(
@@ -127,7 +131,11 @@ class HybridPredictionService:
         training_periods: int = 24,
         selected_scenario: str = 'base',
         jenis_kendaraan_id: Optional[int] = None,
-        return_details: bool = False
+        return_details: bool = False,
+        historical_data: Optional[List[Dict]] = None,
+        monthly_mape=UNSET,
+        actual_value=UNSET,
+        speed: str = DEFAULT_SPEED
     ) -> Dict:
         """
         Prediksi menggunakan Hybrid Approach
@@ -146,6 +154,10 @@ class HybridPredictionService:
             training_periods: Jumlah periode training (default: 24)
             selected_scenario: Scenario yang dipilih (conservative, base, moderate, optimistic)
             return_details: Jika True, return detail per scenario
+            historical_data: Data historis yang sudah dimuat (None = ambil dari database)
+            monthly_mape: Monthly MAPE yang sudah dihitung (default: hitung dari database)
+            actual_value: Nilai aktual yang sudah dimuat (default: ambil dari database)
+            speed: Preset optimizer TES ('fast', 'balanced', 'accurate')
             
         Returns:
             Dictionary dengan prediksi dan informasi detail
@@ -154,13 +166,50 @@ class HybridPredictionService:
         if selected_scenario not in HybridPredictionService.SCENARIOS:
             selected_scenario = 'base'
         
+        # Hasil dasar (TES, Monthly MAPE, nilai aktual) sama untuk semua scenario,
+        # sehingga di-cache per periode selama data agregat tidak berubah. Hanya
+        # berlaku jika data dimuat sendiri (bukan diberikan oleh pemanggil).
+        cache_key = None
+        base = None
+        if historical_data is None and monthly_mape is UNSET and actual_value is UNSET:
+            cache_key = HybridResultCache.key(
+                tahun_prediksi, bulan_prediksi, jenis_kendaraan_id, training_periods, speed
+            )
+            base = HybridResultCache.get(cache_key)
+        
+        cache_status = 'hit' if base is not None else 'miss'
+        if base is None:
+            base = HybridPredictionService._compute_base(
+                tahun_prediksi, bulan_prediksi, training_periods, jenis_kendaraan_id,
+                historical_data, monthly_mape, actual_value, speed
+            )
+            if cache_key is not None:
+                HybridResultCache.set(cache_key, base)
+        
+        result = HybridPredictionService._build_result(base, selected_scenario)
+        if cache_key is not None:
+            result['cache'] = cache_status
+        
+        return result
+    
+    @staticmethod
+    def _compute_base(tahun_prediksi: int, bulan_prediksi: int, training_periods: int,
+                      jenis_kendaraan_id: Optional[int] = None,
+                      historical_data: Optional[List[Dict]] = None,
+                      monthly_mape=UNSET, actual_value=UNSET,
+                      speed: str = DEFAULT_SPEED) -> Dict:
+        """
+        Menghitung bagian hasil Hybrid yang tidak bergantung pada scenario
+        (TES base, Monthly MAPE, metrik, nilai aktual, dan prediksi semua scenario)
+        """
         # 1. Ambil data historis
         end_date = date(tahun_prediksi, bulan_prediksi, 1) - timedelta(days=1)
-        historical_data = HybridPredictionService.get_historical_data(
-            jenis_kendaraan_id=jenis_kendaraan_id,
-            periods=training_periods,
-            end_date=end_date
-        )
+        if historical_data is None:
+            historical_data = HybridPredictionService.get_historical_data(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                periods=training_periods,
+                end_date=end_date
+            )
         
         values = [d['total_pendapatan'] for d in historical_data]
         
@@ -170,17 +219,18 @@ class HybridPredictionService:
         # 2. Generate TES prediction sebagai base
         try:
             pred_tes, alpha, beta, gamma, info_tes = TripleExponentialSmoothing.predict(
-                values, seasonal_periods=12, optimize=True, steps=1
+                values, seasonal_periods=12, optimize=True, steps=1, speed=speed
             )
         except Exception as e:
             raise ValueError(f"Gagal generate TES prediction: {str(e)}")
         
         # 3. Dapatkan Monthly MAPE untuk scenario selection
-        monthly_mape = HybridPredictionService.get_monthly_mape(
-            jenis_kendaraan_id=jenis_kendaraan_id,
-            target_month=bulan_prediksi,
-            target_year=tahun_prediksi
-        )
+        if monthly_mape is UNSET:
+            monthly_mape = HybridPredictionService.get_monthly_mape(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                target_month=bulan_prediksi,
+                target_year=tahun_prediksi
+            )
         
         # 4. Determine recommended scenario berdasarkan Monthly MAPE
         if monthly_mape is not None:
@@ -213,10 +263,7 @@ class HybridPredictionService:
                 'description': scenario_config['description']
             }
         
-        # 7. Final prediction (gunakan scenario yang dipilih)
-        final_prediction = scenarios_result[selected_scenario]['prediksi']
-        
-        # 8. Calculate metrics
+        # 7. Calculate metrics
         forecast_values = info_tes.get('forecast_values', [])
         start_idx = 12
         
@@ -227,44 +274,96 @@ class HybridPredictionService:
         if len(actual_aligned) > 0 and len(forecast_aligned) > 0:
             metrics = calculate_all_metrics(actual_aligned, forecast_aligned)
         
-        # 9. Calculate confidence interval
-        std_dev = np.std(values[-12:]) if len(values) >= 12 else np.std(values)
-        confidence_lower = final_prediction - 2 * std_dev
-        confidence_upper = final_prediction + 2 * std_dev
+        # 8. Prediction interval TES dari simulasi path (diskalakan per scenario)
+        residuals = np.asarray(actual_aligned, dtype=float) - np.asarray(forecast_aligned, dtype=float)
+        tes_interval = simulate_interval(info_tes, residuals, 1)
         
-        # 10. Build result
-        result = {
-            'nilai_prediksi': final_prediction,
-            'confidence_lower': max(0, confidence_lower),
-            'confidence_upper': confidence_upper,
-            'confidence_interval': 95,
-            'metode': 'HYBRID',
-            'scenario': selected_scenario,
-            'scenarios': scenarios_result,
-            'recommended_scenario': recommended_scenario,
-            'monthly_mape': monthly_mape,
-            'monthly_adjustment': float(monthly_adjustment),
-            'tes_prediction': pred_tes,
+        # 9. Nilai aktual (jika periode sudah lewat)
+        if actual_value is UNSET:
+            actual_value = PredictionService.get_actual_value(
+                tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+            )
+        
+        return {
+            'pred_tes': pred_tes,
             'tes_parameters': {
                 'alpha': alpha,
                 'beta': beta,
                 'gamma': gamma
             },
-            'mape': metrics.get('mape', None),
-            'mae': metrics.get('mae', None),
-            'rmse': metrics.get('rmse', None),
+            'scenarios': scenarios_result,
+            'recommended_scenario': recommended_scenario,
+            'monthly_mape': monthly_mape,
+            'monthly_adjustment': float(monthly_adjustment),
+            'metrics': metrics,
+            'tes_interval': {
+                'paths': tes_interval['paths'],
+                'sigma': tes_interval['sigma'],
+                'quantiles': {label: row[0] for label, row in tes_interval['quantiles'].items()},
+            },
             'data_training_dari': date(historical_data[0]['tahun'], historical_data[0]['bulan'], 1),
             'data_training_sampai': end_date,
             'jumlah_data_training': len(values),
             'training_periods': training_periods,
-            'keterangan': f'Hybrid prediction: TES base ({training_periods} periode) + Scenario {selected_scenario} + Monthly Adjustment ({monthly_adjustment:.2f})'
+            'actual_value': actual_value,
+            'speed': speed,
+            'fit_time_ms': info_tes['fit_time_ms'],
+        }
+    
+    @staticmethod
+    def _build_result(base: Dict, selected_scenario: str) -> Dict:
+        """
+        Menyusun hasil Hybrid untuk scenario tertentu dari hasil dasar
+        """
+        monthly_adjustment = base['monthly_adjustment']
+        training_periods = base['training_periods']
+        metrics = base['metrics']
+        
+        # Final prediction (gunakan scenario yang dipilih)
+        final_prediction = base['scenarios'][selected_scenario]['prediksi']
+        final_factor = base['scenarios'][selected_scenario]['final_factor']
+        
+        # Prediction interval: kuantil simulasi TES x faktor scenario dan monthly adjustment
+        tes_interval = base['tes_interval']
+        quantiles = {
+            label: max(0.0, value * final_factor)
+            for label, value in tes_interval['quantiles'].items()
         }
+        levels = [float(label) for label in tes_interval['quantiles']]
         
-        # 11. Calculate actual error jika ada
-        actual_value = PredictionService.get_actual_value(
-            tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
-        )
+        # Build result
+        result = {
+            'nilai_prediksi': final_prediction,
+            'confidence_lower': min(quantiles.values()),
+            'confidence_upper': max(quantiles.values()),
+            'confidence_interval': round((max(levels) - min(levels)) * 100, 2),
+            'interval': {
+                'paths': tes_interval['paths'],
+                'sigma': tes_interval['sigma'] * final_factor,
+                'quantiles': quantiles,
+            },
+            'metode': 'HYBRID',
+            'scenario': selected_scenario,
+            'scenarios': copy.deepcopy(base['scenarios']),
+            'recommended_scenario': base['recommended_scenario'],
+            'monthly_mape': base['monthly_mape'],
+            'monthly_adjustment': monthly_adjustment,
+            'tes_prediction': base['pred_tes'],
+            'tes_parameters': dict(base['tes_parameters']),
+            'mape': metrics.get('mape', None),
+            'mae': metrics.get('mae', None),
+            'rmse': metrics.get('rmse', None),
+            'data_training_dari': base['data_training_dari'],
+            'data_training_sampai': base['data_training_sampai'],
+            'jumlah_data_training': base['jumlah_data_training'],
+            'training_periods': training_periods,
+            'speed': base.get('speed', DEFAULT_SPEED),
+            'fit_time_ms': base.get('fit_time_ms'),
+            'keterangan': f'Hybrid prediction: TES base ({training_periods} periode) + Scenario {selected_scenario} + Monthly Adjustment ({monthly_adjustment:.2f})'
+        }
         
+        # Calculate actual error jika ada
+        actual_value = base['actual_value']
         if actual_value is not None:
             error_abs = abs(final_prediction - actual_value)
             error_pct = (error_abs / actual_value * 100) if actual_value > 0 else 0
@@ -0,0 +1,182 @@
+"""
+Service untuk tabel MapeBulanan (Monthly MAPE yang dimaterialisasi)
+
+Monthly MAPE untuk (tahun target, bulan, jenis kendaraan) adalah rata-rata
+error year-over-year ("prediksi tahun ini = tahun lalu") dari nilai bulan
+yang sama pada WINDOW_YEARS tahun sebelum tahun target. Nilai ini hanya
+bergantung pada AgregatPendapatanBulanan, sehingga dihitung ulang sekaligus
+untuk semua kombinasi setelah regenerate penuh, dan HybridPredictionService
+cukup membaca satu baris. Perubahan parsial hanya menginvalidasi baris yang
+terdampak; baris tersebut dihitung ulang saat dibaca.
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from numpy.lib.stride_tricks import sliding_window_view
+
+from crud.models import AgregatPendapatanBulanan, MapeBulanan
+
+
+class MapeBulananService:
+    """
+    Service untuk rebuild, baca, dan invalidasi MapeBulanan
+    """
+
+    # Jumlah tahun sebelum tahun target yang dipakai (sama seperti get_monthly_mape)
+    WINDOW_YEARS = 3
+
+    @staticmethod
+    def compute(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Menghitung Monthly MAPE untuk semua window sekaligus
+
+        Pasangan year-over-year dibentuk dari tahun yang ada datanya secara
+        berurutan (tahun kosong dilewati), sama seperti perhitungan per query.
+
+        Args:
+            values: Array (... x tahun data) dengan NaN untuk tahun tanpa data
+
+        Returns:
+            Tuple: (mape (... x tahun target), jumlah tahun berisi data per window).
+            Tahun target ke-i = tahun data pertama + i, untuk i = 0..jumlah tahun data
+            (termasuk satu tahun setelah data terakhir). MAPE NaN jika tidak cukup data.
+        """
+        window = MapeBulananService.WINDOW_YEARS
+        pad = np.full(values.shape[:-1] + (window,), np.nan)
+        # windows[..., i, :] = data tahun (target_i - WINDOW_YEARS) .. (target_i - 1)
+        windows = sliding_window_view(np.concatenate([pad, values], axis=-1), window, axis=-1)
+
+        jumlah_tahun = np.sum(~np.isnan(windows), axis=-1)
+        error_sum = np.zeros(windows.shape[:-1])
+        error_count = np.zeros(windows.shape[:-1])
+
+        prev = windows[..., 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for j in range(1, window):
+                cur = windows[..., j]
+                valid = ~np.isnan(prev) & ~np.isnan(cur) & (cur != 0)
+                error_sum += np.where(valid, np.abs(prev - cur) / cur * 100, 0.0)
+                error_count += valid
+                prev = np.where(np.isnan(cur), prev, cur)
+
+            mape = np.where((jumlah_tahun >= 2) & (error_count > 0), error_sum / error_count, np.nan)
+
+        return mape, jumlah_tahun
+
+    @staticmethod
+    def compute_one(values_by_year: dict, tahun: int) -> Tuple[Optional[float], int]:
+        """
+        Monthly MAPE satu tahun target dari {tahun: nilai} (perhitungan langsung)
+
+        Returns:
+            Tuple: (mape atau None, jumlah tahun berisi data di window)
+        """
+        window = MapeBulananService.WINDOW_YEARS
+        values = np.array([
+            values_by_year.get(year, np.nan) for year in range(tahun - window, tahun)
+        ], dtype=float)
+        mape, jumlah_tahun = MapeBulananService.compute(values)
+        value = mape[-1]
+        return (None if np.isnan(value) else float(value)), int(jumlah_tahun[-1])
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Membangun ulang seluruh tabel MapeBulanan dari AgregatPendapatanBulanan
+
+        Returns:
+            Jumlah baris yang dibuat
+        """
+        rows = list(AgregatPendapatanBulanan.objects.values_list(
+            'jenis_kendaraan_id', 'tahun', 'bulan', 'total_pendapatan'
+        ))
+
+        records = []
+        if rows:
+            keys = sorted({r[0] for r in rows}, key=lambda k: (k is not None, k or 0))
+            key_index = {k: i for i, k in enumerate(keys)}
+            min_year = min(r[1] for r in rows)
+            max_year = max(r[1] for r in rows)
+
+            # values[jenis, bulan - 1, tahun - min_year]
+            values = np.full((len(keys), 12, max_year - min_year + 1), np.nan)
+            for jenis_id, tahun, bulan, total in rows:
+                values[key_index[jenis_id], bulan - 1, tahun - min_year] = float(total)
+
+            mape, jumlah_tahun = MapeBulananService.compute(values)
+
+            for k, jenis_id in enumerate(keys):
+                for b in range(12):
+                    for t in range(mape.shape[-1]):
+                        if jumlah_tahun[k, b, t] == 0:
+                            continue
+                        value = mape[k, b, t]
+                        records.append(MapeBulanan(
+                            jenis_kendaraan_id=jenis_id,
+                            tahun=min_year + t,
+                            bulan=b + 1,
+                            mape=None if np.isnan(value) else float(value),
+                            jumlah_tahun=int(jumlah_tahun[k, b, t]),
+                        ))
+
+        with transaction.atomic():
+            MapeBulanan.objects.all().delete()
+            MapeBulanan.objects.bulk_create(records, batch_size=1000)
+
+        return len(records)
+
+    @staticmethod
+    def get(tahun: int, bulan: int, jenis_kendaraan_id: Optional[int] = None) -> Tuple[bool, Optional[float]]:
+        """
+        Membaca Monthly MAPE dari tabel (satu query)
+
+        Returns:
+            Tuple: (ditemukan, mape). Jika tidak ditemukan, pemanggil perlu menghitung langsung.
+        """
+        queryset = MapeBulanan.objects.filter(tahun=tahun, bulan=bulan)
+        if jenis_kendaraan_id is not None:
+            queryset = queryset.filter(jenis_kendaraan_id=jenis_kendaraan_id)
+        else:
+            queryset = queryset.filter(jenis_kendaraan__isnull=True)
+
+        row = queryset.values('mape').first()
+        if row is None:
+            return False, None
+        return True, row['mape']
+
+    @staticmethod
+    def store(tahun: int, bulan: int, jenis_kendaraan_id: Optional[int],
+              mape: Optional[float], jumlah_tahun: int):
+        """
+        Menyimpan hasil perhitungan langsung (read-through)
+        """
+        MapeBulanan.objects.update_or_create(
+            tahun=tahun,
+            bulan=bulan,
+            jenis_kendaraan_id=jenis_kendaraan_id,
+            defaults={'mape': mape, 'jumlah_tahun': jumlah_tahun}
+        )
+
+    @staticmethod
+    def invalidate(keys: Iterable[Tuple[int, int, Optional[int]]]):
+        """
+        Menghapus baris yang terdampak perubahan agregat (tahun, bulan, jenis)
+
+        Perubahan data tahun t mempengaruhi tahun target t+1 .. t+WINDOW_YEARS
+        untuk jenis tersebut dan untuk global.
+        """
+        q = Q()
+        for tahun, bulan, jenis_kendaraan_id in set(keys):
+            jenis_q = Q(jenis_kendaraan__isnull=True)
+            if jenis_kendaraan_id is not None:
+                jenis_q |= Q(jenis_kendaraan_id=jenis_kendaraan_id)
+            q |= Q(
+                bulan=bulan,
+                tahun__gt=tahun,
+                tahun__lte=tahun + MapeBulananService.WINDOW_YEARS
+            ) & jenis_q
+
+        if q:
+            MapeBulanan.objects.filter(q).delete()
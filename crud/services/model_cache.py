@@ -0,0 +1,194 @@
+"""
+Cache hasil fitting model Exponential Smoothing
+
+Hasil fitting (parameter teroptimasi, fitted values, dan state akhir) disimpan
+dengan key berupa fingerprint dari data training + metode + parameter tetap.
+Selama AgregatPendapatanBulanan tidak berubah, prediksi ulang (termasuk untuk
+horizon lain) cukup menjalankan satu rekursi forecast dari state akhir.
+
+AgregatVersion adalah token versi data agregat yang diganti setiap kali
+agregat ditulis. Cache yang key-nya bukan fingerprint data (misalnya hasil
+dasar Hybrid per periode) menyertakan token ini agar otomatis kedaluwarsa.
+"""
+import copy
+import hashlib
+import json
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+from crud.services.holt_winters_engine import HoltWintersEngine
+
+
+def _prediksi_cache():
+    try:
+        return caches[FittedModelCache.CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+class FittedModelCache:
+    """
+    Cache model terfit berbasis fingerprint series
+    """
+
+    CACHE_ALIAS = 'prediksi'
+    # v2: state seasonal berisi siklus sebenarnya + season_lag (lihat _statsmodels_state)
+    KEY_PREFIX = 'fitted_model_v2'
+    TIMEOUT = 60 * 60 * 24 * 7  # 7 hari, dibersihkan juga saat agregat di-regenerate
+
+    @staticmethod
+    def _cache():
+        return _prediksi_cache()
+
+    @staticmethod
+    def fingerprint(values: List[float], method: str,
+                    seasonal_periods: Optional[int] = None,
+                    params: Optional[Dict] = None) -> str:
+        """
+        Membuat key cache dari data training, metode, seasonal_periods, dan parameter tetap
+
+        Args:
+            values: Data training
+            method: Nama metode ('SES', 'DES', 'TES')
+            seasonal_periods: Periode musiman (TES)
+            params: Parameter yang mempengaruhi hasil fit (alpha/beta/gamma tetap, optimize,
+                    titik awal warm start, dll)
+
+        Returns:
+            String key cache
+        """
+        digest = hashlib.sha1()
+        digest.update(np.asarray(values, dtype=np.float64).tobytes())
+        digest.update(json.dumps(
+            [method, seasonal_periods, params or {}], sort_keys=True, default=str
+        ).encode('utf-8'))
+        return f"{FittedModelCache.KEY_PREFIX}:{method}:{digest.hexdigest()}"
+
+    @staticmethod
+    def get(key: str) -> Optional[Dict]:
+        """
+        Mengambil entry cache (None jika tidak ada atau cache tidak bisa diakses)
+        """
+        try:
+            return FittedModelCache._cache().get(key)
+        except Exception:
+            return None
+
+    @staticmethod
+    def set(key: str, info: Dict):
+        """
+        Menyimpan info hasil fit (tanpa forecast masa depan yang bergantung pada
+        horizon dan tanpa waktu fit, yang diisi ulang saat replay)
+        """
+        entry = {
+            k: v for k, v in info.items()
+            if k not in ('future_forecasts', 'steps', 'cache', 'fit_time_ms')
+        }
+        try:
+            FittedModelCache._cache().set(key, entry, FittedModelCache.TIMEOUT)
+        except Exception:
+            pass
+
+    @staticmethod
+    def replay(entry: Dict, steps: int) -> Dict:
+        """
+        Membangun ulang info prediksi dari entry cache untuk horizon tertentu
+
+        Forecast dihitung dengan satu rekursi dari state akhir yang tersimpan.
+
+        Args:
+            entry: Entry cache hasil FittedModelCache.get
+            steps: Jumlah langkah ke depan
+
+        Returns:
+            Dictionary info dengan format yang sama seperti hasil predict()
+        """
+        info = copy.deepcopy(entry)
+        forecasts = HoltWintersEngine.forecast_state(info['state'], steps)
+        if info.get('method') == 'TES':
+            forecasts = np.maximum(forecasts, 0)
+
+        info['future_forecasts'] = [float(v) for v in forecasts]
+        info['steps'] = steps
+        return info
+
+    @staticmethod
+    def invalidate():
+        """
+        Menghapus seluruh entry cache (dipanggil saat data agregat ditulis ulang)
+        """
+        try:
+            FittedModelCache._cache().clear()
+        except Exception:
+            pass
+
+
+class AgregatVersion:
+    """
+    Token versi AgregatPendapatanBulanan (disimpan di cache 'prediksi')
+    """
+
+    KEY = 'agregat_version'
+
+    @staticmethod
+    def current() -> str:
+        """
+        Token versi saat ini (dibuat baru jika belum ada, misal setelah cache dibersihkan)
+        """
+        try:
+            cache = _prediksi_cache()
+            version = cache.get(AgregatVersion.KEY)
+            if version is None:
+                version = uuid.uuid4().hex
+                if not cache.add(AgregatVersion.KEY, version, None):
+                    version = cache.get(AgregatVersion.KEY, version)
+            return version
+        except Exception:
+            # Tanpa cache tidak ada yang bisa di-cache ulang dengan aman
+            return uuid.uuid4().hex
+
+    @staticmethod
+    def bump():
+        """
+        Mengganti token versi (dipanggil setelah agregat ditulis dan di-commit)
+        """
+        try:
+            _prediksi_cache().set(AgregatVersion.KEY, uuid.uuid4().hex, None)
+        except Exception:
+            pass
+
+
+class HybridResultCache:
+    """
+    Cache hasil dasar Hybrid (bagian yang tidak bergantung pada scenario)
+    per (tahun, bulan, jenis kendaraan, training_periods, speed, versi agregat)
+    """
+
+    KEY_PREFIX = 'hybrid_base_v2'
+    TIMEOUT = FittedModelCache.TIMEOUT
+
+    @staticmethod
+    def key(tahun: int, bulan: int, jenis_kendaraan_id: Optional[int], training_periods: int,
+            speed: str = 'accurate') -> str:
+        return (
+            f"{HybridResultCache.KEY_PREFIX}:{AgregatVersion.current()}:"
+            f"{int(tahun)}:{int(bulan)}:{jenis_kendaraan_id or 'all'}:{int(training_periods)}:{speed}"
+        )
+
+    @staticmethod
+    def get(key: str) -> Optional[Dict]:
+        try:
+            return _prediksi_cache().get(key)
+        except Exception:
+            return None
+
+    @staticmethod
+    def set(key: str, base: Dict):
+        try:
+            _prediksi_cache().set(key, base, HybridResultCache.TIMEOUT)
+        except Exception:
+            pass
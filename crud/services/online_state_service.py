@@ -0,0 +1,299 @@
+"""
+Service untuk update online state model smoothing (manage.py update_state_prediksi)
+
+Fit penuh (optimasi parameter) menyimpan parameter dan state akhir setiap
+series x metode ke StatePrediksi. Saat data agregat bulan baru masuk, state
+cukup dimajukan dengan HoltWintersEngine.update (O(1) per bulan, parameter
+tetap), lalu forecast dihitung dari state tersebut tanpa fitting ulang.
+
+Fit penuh diulang jika:
+- jumlah update online sejak fit penuh mencapai refit_every (jadwal),
+- rata-rata error 1-langkah terbaru melebihi drift_factor x MAPE fit (drift),
+- data yang sudah masuk state berubah (fingerprint berbeda),
+- bulan baru tidak berurutan dengan data terakhir state (ada celah), atau
+- state seasonal tersimpan dalam format lama (tanpa season_lag).
+"""
+import hashlib
+import statistics
+import time
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from crud.models import StatePrediksi
+from crud.services.backtest_service import BacktestService
+from crud.services.holt_winters_engine import HoltWintersEngine
+from crud.services.model_cache import FittedModelCache
+from crud.services.prediction_service import PredictionService
+from crud.services.series_store import period_index
+
+
+class OnlineStateService:
+    """
+    Persistensi state akhir SES/DES/TES dan update O(1) per bulan baru
+    """
+
+    METHODS = ('SES', 'DES', 'TES')
+
+    # Fit penuh ulang setelah sekian update online
+    REFIT_EVERY = 12
+
+    # Drift: rata-rata APE DRIFT_WINDOW update terakhir > DRIFT_FACTOR x MAPE fit
+    DRIFT_FACTOR = 1.5
+    DRIFT_WINDOW = 3
+
+    # Jumlah error online yang disimpan
+    MAX_ERRORS = 24
+
+    @staticmethod
+    def fingerprint(values: Sequence[float]) -> str:
+        """
+        Fingerprint data yang sudah masuk state
+        """
+        return hashlib.sha1(np.asarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+    @staticmethod
+    def fit(jenis_kendaraan_id: Optional[int], metode: str, rows: List[Dict],
+            seasonal_periods: int = 12, obj: Optional[StatePrediksi] = None) -> StatePrediksi:
+        """
+        Fit penuh (optimasi parameter) dan menyimpan state akhir ke objek (belum di-save)
+
+        Args:
+            jenis_kendaraan_id: ID jenis kendaraan (None = global)
+            metode: 'SES', 'DES', atau 'TES'
+            rows: Data historis {tahun, bulan, total_pendapatan}
+            seasonal_periods: Periode musiman untuk TES
+            obj: StatePrediksi yang sudah ada (None = objek baru)
+
+        Returns:
+            StatePrediksi dengan parameter, state, dan metrik fit terbaru
+        """
+        tahun, bulan = rows[-1]['tahun'], rows[-1]['bulan']
+        kwargs = {
+            'jenis_kendaraan_id': jenis_kendaraan_id,
+            'tahun_prediksi': tahun + bulan // 12,
+            'bulan_prediksi': bulan % 12 + 1,
+            'historical': rows,
+            'actual_value': None,
+            'interval_paths': 0,
+        }
+        if metode == 'SES':
+            result = PredictionService.predict_ses(**kwargs)
+        elif metode == 'DES':
+            result = PredictionService.predict_des(**kwargs)
+        elif metode == 'TES':
+            result = PredictionService.predict_tes(seasonal_periods=seasonal_periods, **kwargs)
+        else:
+            raise ValueError(f"Metode tidak dikenal: {metode}")
+
+        info = result['info']
+        if obj is None:
+            obj = StatePrediksi(
+                jenis_kendaraan_id=jenis_kendaraan_id, metode=metode, seasonal_periods=seasonal_periods
+            )
+        obj.alpha = float(info['alpha'])
+        obj.beta = float(info['beta']) if info.get('beta') is not None else None
+        obj.gamma = float(info['gamma']) if info.get('gamma') is not None else None
+        obj.best_config = info.get('best_config')
+        obj.state = info['state']
+        obj.data_training_dari = result['data_training_dari']
+        obj.data_training_sampai = result['data_training_sampai']
+        obj.jumlah_data_training = len(rows)
+        obj.fingerprint = OnlineStateService.fingerprint([r['total_pendapatan'] for r in rows])
+        obj.mape = float(result['mape'])
+        obj.mae = float(result['mae'])
+        obj.rmse = float(result['rmse'])
+        obj.error_online = []
+        obj.jumlah_update = 0
+        obj.tanggal_fit = timezone.now()
+        return obj
+
+    @staticmethod
+    def is_drifting(obj: StatePrediksi, drift_factor: float = DRIFT_FACTOR) -> bool:
+        """
+        True jika rata-rata error online terbaru melebihi drift_factor x MAPE fit
+        """
+        recent = obj.error_online[-OnlineStateService.DRIFT_WINDOW:]
+        if len(recent) < OnlineStateService.DRIFT_WINDOW or not obj.mape:
+            return False
+        return statistics.fmean(recent) > drift_factor * obj.mape
+
+    @staticmethod
+    def advance(obj: Optional[StatePrediksi], jenis_kendaraan_id: Optional[int], metode: str,
+                rows: List[Dict], seasonal_periods: int = 12,
+                refit_every: int = REFIT_EVERY,
+                drift_factor: float = DRIFT_FACTOR) -> Tuple[StatePrediksi, str, Optional[str]]:
+        """
+        Memajukan state sampai data terakhir (update online atau fit penuh)
+
+        Returns:
+            Tuple (StatePrediksi belum di-save, aksi, alasan refit):
+            aksi 'fit' (state baru), 'update', 'refit', atau 'unchanged'
+        """
+        if obj is None:
+            return OnlineStateService.fit(jenis_kendaraan_id, metode, rows, seasonal_periods), 'fit', None
+
+        refit = lambda reason: (
+            OnlineStateService.fit(jenis_kendaraan_id, metode, rows, seasonal_periods, obj), 'refit', reason
+        )
+
+        # State seasonal lama (sebelum ada season_lag) menyimpan siklus urutan forecast
+        if obj.state.get('seasonal_type') and 'season_lag' not in obj.state:
+            return refit('format state')
+
+        values = [r['total_pendapatan'] for r in rows]
+        n = obj.jumlah_data_training
+        if (len(rows) < n or date(rows[0]['tahun'], rows[0]['bulan'], 1) != obj.data_training_dari
+                or OnlineStateService.fingerprint(values[:n]) != obj.fingerprint):
+            return refit('data berubah')
+
+        new_rows = rows[n:]
+        if not new_rows:
+            return obj, 'unchanged', None
+
+        periods = [period_index(r['tahun'], r['bulan']) for r in rows[n - 1:]]
+        if any(b - a != 1 for a, b in zip(periods, periods[1:])):
+            return refit('data tidak berurutan')
+
+        state = obj.state
+        errors = list(obj.error_online)
+        for row in new_rows:
+            y = row['total_pendapatan']
+            fitted, state = HoltWintersEngine.update(state, y, obj.alpha, obj.beta, obj.gamma)
+            if y:
+                errors.append(abs((y - fitted) / y) * 100)
+
+        obj.state = state
+        obj.error_online = errors[-OnlineStateService.MAX_ERRORS:]
+        obj.jumlah_update += len(new_rows)
+        obj.jumlah_data_training = len(rows)
+        obj.data_training_sampai = date(rows[-1]['tahun'], rows[-1]['bulan'], 1)
+        obj.fingerprint = OnlineStateService.fingerprint(values)
+
+        if obj.jumlah_update >= refit_every:
+            return refit('jadwal')
+        if OnlineStateService.is_drifting(obj, drift_factor):
+            return refit('drift')
+        return obj, 'update', None
+
+    @staticmethod
+    def sync(methods: Sequence[str] = METHODS,
+             jenis_kendaraan_id: Optional[int] = None,
+             seasonal_periods: int = 12,
+             refit_every: int = REFIT_EVERY,
+             drift_factor: float = DRIFT_FACTOR,
+             force_refit: bool = False) -> Dict:
+        """
+        Memajukan state semua series x metode sampai data agregat terakhir
+
+        Args:
+            methods: Metode yang diproses
+            jenis_kendaraan_id: Hanya series jenis ini (None = global + semua jenis)
+            seasonal_periods: Periode musiman untuk TES
+            refit_every: Fit penuh ulang setelah sekian update online
+            drift_factor: Batas rasio error online terhadap MAPE fit
+            force_refit: Fit penuh semua series tanpa melihat jadwal/drift
+
+        Returns:
+            Dictionary states {(jenis, metode): StatePrediksi}, jumlah per aksi
+            (fit, update, refit, unchanged), refit_reasons, errors, dan elapsed_ms
+        """
+        started = time.perf_counter()
+        series = BacktestService.load_series(jenis_kendaraan_id)
+        if not series:
+            raise ValueError('Data agregat tidak ditemukan')
+
+        queryset = StatePrediksi.objects.filter(metode__in=methods, seasonal_periods=seasonal_periods)
+        if jenis_kendaraan_id is not None:
+            queryset = queryset.filter(jenis_kendaraan_id=jenis_kendaraan_id)
+        existing = {(obj.jenis_kendaraan_id, obj.metode): obj for obj in queryset}
+
+        states = {}
+        changed = []
+        actions = Counter()
+        reasons = Counter()
+        errors = {}
+        for key in sorted(series, key=lambda k: (k is not None, k or 0)):
+            for metode in methods:
+                obj = existing.get((key, metode))
+                try:
+                    if force_refit and obj is not None:
+                        obj = OnlineStateService.fit(key, metode, series[key], seasonal_periods, obj)
+                        action, reason = 'refit', 'paksa'
+                    else:
+                        obj, action, reason = OnlineStateService.advance(
+                            obj, key, metode, series[key], seasonal_periods, refit_every, drift_factor
+                        )
+                except Exception as e:
+                    errors[f"{key if key is not None else 'global'}-{metode}"] = str(e)
+                    continue
+
+                states[(key, metode)] = obj
+                actions[action] += 1
+                if reason:
+                    reasons[reason] += 1
+                if action != 'unchanged':
+                    changed.append(obj)
+
+        with transaction.atomic():
+            for obj in changed:
+                obj.save()
+
+        return {
+            'states': states,
+            **{action: actions[action] for action in ('fit', 'update', 'refit', 'unchanged')},
+            'refit_reasons': dict(reasons),
+            'errors': errors,
+            'elapsed_ms': (time.perf_counter() - started) * 1000,
+        }
+
+    @staticmethod
+    def forecast(obj: StatePrediksi, steps: int) -> List[float]:
+        """
+        Forecast `steps` bulan setelah data terakhir state (satu rekursi, tanpa fitting)
+        """
+        entry = {'method': obj.metode, 'state': obj.state}
+        return FittedModelCache.replay(entry, steps)['future_forecasts']
+
+    @staticmethod
+    def predict_periods(obj: StatePrediksi, periods: List[Tuple[int, int]]) -> Dict:
+        """
+        Prediksi periode (tahun, bulan) dari state dalam format hasil PredictionService.predict_range
+
+        Returns:
+            Dictionary parameter, metrik fit, dan list 'prediksi' per bulan
+        """
+        last = period_index(obj.data_training_sampai.year, obj.data_training_sampai.month)
+        offsets = [period_index(tahun, bulan) - last for tahun, bulan in periods]
+        if min(offsets) < 1:
+            raise ValueError('Periode prediksi harus setelah data terakhir state')
+        forecasts = OnlineStateService.forecast(obj, max(offsets))
+
+        decimal = lambda value: Decimal(str(value)) if value is not None else None
+        return {
+            'metode': obj.metode,
+            'alpha': decimal(obj.alpha),
+            'beta': decimal(obj.beta),
+            'gamma': decimal(obj.gamma),
+            'seasonal_periods': obj.seasonal_periods,
+            'mape': decimal(obj.mape),
+            'mae': decimal(obj.mae),
+            'rmse': decimal(obj.rmse),
+            'data_training_dari': obj.data_training_dari,
+            'data_training_sampai': obj.data_training_sampai,
+            'jumlah_data_training': obj.jumlah_data_training,
+            'prediksi': [
+                {
+                    'tahun_prediksi': tahun,
+                    'bulan_prediksi': bulan,
+                    'nilai_prediksi': Decimal(str(forecasts[offset - 1])),
+                    'nilai_aktual': None,
+                }
+                for (tahun, bulan), offset in zip(periods, offsets)
+            ],
+        }
@@ -0,0 +1,282 @@
+"""
+Service untuk precompute prediksi terjadwal (manage.py precompute_prediksi)
+
+Setiap series (global dan per jenis kendaraan) x metode di-fit sekali untuk
+N bulan ke depan setelah data agregat terakhir, lalu hasilnya di-upsert ke
+HasilPrediksi dengan is_precomputed=True. Dashboard cukup membaca baris
+tersebut (endpoint prediksi/precomputed/) tanpa memicu fitting model.
+
+Data semua series dimuat sekali di proses utama; worker hanya melakukan
+fitting (tanpa query database) sehingga aman dijalankan di process pool.
+
+Mode online memakai state tersimpan (OnlineStateService): state dimajukan
+dengan bulan baru lalu forecast dihitung dari state, fit penuh hanya untuk
+series yang belum punya state, terjadwal refit, atau mengalami drift.
+"""
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from crud.models import HasilPrediksi
+from crud.services.backtest_service import BacktestService
+from crud.services.online_state_service import OnlineStateService
+from crud.services.prediction_service import PredictionService
+from crud.services.worker_pool import WorkerPool
+
+
+class PrecomputeService:
+    """
+    Materialisasi prediksi SES/DES/TES untuk semua series ke HasilPrediksi
+    """
+
+    METHODS = ('SES', 'DES', 'TES')
+    DEFAULT_HORIZON = 12
+    KETERANGAN = 'Precompute terjadwal'
+
+    @staticmethod
+    def next_periods(tahun: int, bulan: int, horizon: int) -> List[Tuple[int, int]]:
+        """
+        Daftar `horizon` periode setelah (tahun, bulan)
+        """
+        periods = []
+        for i in range(1, horizon + 1):
+            offset = bulan - 1 + i
+            periods.append((tahun + offset // 12, offset % 12 + 1))
+        return periods
+
+    @staticmethod
+    def build_tasks(methods: Sequence[str] = METHODS,
+                    horizon: int = DEFAULT_HORIZON,
+                    jenis_kendaraan_id: Optional[int] = None,
+                    seasonal_periods: int = 12) -> Tuple[List[Tuple[Hashable, str, Dict]], List[Tuple[int, int]]]:
+        """
+        Menyusun task (series, metode, kwargs predict_range) dari data agregat
+
+        Args:
+            methods: Metode yang di-precompute
+            horizon: Jumlah bulan ke depan setelah periode agregat terakhir
+            jenis_kendaraan_id: Hanya series jenis ini (None = global + semua jenis)
+            seasonal_periods: Periode musiman untuk TES
+
+        Returns:
+            Tuple (tasks, periods) dengan periods = bulan yang diprediksi
+        """
+        series = BacktestService.load_series(jenis_kendaraan_id)
+        if not series:
+            raise ValueError('Data agregat tidak ditemukan')
+
+        last = max((rows[-1]['tahun'], rows[-1]['bulan']) for rows in series.values())
+        periods = PrecomputeService.next_periods(last[0], last[1], horizon)
+        (tahun_mulai, bulan_mulai), (tahun_akhir, bulan_akhir) = periods[0], periods[-1]
+
+        tasks = []
+        for key in sorted(series, key=lambda k: (k is not None, k or 0)):
+            for metode in methods:
+                tasks.append((key, metode, {
+                    'metode_list': [metode],
+                    'tahun_mulai': tahun_mulai,
+                    'bulan_mulai': bulan_mulai,
+                    'tahun_akhir': tahun_akhir,
+                    'bulan_akhir': bulan_akhir,
+                    'jenis_kendaraan_id': key,
+                    'seasonal_periods': seasonal_periods,
+                    'historical': series[key],
+                    # Periode target berada setelah data terakhir, belum ada nilai aktual
+                    'actual_values': {},
+                    # HasilPrediksi tidak menyimpan interval, simulasi tidak perlu dijalankan
+                    'interval_paths': 0,
+                }))
+        return tasks, periods
+
+    @staticmethod
+    def run_tasks(tasks: List[Tuple[Hashable, str, Dict]], workers: int = 1) -> List[Dict]:
+        """
+        Menjalankan fitting semua task (di process pool jika workers > 1)
+
+        Returns:
+            List hasil predict_range per task (urutan sama dengan tasks)
+        """
+        if workers > 1 and len(tasks) > 1:
+            try:
+                # Tutup koneksi sebelum fork agar proses worker tidak berbagi socket database
+                connections.close_all()
+                executor = WorkerPool.get(WorkerPool.resolve_workers(workers, len(tasks)))
+                futures = [executor.submit(_precompute_task, metode, kwargs) for _, metode, kwargs in tasks]
+                return [future.result() for future in futures]
+            except (BrokenProcessPool, OSError, RuntimeError):
+                # Fallback ke mode serial
+                WorkerPool.reset()
+
+        return [_precompute_task(metode, kwargs) for _, metode, kwargs in tasks]
+
+    @staticmethod
+    def run_online(tasks: List[Tuple[Hashable, str, Dict]], periods: List[Tuple[int, int]],
+                   methods: Sequence[str] = METHODS,
+                   jenis_kendaraan_id: Optional[int] = None,
+                   seasonal_periods: int = 12) -> Tuple[List[Dict], Dict]:
+        """
+        Menghasilkan prediksi semua task dari state tersimpan (OnlineStateService.sync)
+
+        Returns:
+            Tuple (hasil per task dengan format sama seperti run_tasks, ringkasan sync)
+        """
+        synced = OnlineStateService.sync(methods, jenis_kendaraan_id, seasonal_periods)
+        states = synced.pop('states')
+
+        results = []
+        for key, metode, _ in tasks:
+            obj = states.get((key, metode))
+            if obj is None:
+                label = f"{key if key is not None else 'global'}-{metode}"
+                results.append({'error': synced['errors'].get(label, 'State tidak tersedia')})
+                continue
+            try:
+                results.append(OnlineStateService.predict_periods(obj, periods))
+            except ValueError as e:
+                results.append({'error': str(e)})
+        return results, synced
+
+    @staticmethod
+    def upsert(tasks: List[Tuple[Hashable, str, Dict]], results: List[Dict]) -> Dict:
+        """
+        Menyimpan hasil ke HasilPrediksi: baris precompute yang sudah ada untuk
+        (jenis, tahun, bulan, metode) di-update, sisanya dibuat baru
+
+        Returns:
+            Dictionary jumlah created, updated, dan errors {series-metode: pesan}
+        """
+        now = timezone.now()
+        rows = {}
+        errors = {}
+        for (key, metode, _), result in zip(tasks, results):
+            if 'error' in result:
+                errors[f"{key if key is not None else 'global'}-{metode}"] = result['error']
+                continue
+            for item in result['prediksi']:
+                rows[(key, item['tahun_prediksi'], item['bulan_prediksi'], metode)] = {
+                    'nilai_prediksi': item['nilai_prediksi'],
+                    'alpha': result.get('alpha'),
+                    'beta': result.get('beta'),
+                    'gamma': result.get('gamma'),
+                    'seasonal_periods': result.get('seasonal_periods', 12),
+                    'mape': result.get('mape'),
+                    'mae': result.get('mae'),
+                    'rmse': result.get('rmse'),
+                    'data_training_dari': result['data_training_dari'],
+                    'data_training_sampai': result['data_training_sampai'],
+                    'jumlah_data_training': result['jumlah_data_training'],
+                    'keterangan': PrecomputeService.KETERANGAN,
+                    'tanggal_prediksi': now,
+                }
+
+        fields = list(next(iter(rows.values()))) if rows else []
+        created = updated = 0
+        with transaction.atomic():
+            periods = {(tahun, bulan) for _, tahun, bulan, _ in rows}
+            existing = {}
+            queryset = HasilPrediksi.objects.filter(
+                is_precomputed=True,
+                tahun_prediksi__in={tahun for tahun, _ in periods},
+                bulan_prediksi__in={bulan for _, bulan in periods},
+            ) if rows else HasilPrediksi.objects.none()
+            for obj in queryset.order_by('-tanggal_prediksi'):
+                existing.setdefault(
+                    (obj.jenis_kendaraan_id, obj.tahun_prediksi, obj.bulan_prediksi, obj.metode), obj
+                )
+
+            to_update, to_create = [], []
+            for (key, tahun, bulan, metode), values in rows.items():
+                obj = existing.get((key, tahun, bulan, metode))
+                if obj is None:
+                    to_create.append(HasilPrediksi(
+                        jenis_kendaraan_id=key, tahun_prediksi=tahun, bulan_prediksi=bulan,
+                        metode=metode, is_precomputed=True, **values
+                    ))
+                    continue
+                for field, value in values.items():
+                    setattr(obj, field, value)
+                to_update.append(obj)
+
+            if to_update:
+                HasilPrediksi.objects.bulk_update(to_update, fields, batch_size=500)
+            if to_create:
+                created = len(HasilPrediksi.objects.bulk_create(to_create, batch_size=500))
+            updated = len(to_update)
+
+        return {'created': created, 'updated': updated, 'errors': errors}
+
+    @staticmethod
+    def precompute(methods: Sequence[str] = METHODS,
+                   horizon: int = DEFAULT_HORIZON,
+                   jenis_kendaraan_id: Optional[int] = None,
+                   seasonal_periods: int = 12,
+                   workers: int = 1,
+                   online: bool = False) -> Dict:
+        """
+        Precompute prediksi semua series x metode untuk `horizon` bulan ke depan
+
+        Args:
+            online: Forecast dari state tersimpan (update online) alih-alih fitting ulang
+
+        Returns:
+            Dictionary ringkasan: periods, series, tasks, created, updated,
+            errors, elapsed_ms, dan online (ringkasan sync state, mode online)
+        """
+        started = time.perf_counter()
+        tasks, periods = PrecomputeService.build_tasks(
+            methods, horizon, jenis_kendaraan_id, seasonal_periods
+        )
+        synced = None
+        if online:
+            results, synced = PrecomputeService.run_online(
+                tasks, periods, methods, jenis_kendaraan_id, seasonal_periods
+            )
+        else:
+            results = PrecomputeService.run_tasks(tasks, workers)
+        summary = PrecomputeService.upsert(tasks, results)
+
+        return {
+            'periods': [{'tahun': tahun, 'bulan': bulan} for tahun, bulan in periods],
+            'series': len({key for key, _, _ in tasks}),
+            'tasks': len(tasks),
+            **summary,
+            'online': synced,
+            'elapsed_ms': (time.perf_counter() - started) * 1000,
+        }
+
+    @staticmethod
+    def get_latest(tahun_prediksi: int, bulan_prediksi: int,
+                   jenis_kendaraan_id: Optional[int] = None,
+                   metode: Optional[str] = None) -> List[HasilPrediksi]:
+        """
+        Hasil precompute terbaru untuk (jenis, tahun, bulan[, metode]), satu per metode
+        """
+        queryset = HasilPrediksi.objects.select_related('jenis_kendaraan').filter(
+            is_precomputed=True,
+            jenis_kendaraan_id=jenis_kendaraan_id,
+            tahun_prediksi=tahun_prediksi,
+            bulan_prediksi=bulan_prediksi,
+        )
+        if metode:
+            queryset = queryset.filter(metode=metode)
+
+        latest = {}
+        for obj in queryset.order_by('-tanggal_prediksi'):
+            latest.setdefault(obj.metode, obj)
+        return [latest[m] for m in sorted(latest)]
+
+
+def _precompute_task(metode: str, kwargs: Dict) -> Dict:
+    """
+    Fitting satu series x metode untuk precompute
+
+    Didefinisikan di level modul agar bisa dijalankan di process pool. Tidak
+    ada query database di sini karena history dan nilai aktual sudah diberikan.
+    """
+    try:
+        return PredictionService.predict_range(**kwargs)[metode]
+    except Exception as e:
+        return {'error': str(e)}
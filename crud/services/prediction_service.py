@@ -2,20 +2,30 @@
 Service utama untuk melakukan prediksi pendapatan pajak kendaraan
 Menggunakan data dari AgregatPendapatanBulanan dan algoritma Exponential Smoothing
 """
+import time
+import numpy as np
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Dict, Optional, Tuple
-from django.db.models import Q
+from typing import List, Dict, Optional, Sequence, Tuple
 
-from crud.models import AgregatPendapatanBulanan, HasilPrediksi, JenisKendaraan, TransaksiPajak
-from django.db.models import Sum
+from crud.models import HasilPrediksi, JenisKendaraan, TransaksiPajak
+from django.db.models import Q, Sum
 from crud.services.exponential_smoothing import (
+    DEFAULT_SPEED,
+    INTERVAL_PATHS,
+    INTERVAL_QUANTILES,
+    simulate_interval,
     SimpleExponentialSmoothing,
     DoubleExponentialSmoothing,
     TripleExponentialSmoothing
 )
+from crud.services.model_cache import FittedModelCache
+from crud.services.series_store import SeriesStore
 from crud.utils.metrics import calculate_all_metrics
 
+# Penanda argumen yang belum dimuat (None punya arti sendiri, misalnya "tidak ada nilai aktual")
+UNSET = object()
+
 
 class PredictionService:
     """
@@ -37,20 +47,31 @@ class PredictionService:
         Returns:
             Nilai aktual atau None jika tidak ada data
         """
-        queryset = AgregatPendapatanBulanan.objects.filter(
-            tahun=tahun,
-            bulan=bulan
-        )
+        period = (int(tahun), int(bulan))
+        value = SeriesStore.get_values(jenis_kendaraan_id, period, period).get(period)
+        return value or None
+    
+    @staticmethod
+    def get_actual_values(tahun_mulai: int, bulan_mulai: int,
+                          tahun_akhir: int, bulan_akhir: int,
+                          jenis_kendaraan_id: Optional[int] = None) -> Dict[Tuple[int, int], float]:
+        """
+        Mendapatkan nilai aktual untuk rentang periode dalam satu query
         
-        if jenis_kendaraan_id is not None:
-            queryset = queryset.filter(jenis_kendaraan_id=jenis_kendaraan_id)
-        else:
-            queryset = queryset.filter(jenis_kendaraan__isnull=True)
+        Args:
+            tahun_mulai: Tahun awal
+            bulan_mulai: Bulan awal
+            tahun_akhir: Tahun akhir
+            bulan_akhir: Bulan akhir
+            jenis_kendaraan_id: ID jenis kendaraan (None = semua)
         
-        result = queryset.first()
-        if result and result.total_pendapatan:
-            return float(result.total_pendapatan)
-        return None
+        Returns:
+            Dictionary {(tahun, bulan): nilai_aktual} untuk periode yang ada datanya
+        """
+        values = SeriesStore.get_values(
+            jenis_kendaraan_id, (int(tahun_mulai), int(bulan_mulai)), (int(tahun_akhir), int(bulan_akhir))
+        )
+        return {period: value for period, value in values.items() if value}
     
     @staticmethod
     def get_historical_data(jenis_kendaraan_id: Optional[int] = None,
@@ -66,104 +87,101 @@ class PredictionService:
             start_date: Tanggal mulai (None = tidak dibatasi)
             end_date: Tanggal akhir (None = tidak dibatasi)
             min_periods: Minimum periode data yang diperlukan
-            use_realtime: Jika True, ambil data langsung dari TransaksiPajak
+            use_realtime: Jika True, bulan setelah periode agregat terbaru dihitung
+                          langsung dari TransaksiPajak (lihat get_realtime_tail)
         
         Returns:
             List dictionary dengan keys: tahun, bulan, total_pendapatan
         """
-        # Ambil data dari AgregatPendapatanBulanan (data lebih lengkap)
-        queryset = AgregatPendapatanBulanan.objects.all()
+        # Ambil data dari AgregatPendapatanBulanan (data lebih lengkap) lewat SeriesStore:
+        # slice array in-process, tanpa query selama versi agregat tidak berubah.
+        # Untuk global hanya series jenis_kendaraan=NULL (sudah berisi total keseluruhan)
+        data = SeriesStore.get_historical_data(
+            jenis_kendaraan_id=jenis_kendaraan_id,
+            start_date=start_date,
+            end_date=end_date
+        )
         
-        if jenis_kendaraan_id is not None:
-            queryset = queryset.filter(jenis_kendaraan_id=jenis_kendaraan_id)
-        else:
-            # PERBAIKAN: Untuk query global, ambil hanya record yang jenis_kendaraan=NULL
-            # Record NULL sudah berisi total keseluruhan, tidak perlu SUM lagi
-            queryset = queryset.filter(jenis_kendaraan__isnull=True)
+        # Jika data agregat tidak cukup atau use_realtime=True, lengkapi dengan bulan yang
+        # belum teragregasi (setelah periode agregat terbaru) langsung dari TransaksiPajak
+        if len(data) < min_periods or use_realtime:
+            data = data + PredictionService.get_realtime_tail(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                after=SeriesStore.last_period(jenis_kendaraan_id),
+                start_date=start_date,
+                end_date=end_date
+            )
+        
+        PredictionService._check_min_periods(data, min_periods)
+        
+        return data
+    
+    @staticmethod
+    def get_realtime_tail(jenis_kendaraan_id: Optional[int] = None,
+                          after: Optional[Tuple[int, int]] = None,
+                          start_date: Optional[date] = None,
+                          end_date: Optional[date] = None) -> List[Dict]:
+        """
+        Total bulanan dari TransaksiPajak untuk bulan setelah periode agregat terbaru
         
-        # Filter by date range
-        if start_date:
+        Hanya bulan > `after` (dan dalam rentang start_date..end_date) yang di-GROUP BY,
+        dengan filter rentang (tahun, bulan) yang bisa memakai index TransaksiPajak
+        (tahun, bulan), sehingga biayanya sebanding dengan jumlah bulan yang belum
+        teragregasi, bukan seluruh tabel.
+        
+        Args:
+            jenis_kendaraan_id: Filter by jenis kendaraan (None = semua)
+            after: Periode agregat terbaru (tahun, bulan); None = belum ada agregat
+            start_date: Tanggal mulai (None = tidak dibatasi)
+            end_date: Tanggal akhir (None = tidak dibatasi)
+        
+        Returns:
+            List dictionary dengan keys: tahun, bulan, total_pendapatan, jenis_kendaraan_id
+        """
+        start = (start_date.year, start_date.month) if start_date else None
+        if after is not None:
+            after_next = (after[0] + 1, 1) if after[1] == 12 else (after[0], after[1] + 1)
+            start = max(start, after_next) if start else after_next
+        end = (end_date.year, end_date.month) if end_date else None
+        if start and end and start > end:
+            return []
+        
+        queryset = TransaksiPajak.objects.all()
+        if start:
             queryset = queryset.filter(
-                Q(tahun__gt=start_date.year) |
-                (Q(tahun=start_date.year) & Q(bulan__gte=start_date.month))
+                Q(tahun__gt=start[0]) | Q(tahun=start[0], bulan__gte=start[1])
             )
-        
-        if end_date:
+        if end:
             queryset = queryset.filter(
-                Q(tahun__lt=end_date.year) |
-                (Q(tahun=end_date.year) & Q(bulan__lte=end_date.month))
+                Q(tahun__lt=end[0]) | Q(tahun=end[0], bulan__lte=end[1])
             )
-        
-        # Order by tahun dan bulan
-        queryset = queryset.order_by('tahun', 'bulan')
-        
-        # Ambil data dari queryset
-        data = []
-        for item in queryset:
-            data.append({
-                'tahun': item.tahun,
-                'bulan': item.bulan,
-                'total_pendapatan': float(item.total_pendapatan),
-                'jenis_kendaraan_id': item.jenis_kendaraan_id if item.jenis_kendaraan else None
-            })
-        
-        # Jika data agregat tidak cukup atau use_realtime=True, coba ambil dari TransaksiPajak
-        if len(data) < min_periods or use_realtime:
-            transaksi_filter = {}
-            if start_date:
-                transaksi_filter['tahun__gte'] = start_date.year
-            if end_date:
-                transaksi_filter['tahun__lte'] = end_date.year
-            
-            transaksi_queryset = TransaksiPajak.objects.values(
-                'tahun', 'bulan'
-            ).annotate(
-                total_pendapatan=Sum('total_bayar')
-            ).order_by('tahun', 'bulan')
-            
-            if transaksi_filter:
-                transaksi_queryset = transaksi_queryset.filter(**transaksi_filter)
-            
-            if jenis_kendaraan_id is not None:
-                transaksi_queryset = transaksi_queryset.filter(kendaraan__jenis_id=jenis_kendaraan_id)
-            
-            realtime_data = []
-            for item in transaksi_queryset:
-                realtime_data.append({
-                    'tahun': item['tahun'],
-                    'bulan': item['bulan'],
-                    'total_pendapatan': float(item['total_pendapatan'] or 0),
-                    'jenis_kendaraan_id': jenis_kendaraan_id
-                })
-            
-            # Gunakan realtime data jika lebih lengkap
-            if len(realtime_data) > len(data):
-                data = realtime_data
-            
-            # Aggregate jika jenis_kendaraan_id is None
-            if jenis_kendaraan_id is None and data:
-                from collections import defaultdict
-                aggregated = defaultdict(float)
-                for item in data:
-                    key = (item['tahun'], item['bulan'])
-                    aggregated[key] += item['total_pendapatan']
-                
-                data = []
-                for (tahun, bulan), total in sorted(aggregated.items()):
-                    data.append({
-                        'tahun': tahun,
-                        'bulan': bulan,
-                        'total_pendapatan': total,
-                        'jenis_kendaraan_id': None
-                    })
-        
-        if len(data) < min_periods:
+        if jenis_kendaraan_id is not None:
+            queryset = queryset.filter(kendaraan__jenis_id=jenis_kendaraan_id)
+        
+        rows = queryset.values('tahun', 'bulan').annotate(
+            total_pendapatan=Sum('total_bayar')
+        ).order_by('tahun', 'bulan')
+        
+        return [
+            {
+                'tahun': item['tahun'],
+                'bulan': item['bulan'],
+                'total_pendapatan': float(item['total_pendapatan'] or 0),
+                'jenis_kendaraan_id': jenis_kendaraan_id
+            }
+            for item in rows
+        ]
+    
+    @staticmethod
+    def _check_min_periods(historical: List[Dict], min_periods: int):
+        """
+        Memastikan jumlah periode data historis mencukupi
+        """
+        if len(historical) < min_periods:
             raise ValueError(
                 f"Data historis tidak cukup. Minimal {min_periods} periode, "
-                f"tetapi hanya ada {len(data)} periode"
+                f"tetapi hanya ada {len(historical)} periode"
             )
-        
-        return data
     
     @staticmethod
     def _calculate_steps(historical: List[Dict], tahun_prediksi: int, bulan_prediksi: int) -> int:
@@ -192,12 +210,149 @@ class PredictionService:
         # Minimal 1 langkah
         return max(1, steps)
     
+    @staticmethod
+    def get_warm_start(metode: str, jenis_kendaraan_id: Optional[int] = None,
+                       seasonal_periods: Optional[int] = None) -> Optional[Dict]:
+        """
+        Mengambil parameter dari HasilPrediksi terbaru (jenis kendaraan & metode sama)
+        untuk dipakai sebagai titik awal optimizer
+        
+        Args:
+            metode: Metode prediksi ('SES', 'DES', 'TES')
+            jenis_kendaraan_id: ID jenis kendaraan (None = semua)
+            seasonal_periods: Periode musiman (khusus TES)
+        
+        Returns:
+            Dictionary dengan keys alpha, beta, gamma, mape, atau None jika belum ada
+        """
+        queryset = HasilPrediksi.objects.filter(
+            metode=metode,
+            alpha__isnull=False,
+            beta__isnull=False,
+            gamma__isnull=False
+        )
+        
+        if jenis_kendaraan_id is not None:
+            queryset = queryset.filter(jenis_kendaraan_id=jenis_kendaraan_id)
+        else:
+            queryset = queryset.filter(jenis_kendaraan__isnull=True)
+        
+        if seasonal_periods is not None:
+            queryset = queryset.filter(seasonal_periods=seasonal_periods)
+        
+        latest = queryset.order_by('-tanggal_prediksi').values('alpha', 'beta', 'gamma', 'mape').first()
+        if latest is None:
+            return None
+        
+        return {
+            'alpha': float(latest['alpha']),
+            'beta': float(latest['beta']),
+            'gamma': float(latest['gamma']),
+            'mape': float(latest['mape']) if latest['mape'] is not None else None,
+        }
+    
+    @staticmethod
+    def _fit_cached(method: str, values: List[float], steps: int, fit,
+                    seasonal_periods: Optional[int] = None,
+                    params: Optional[Dict] = None) -> Dict:
+        """
+        Menjalankan fitting model dengan cache berbasis fingerprint series
+        
+        Jika data training, metode, dan parameter sama dengan fitting sebelumnya,
+        info diambil dari cache dan forecast dihitung ulang dari state akhir
+        (tanpa optimasi ulang).
+        
+        Args:
+            method: Nama metode ('SES', 'DES', 'TES')
+            values: Data training
+            steps: Jumlah langkah ke depan
+            fit: Callable tanpa argumen yang mengembalikan info hasil predict()
+            seasonal_periods: Periode musiman (TES)
+            params: Parameter yang mempengaruhi hasil fit
+        
+        Returns:
+            Dictionary info hasil predict()
+        """
+        key = FittedModelCache.fingerprint(values, method, seasonal_periods, params)
+        started = time.perf_counter()
+        entry = FittedModelCache.get(key)
+        if entry is not None:
+            info = FittedModelCache.replay(entry, steps)
+            # Waktu yang benar-benar dipakai request ini (baca cache + replay), bukan waktu fit asli
+            info['fit_time_ms'] = (time.perf_counter() - started) * 1000
+            info['cache'] = 'hit'
+            return info
+        
+        info = fit()
+        # Hasil parsial (dibatasi deadline) tidak disimpan agar tidak menggantikan fit penuh
+        if not info.get('partial'):
+            FittedModelCache.set(key, info)
+        info['cache'] = 'miss'
+        return info
+    
+    @staticmethod
+    def _prediction_interval(values: List[float], info: Dict, skip: int, steps: int,
+                             paths: int = INTERVAL_PATHS,
+                             quantiles: Sequence[float] = INTERVAL_QUANTILES) -> Optional[Dict]:
+        """
+        Prediction interval simulasi untuk periode target (langkah ke-steps)
+        
+        Args:
+            values: Data training
+            info: Info hasil predict()
+            skip: Jumlah observasi awal yang tidak dipakai untuk residual
+            steps: Langkah periode target
+            paths: Jumlah path simulasi (0 = tanpa interval)
+            quantiles: Kuantil yang dihitung
+        
+        Returns:
+            Dictionary paths, sigma, quantiles {label: nilai}, lower, upper
+            (nilai dibatasi >= 0), atau None jika paths = 0
+        """
+        intervals = PredictionService._prediction_intervals(values, info, skip, steps, paths, quantiles)
+        return intervals[steps - 1] if intervals else None
+    
+    @staticmethod
+    def _prediction_intervals(values: List[float], info: Dict, skip: int, steps: int,
+                              paths: int = INTERVAL_PATHS,
+                              quantiles: Sequence[float] = INTERVAL_QUANTILES) -> Optional[List[Dict]]:
+        """
+        Prediction interval simulasi untuk setiap langkah 1..steps (satu simulasi)
+        
+        Returns:
+            List per langkah berisi paths, sigma, quantiles {label: nilai}, lower,
+            upper (nilai dibatasi >= 0), atau None jika paths = 0
+        """
+        if not paths:
+            return None
+        
+        residuals = np.asarray(values[skip:], dtype=float) - np.asarray(info['forecast_values'][skip:], dtype=float)
+        interval = simulate_interval(info, residuals, steps, paths=paths, quantiles=quantiles)
+        
+        intervals = []
+        for step in range(steps):
+            target = {label: max(0.0, row[step]) for label, row in interval['quantiles'].items()}
+            intervals.append({
+                'paths': interval['paths'],
+                'sigma': interval['sigma'],
+                'quantiles': target,
+                'lower': min(target.values()),
+                'upper': max(target.values()),
+            })
+        return intervals
+    
     @staticmethod
     def predict_ses(jenis_kendaraan_id: Optional[int] = None,
                    tahun_prediksi: int = None,
                    bulan_prediksi: int = None,
                    alpha: Optional[float] = None,
-                   optimize: bool = True) -> Dict:
+                   optimize: bool = True,
+                   extra_steps: int = 0,
+                   historical: Optional[List[Dict]] = None,
+                   actual_value=UNSET,
+                   speed: str = DEFAULT_SPEED,
+                   interval_paths: int = INTERVAL_PATHS,
+                   interval_quantiles: Sequence[float] = INTERVAL_QUANTILES) -> Dict:
         """
         Melakukan prediksi menggunakan Simple Exponential Smoothing
         
@@ -207,6 +362,13 @@ class PredictionService:
             bulan_prediksi: Bulan yang akan diprediksi
             alpha: Parameter alpha (None = akan dioptimasi)
             optimize: Optimasi parameter
+            extra_steps: Langkah forecast tambahan setelah target
+                         (tersedia di info['future_forecasts'])
+            historical: Data historis yang sudah dimuat (None = ambil dari database)
+            actual_value: Nilai aktual yang sudah dimuat (default: ambil dari database)
+            speed: Preset optimizer ('fast', 'balanced', 'accurate')
+            interval_paths: Jumlah path simulasi prediction interval (0 = tanpa interval)
+            interval_quantiles: Kuantil prediction interval (default: 2.5% dan 97.5%)
         
         Returns:
             Dictionary dengan hasil prediksi
@@ -220,19 +382,29 @@ class PredictionService:
             else:
                 end_date = date(tahun_prediksi, bulan_prediksi - 1, 1)
         
-        historical = PredictionService.get_historical_data(
-            jenis_kendaraan_id=jenis_kendaraan_id,
-            end_date=end_date
-        )
+        if historical is None:
+            historical = PredictionService.get_historical_data(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                end_date=end_date
+            )
+        else:
+            PredictionService._check_min_periods(historical, 12)
         values = [d['total_pendapatan'] for d in historical]
         
         # Hitung berapa langkah ke depan
         steps = PredictionService._calculate_steps(historical, tahun_prediksi, bulan_prediksi)
-        
-        # Calculate prediction
-        prediction, alpha_opt, info = SimpleExponentialSmoothing.predict(
-            values, alpha=alpha, optimize=optimize, steps=steps
+        horizon = steps + extra_steps
+        
+        # Calculate prediction (pakai cache jika series tidak berubah)
+        info = PredictionService._fit_cached(
+            'SES', values, horizon,
+            fit=lambda: SimpleExponentialSmoothing.predict(
+                values, alpha=alpha, optimize=optimize, steps=horizon, speed=speed
+            )[-1],
+            params={'alpha': alpha, 'optimize': optimize, 'speed': speed}
         )
+        alpha_opt = info['alpha']
+        prediction = info['future_forecasts'][0]
         
         # Ambil prediksi untuk langkah terakhir (target)
         if info.get('future_forecasts') and len(info['future_forecasts']) >= steps:
@@ -246,11 +418,16 @@ class PredictionService:
         else:
             metrics = {'mape': 0.0, 'mae': 0.0, 'rmse': 0.0}
         
-        # Cek apakah ada nilai aktual untuk periode yang diprediksi (untuk validasi)
-        actual_value = PredictionService.get_actual_value(
-            tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+        interval = PredictionService._prediction_interval(
+            values, info, 1, steps, interval_paths, interval_quantiles
         )
         
+        # Cek apakah ada nilai aktual untuk periode yang diprediksi (untuk validasi)
+        if actual_value is UNSET:
+            actual_value = PredictionService.get_actual_value(
+                tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+            )
+        
         debug_info = {
             'actual_value_found': actual_value is not None,
             'metrics_type': 'in-sample',
@@ -281,6 +458,9 @@ class PredictionService:
             'data_training_sampai': end_date_result,
             'jumlah_data_training': len(historical),
             'nilai_aktual': Decimal(str(actual_value)) if actual_value is not None else None,
+            'interval': interval,
+            'speed': info.get('speed', speed),
+            'fit_time_ms': info.get('fit_time_ms'),
             'info': info,
             'debug': debug_info
         }
@@ -293,7 +473,13 @@ class PredictionService:
                    bulan_prediksi: int = None,
                    alpha: Optional[float] = None,
                    beta: Optional[float] = None,
-                   optimize: bool = True) -> Dict:
+                   optimize: bool = True,
+                   extra_steps: int = 0,
+                   historical: Optional[List[Dict]] = None,
+                   actual_value=UNSET,
+                   speed: str = DEFAULT_SPEED,
+                   interval_paths: int = INTERVAL_PATHS,
+                   interval_quantiles: Sequence[float] = INTERVAL_QUANTILES) -> Dict:
         """
         Melakukan prediksi menggunakan Double Exponential Smoothing
         
@@ -304,6 +490,13 @@ class PredictionService:
             alpha: Parameter alpha (None = akan dioptimasi)
             beta: Parameter beta (None = akan dioptimasi)
             optimize: Optimasi parameter
+            extra_steps: Langkah forecast tambahan setelah target
+                         (tersedia di info['future_forecasts'])
+            historical: Data historis yang sudah dimuat (None = ambil dari database)
+            actual_value: Nilai aktual yang sudah dimuat (default: ambil dari database)
+            speed: Preset optimizer ('fast', 'balanced', 'accurate')
+            interval_paths: Jumlah path simulasi prediction interval (0 = tanpa interval)
+            interval_quantiles: Kuantil prediction interval (default: 2.5% dan 97.5%)
         
         Returns:
             Dictionary dengan hasil prediksi
@@ -316,20 +509,31 @@ class PredictionService:
             else:
                 end_date = date(tahun_prediksi, bulan_prediksi - 1, 1)
         
-        historical = PredictionService.get_historical_data(
-            jenis_kendaraan_id=jenis_kendaraan_id,
-            end_date=end_date,
-            min_periods=3
-        )
+        if historical is None:
+            historical = PredictionService.get_historical_data(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                end_date=end_date,
+                min_periods=3
+            )
+        else:
+            PredictionService._check_min_periods(historical, 3)
         values = [d['total_pendapatan'] for d in historical]
         
         # Hitung berapa langkah ke depan
         steps = PredictionService._calculate_steps(historical, tahun_prediksi, bulan_prediksi)
-        
-        # Calculate prediction
-        prediction, alpha_opt, beta_opt, info = DoubleExponentialSmoothing.predict(
-            values, alpha=alpha, beta=beta, optimize=optimize, steps=steps
+        horizon = steps + extra_steps
+        
+        # Calculate prediction (pakai cache jika series tidak berubah)
+        info = PredictionService._fit_cached(
+            'DES', values, horizon,
+            fit=lambda: DoubleExponentialSmoothing.predict(
+                values, alpha=alpha, beta=beta, optimize=optimize, steps=horizon, speed=speed
+            )[-1],
+            params={'alpha': alpha, 'beta': beta, 'optimize': optimize, 'speed': speed}
         )
+        alpha_opt = info['alpha']
+        beta_opt = info['beta']
+        prediction = info['future_forecasts'][0]
         
         # Ambil prediksi untuk langkah terakhir (target)
         if info.get('future_forecasts') and len(info['future_forecasts']) >= steps:
@@ -342,11 +546,16 @@ class PredictionService:
         else:
             metrics = {'mape': 0.0, 'mae': 0.0, 'rmse': 0.0}
         
-        # Cek apakah ada nilai aktual untuk periode yang diprediksi (untuk validasi)
-        actual_value = PredictionService.get_actual_value(
-            tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+        interval = PredictionService._prediction_interval(
+            values, info, 1, steps, interval_paths, interval_quantiles
         )
         
+        # Cek apakah ada nilai aktual untuk periode yang diprediksi (untuk validasi)
+        if actual_value is UNSET:
+            actual_value = PredictionService.get_actual_value(
+                tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+            )
+        
         debug_info = {
             'actual_value_found': actual_value is not None,
             'metrics_type': 'in-sample',
@@ -377,6 +586,9 @@ class PredictionService:
             'data_training_sampai': end_date_result,
             'jumlah_data_training': len(historical),
             'nilai_aktual': Decimal(str(actual_value)) if actual_value is not None else None,
+            'interval': interval,
+            'speed': info.get('speed', speed),
+            'fit_time_ms': info.get('fit_time_ms'),
             'info': info,
             'debug': debug_info
         }
@@ -391,7 +603,16 @@ class PredictionService:
                    alpha: Optional[float] = None,
                    beta: Optional[float] = None,
                    gamma: Optional[float] = None,
-                   optimize: bool = True) -> Dict:
+                   optimize: bool = True,
+                   parallel: bool = False,
+                   warm_start: bool = False,
+                   extra_steps: int = 0,
+                   historical: Optional[List[Dict]] = None,
+                   actual_value=UNSET,
+                   deadline: Optional[float] = None,
+                   speed: str = DEFAULT_SPEED,
+                   interval_paths: int = INTERVAL_PATHS,
+                   interval_quantiles: Sequence[float] = INTERVAL_QUANTILES) -> Dict:
         """
         Melakukan prediksi menggunakan Triple Exponential Smoothing
         
@@ -404,6 +625,18 @@ class PredictionService:
             beta: Parameter beta (None = akan dioptimasi)
             gamma: Parameter gamma (None = akan dioptimasi)
             optimize: Optimasi parameter
+            parallel: Evaluasi konfigurasi TES secara bersamaan di process pool
+            warm_start: Mulai optimasi dari parameter HasilPrediksi terbaru
+                        (fallback ke cold start jika hasilnya lebih buruk)
+            extra_steps: Langkah forecast tambahan setelah target
+                         (tersedia di info['future_forecasts'])
+            historical: Data historis yang sudah dimuat (None = ambil dari database)
+            actual_value: Nilai aktual yang sudah dimuat (default: ambil dari database)
+            deadline: Batas waktu (time.perf_counter) untuk fitting konfigurasi TES
+                      (lihat TripleExponentialSmoothing.predict)
+            speed: Preset optimizer ('fast', 'balanced', 'accurate')
+            interval_paths: Jumlah path simulasi prediction interval (0 = tanpa interval)
+            interval_quantiles: Kuantil prediction interval (default: 2.5% dan 97.5%)
         
         Returns:
             Dictionary dengan hasil prediksi
@@ -417,26 +650,53 @@ class PredictionService:
                 end_date = date(tahun_prediksi, bulan_prediksi - 1, 1)
         
         min_periods = 2 * seasonal_periods
-        historical = PredictionService.get_historical_data(
-            jenis_kendaraan_id=jenis_kendaraan_id,
-            end_date=end_date,
-            min_periods=min_periods
-        )
+        if historical is None:
+            historical = PredictionService.get_historical_data(
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                end_date=end_date,
+                min_periods=min_periods
+            )
+        else:
+            PredictionService._check_min_periods(historical, min_periods)
         values = [d['total_pendapatan'] for d in historical]
         
         # Hitung berapa langkah ke depan
         steps = PredictionService._calculate_steps(historical, tahun_prediksi, bulan_prediksi)
+        horizon = steps + extra_steps
+        
+        warm_params = None
+        if warm_start and optimize:
+            warm_params = PredictionService.get_warm_start(
+                'TES', jenis_kendaraan_id, seasonal_periods
+            )
         
-        # Calculate prediction
-        prediction, alpha_opt, beta_opt, gamma_opt, info = TripleExponentialSmoothing.predict(
-            values,
+        # Calculate prediction (pakai cache jika series tidak berubah)
+        info = PredictionService._fit_cached(
+            'TES', values, horizon,
+            fit=lambda: TripleExponentialSmoothing.predict(
+                values,
+                seasonal_periods=seasonal_periods,
+                alpha=alpha,
+                beta=beta,
+                gamma=gamma,
+                optimize=optimize,
+                steps=horizon,
+                parallel=parallel,
+                warm_start=warm_params,
+                deadline=deadline,
+                speed=speed
+            )[-1],
             seasonal_periods=seasonal_periods,
-            alpha=alpha,
-            beta=beta,
-            gamma=gamma,
-            optimize=optimize,
-            steps=steps
+            params={
+                'alpha': alpha, 'beta': beta, 'gamma': gamma, 'optimize': optimize, 'speed': speed,
+                # Hasil warm start bergantung pada titik awal, jangan tertukar dengan cold start
+                'warm_start': warm_params,
+            }
         )
+        alpha_opt = info['alpha']
+        beta_opt = info['beta']
+        gamma_opt = info['gamma']
+        prediction = info['future_forecasts'][0]
         
         # Ambil prediksi untuk langkah terakhir (target)
         if info.get('future_forecasts') and len(info['future_forecasts']) >= steps:
@@ -451,11 +711,16 @@ class PredictionService:
         else:
             metrics = {'mape': 0.0, 'mae': 0.0, 'rmse': 0.0}
         
-        # Cek apakah ada nilai aktual untuk periode yang diprediksi (untuk validasi)
-        actual_value = PredictionService.get_actual_value(
-            tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+        interval = PredictionService._prediction_interval(
+            values, info, skip, steps, interval_paths, interval_quantiles
         )
         
+        # Cek apakah ada nilai aktual untuk periode yang diprediksi (untuk validasi)
+        if actual_value is UNSET:
+            actual_value = PredictionService.get_actual_value(
+                tahun_prediksi, bulan_prediksi, jenis_kendaraan_id
+            )
+        
         debug_info = {
             'actual_value_found': actual_value is not None,
             'metrics_type': 'in-sample',
@@ -487,16 +752,170 @@ class PredictionService:
             'data_training_sampai': end_date_result,
             'jumlah_data_training': len(historical),
             'nilai_aktual': Decimal(str(actual_value)) if actual_value is not None else None,
+            'interval': interval,
+            'speed': info.get('speed', speed),
+            'fit_time_ms': info.get('fit_time_ms'),
             'info': info,
             'debug': debug_info
         }
         
         return result
     
+    @staticmethod
+    def predict_range(metode_list: List[str],
+                      tahun_mulai: int,
+                      bulan_mulai: int,
+                      tahun_akhir: int,
+                      bulan_akhir: int,
+                      jenis_kendaraan_id: Optional[int] = None,
+                      seasonal_periods: int = 12,
+                      optimize: bool = True,
+                      parallel: bool = False,
+                      historical: Optional[List[Dict]] = None,
+                      actual_values: Optional[Dict[Tuple[int, int], float]] = None,
+                      interval_paths: int = INTERVAL_PATHS,
+                      interval_quantiles: Sequence[float] = INTERVAL_QUANTILES) -> Dict:
+        """
+        Prediksi untuk rentang periode dengan satu kali fitting per metode
+        
+        Data training berakhir sebelum periode awal (sama seperti prediksi
+        per bulan untuk periode awal), lalu seluruh bulan dalam rentang diambil
+        dari forecast multi-step model yang sama. Prediction interval setiap
+        bulan diambil dari satu simulasi path sepanjang rentang.
+        
+        Args:
+            metode_list: List metode ('SES', 'DES', 'TES')
+            tahun_mulai: Tahun awal rentang
+            bulan_mulai: Bulan awal rentang
+            tahun_akhir: Tahun akhir rentang
+            bulan_akhir: Bulan akhir rentang
+            jenis_kendaraan_id: ID jenis kendaraan (None = semua)
+            seasonal_periods: Periode musiman untuk TES
+            optimize: Optimasi parameter
+            parallel: Evaluasi konfigurasi TES secara bersamaan di process pool
+            historical: Data historis yang sudah dimuat (None = ambil dari database)
+            actual_values: Nilai aktual {(tahun, bulan): nilai} yang sudah dimuat
+                           (None = ambil dari database)
+            interval_paths: Jumlah path simulasi prediction interval (0 = tanpa interval)
+            interval_quantiles: Kuantil prediction interval
+        
+        Returns:
+            Dictionary {metode: hasil}, hasil berisi parameter, metrik, dan
+            list 'prediksi' per bulan dengan 'interval' masing-masing
+            (atau 'error' jika metode gagal)
+        """
+        n_months = (tahun_akhir - tahun_mulai) * 12 + (bulan_akhir - bulan_mulai) + 1
+        if n_months < 1:
+            raise ValueError("Periode akhir harus sama atau setelah periode awal")
+        
+        periods = []
+        for i in range(n_months):
+            offset = bulan_mulai - 1 + i
+            periods.append((tahun_mulai + offset // 12, offset % 12 + 1))
+        extra_steps = n_months - 1
+        
+        if actual_values is None:
+            actual_values = PredictionService.get_actual_values(
+                tahun_mulai, bulan_mulai, tahun_akhir, bulan_akhir, jenis_kendaraan_id
+            )
+        if bulan_mulai == 1:
+            end_date = date(tahun_mulai - 1, 12, 1)
+        else:
+            end_date = date(tahun_mulai, bulan_mulai - 1, 1)
+        # Minimal periode training per metode (sama seperti predict_*)
+        min_periods = {'SES': 12, 'DES': 3, 'TES': 2 * seasonal_periods}
+        
+        results = {}
+        for metode in metode_list:
+            try:
+                # Data training dimuat di sini karena residualnya dipakai untuk interval
+                method_historical = historical
+                if method_historical is None:
+                    method_historical = PredictionService.get_historical_data(
+                        jenis_kendaraan_id=jenis_kendaraan_id,
+                        end_date=end_date,
+                        min_periods=min_periods.get(metode, 12)
+                    )
+                # Interval dihitung sekali untuk seluruh rentang (di bawah)
+                preloaded = {
+                    'historical': method_historical,
+                    'actual_value': actual_values.get((tahun_mulai, bulan_mulai)),
+                    'interval_paths': 0,
+                }
+                
+                if metode == 'SES':
+                    result = PredictionService.predict_ses(
+                        jenis_kendaraan_id=jenis_kendaraan_id,
+                        tahun_prediksi=tahun_mulai,
+                        bulan_prediksi=bulan_mulai,
+                        optimize=optimize,
+                        extra_steps=extra_steps,
+                        **preloaded
+                    )
+                elif metode == 'DES':
+                    result = PredictionService.predict_des(
+                        jenis_kendaraan_id=jenis_kendaraan_id,
+                        tahun_prediksi=tahun_mulai,
+                        bulan_prediksi=bulan_mulai,
+                        optimize=optimize,
+                        extra_steps=extra_steps,
+                        **preloaded
+                    )
+                elif metode == 'TES':
+                    result = PredictionService.predict_tes(
+                        jenis_kendaraan_id=jenis_kendaraan_id,
+                        tahun_prediksi=tahun_mulai,
+                        bulan_prediksi=bulan_mulai,
+                        seasonal_periods=seasonal_periods,
+                        optimize=optimize,
+                        parallel=parallel,
+                        extra_steps=extra_steps,
+                        **preloaded
+                    )
+                else:
+                    raise ValueError(f"Metode tidak dikenal: {metode}")
+            except Exception as e:
+                results[metode] = {'error': str(e)}
+                continue
+            
+            # Forecast periode awal ada di langkah (total steps - extra_steps)
+            info = result.pop('info')
+            result.pop('debug', None)
+            result.pop('interval', None)
+            first_step = info['steps'] - extra_steps
+            forecasts = info['future_forecasts'][first_step - 1:first_step - 1 + n_months]
+            
+            values = [d['total_pendapatan'] for d in method_historical]
+            skip = seasonal_periods if metode == 'TES' else 1
+            intervals = PredictionService._prediction_intervals(
+                values, info, skip, info['steps'], interval_paths, interval_quantiles
+            )
+            
+            prediksi = []
+            for i, ((tahun, bulan), nilai) in enumerate(zip(periods, forecasts)):
+                actual_value = actual_values.get((tahun, bulan))
+                prediksi.append({
+                    'tahun_prediksi': tahun,
+                    'bulan_prediksi': bulan,
+                    'nilai_prediksi': Decimal(str(nilai)),
+                    'nilai_aktual': Decimal(str(actual_value)) if actual_value is not None else None,
+                    'interval': intervals[first_step - 1 + i] if intervals else None,
+                })
+            
+            result.pop('nilai_prediksi', None)
+            result.pop('nilai_aktual', None)
+            if info.get('best_config'):
+                result['best_config'] = info['best_config']
+            result['prediksi'] = prediksi
+            results[metode] = result
+        
+        return results
+    
     @staticmethod
     def compare_methods(jenis_kendaraan_id: Optional[int] = None,
                        tahun_prediksi: int = None,
-                       bulan_prediksi: int = None) -> Dict:
+                       bulan_prediksi: int = None,
+                       budget_ms: Optional[int] = None) -> Dict:
         """
         Membandingkan ketiga metode (SES, DES, TES) dan return yang terbaik
         
@@ -504,10 +923,29 @@ class PredictionService:
             jenis_kendaraan_id: ID jenis kendaraan (None = semua)
             tahun_prediksi: Tahun yang akan diprediksi
             bulan_prediksi: Bulan yang akan diprediksi
+            budget_ms: Batas waktu (milidetik); jika diisi memakai CompareService.auto_select
         
         Returns:
             Dictionary dengan hasil semua metode dan rekomendasi metode terbaik
         """
+        if budget_ms is not None:
+            from crud.services.compare_service import CompareService
+            
+            results, _, auto = CompareService.auto_select(
+                tahun_prediksi, bulan_prediksi,
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                budget_ms=budget_ms
+            )
+            best_method = auto['best_method']
+            return {
+                'results': results,
+                'best_method': best_method,
+                'best_mape': auto['best_mape'],
+                'recommendation': f"Metode terbaik: {best_method} dengan MAPE {auto['best_mape']:.2f}%" if best_method else "Tidak dapat menentukan metode terbaik",
+                'partial': auto['partial'],
+                'auto': auto,
+            }
+        
         results = {}
         
         # SES
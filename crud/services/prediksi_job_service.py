@@ -0,0 +1,272 @@
+"""
+Service untuk antrian job prediksi (tanpa broker eksternal)
+
+Job disimpan di tabel PrediksiJob. Worker lokal (manage.py run_prediksi_worker)
+mengambil job PENDING dengan SELECT ... FOR UPDATE SKIP LOCKED, menjalankannya
+di process pool, lalu menulis hasil ke HasilPrediksi.
+"""
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from crud.models import HasilPrediksi, JenisKendaraan, PrediksiJob
+from crud.services.exponential_smoothing import DEFAULT_SPEED, SPEED_PRESETS
+from crud.services.hybrid_prediction_service import HybridPredictionService
+from crud.services.prediction_service import PredictionService
+
+
+class PrediksiJobService:
+    """
+    Service untuk submit, claim, dan eksekusi PrediksiJob
+    """
+
+    # Job RUNNING lebih lama dari ini dianggap worker-nya mati dan diantrikan ulang
+    STALE_AFTER = timedelta(minutes=30)
+    MAX_ATTEMPTS = 3
+
+    @staticmethod
+    def validate(tipe: str, parameter: Dict) -> Optional[str]:
+        """
+        Validasi parameter job sebelum disimpan
+
+        Returns:
+            Pesan error, atau None jika valid
+        """
+        if tipe not in dict(PrediksiJob.TIPE_CHOICES):
+            return 'Tipe job harus salah satu dari: PREDIKSI, HYBRID'
+
+        if not parameter.get('tahun_prediksi') or not parameter.get('bulan_prediksi'):
+            return 'Tahun dan bulan prediksi harus diisi'
+
+        if tipe == 'PREDIKSI' and str(parameter.get('metode', 'SES')).upper() not in ['SES', 'DES', 'TES']:
+            return 'Metode harus salah satu dari: SES, DES, TES'
+
+        if parameter.get('speed', DEFAULT_SPEED) not in SPEED_PRESETS:
+            return 'Speed harus salah satu dari: ' + ', '.join(SPEED_PRESETS)
+
+        jenis_kendaraan_id = parameter.get('jenis_kendaraan_id')
+        if jenis_kendaraan_id and not JenisKendaraan.objects.filter(pk=jenis_kendaraan_id).exists():
+            return 'Jenis kendaraan tidak ditemukan'
+
+        return None
+
+    @staticmethod
+    def submit(tipe: str, parameter: Dict, user=None) -> PrediksiJob:
+        """
+        Menyimpan job baru dengan status PENDING
+        """
+        return PrediksiJob.objects.create(
+            tipe=tipe,
+            parameter=parameter,
+            dibuat_oleh=user if user is not None and user.is_authenticated else None
+        )
+
+    @staticmethod
+    def claim(limit: int, worker: str) -> List[int]:
+        """
+        Mengambil hingga `limit` job PENDING (terlama dulu) dan menandainya RUNNING
+
+        Baris yang sedang dikunci worker lain dilewati (SKIP LOCKED), sehingga
+        beberapa worker bisa berjalan bersamaan tanpa mengambil job yang sama.
+
+        Returns:
+            List ID job yang berhasil di-claim
+        """
+        if limit < 1:
+            return []
+
+        with transaction.atomic():
+            ids = list(
+                PrediksiJob.objects.select_for_update(skip_locked=True)
+                .filter(status='PENDING')
+                .order_by('created_at')
+                .values_list('id', flat=True)[:limit]
+            )
+            if ids:
+                PrediksiJob.objects.filter(id__in=ids).update(
+                    status='RUNNING',
+                    worker=worker,
+                    started_at=timezone.now(),
+                    percobaan=F('percobaan') + 1
+                )
+        return ids
+
+    @staticmethod
+    def requeue_stale() -> int:
+        """
+        Mengembalikan job RUNNING yang macet (worker mati) ke antrian
+
+        Returns:
+            Jumlah job yang diantrikan ulang
+        """
+        stale = PrediksiJob.objects.filter(
+            status='RUNNING',
+            started_at__lt=timezone.now() - PrediksiJobService.STALE_AFTER
+        )
+        failed = stale.filter(percobaan__gte=PrediksiJobService.MAX_ATTEMPTS).update(
+            status='FAILED',
+            pesan_error='Worker berhenti sebelum job selesai',
+            finished_at=timezone.now()
+        )
+        requeued = stale.filter(percobaan__lt=PrediksiJobService.MAX_ATTEMPTS).update(status='PENDING')
+        return failed + requeued
+
+    @staticmethod
+    def release(job_id: int, error: str):
+        """
+        Mengembalikan job yang gagal karena masalah worker (bukan karena datanya)
+        ke antrian, atau menandainya FAILED jika percobaan sudah habis
+        """
+        job = PrediksiJob.objects.filter(pk=job_id, status='RUNNING').first()
+        if job is None:
+            return
+
+        if job.percobaan >= PrediksiJobService.MAX_ATTEMPTS:
+            job.status = 'FAILED'
+            job.pesan_error = error
+            job.finished_at = timezone.now()
+        else:
+            job.status = 'PENDING'
+        job.save(update_fields=['status', 'pesan_error', 'finished_at'])
+
+    @staticmethod
+    def execute(tipe: str, parameter: Dict) -> Tuple[HasilPrediksi, Dict]:
+        """
+        Menjalankan prediksi sesuai parameter job dan menyimpan ke HasilPrediksi
+
+        Returns:
+            Tuple: (HasilPrediksi yang tersimpan, ringkasan hasil untuk PrediksiJob.hasil)
+        """
+        jenis_kendaraan_id = parameter.get('jenis_kendaraan_id') or None
+        tahun_prediksi = int(parameter['tahun_prediksi'])
+        bulan_prediksi = int(parameter['bulan_prediksi'])
+        speed = parameter.get('speed', DEFAULT_SPEED)
+
+        if tipe == 'HYBRID':
+            selected_scenario = parameter.get('selected_scenario', 'base')
+            if selected_scenario not in HybridPredictionService.SCENARIOS:
+                selected_scenario = 'base'
+
+            result = HybridPredictionService.predict_hybrid(
+                tahun_prediksi=tahun_prediksi,
+                bulan_prediksi=bulan_prediksi,
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                training_periods=int(parameter.get('training_periods', 24)),
+                selected_scenario=selected_scenario,
+                return_details=True,
+                speed=speed
+            )
+            metode = f'HYBRID_{selected_scenario.upper()}'
+            params = result['tes_parameters']
+            seasonal_periods = 12
+        else:
+            metode = str(parameter.get('metode', 'SES')).upper()
+            alpha = parameter.get('alpha')
+            beta = parameter.get('beta')
+            gamma = parameter.get('gamma')
+            optimize = parameter.get('optimize', True)
+
+            if metode == 'SES':
+                result = PredictionService.predict_ses(
+                    jenis_kendaraan_id=jenis_kendaraan_id,
+                    tahun_prediksi=tahun_prediksi,
+                    bulan_prediksi=bulan_prediksi,
+                    alpha=float(alpha) if alpha else None,
+                    optimize=optimize,
+                    speed=speed
+                )
+            elif metode == 'DES':
+                result = PredictionService.predict_des(
+                    jenis_kendaraan_id=jenis_kendaraan_id,
+                    tahun_prediksi=tahun_prediksi,
+                    bulan_prediksi=bulan_prediksi,
+                    alpha=float(alpha) if alpha else None,
+                    beta=float(beta) if beta else None,
+                    optimize=optimize,
+                    speed=speed
+                )
+            else:  # TES
+                result = PredictionService.predict_tes(
+                    jenis_kendaraan_id=jenis_kendaraan_id,
+                    tahun_prediksi=tahun_prediksi,
+                    bulan_prediksi=bulan_prediksi,
+                    seasonal_periods=int(parameter.get('seasonal_periods', 12)),
+                    alpha=float(alpha) if alpha else None,
+                    beta=float(beta) if beta else None,
+                    gamma=float(gamma) if gamma else None,
+                    optimize=optimize,
+                    warm_start=parameter.get('warm_start', False),
+                    speed=speed
+                )
+            params = result
+            seasonal_periods = result.get('seasonal_periods') or 12
+
+        hasil_prediksi = HasilPrediksi.objects.create(
+            jenis_kendaraan_id=jenis_kendaraan_id,
+            tahun_prediksi=tahun_prediksi,
+            bulan_prediksi=bulan_prediksi,
+            metode=metode,
+            nilai_prediksi=result['nilai_prediksi'],
+            alpha=params.get('alpha'),
+            beta=params.get('beta'),
+            gamma=params.get('gamma'),
+            seasonal_periods=seasonal_periods,
+            mape=result.get('mape'),
+            mae=result.get('mae'),
+            rmse=result.get('rmse'),
+            nilai_aktual=result.get('nilai_aktual'),
+            data_training_dari=result['data_training_dari'],
+            data_training_sampai=result['data_training_sampai'],
+            jumlah_data_training=result['jumlah_data_training'],
+            keterangan=parameter.get('keterangan') or result.get('keterangan', '')
+        )
+
+        def _float(value):
+            return float(value) if value is not None else None
+
+        summary = {
+            'hasil_prediksi_id': hasil_prediksi.id,
+            'metode': metode,
+            'nilai_prediksi': _float(result['nilai_prediksi']),
+            'nilai_aktual': _float(result.get('nilai_aktual')),
+            'alpha': _float(params.get('alpha')),
+            'beta': _float(params.get('beta')),
+            'gamma': _float(params.get('gamma')),
+            'mape': _float(result.get('mape')),
+            'mae': _float(result.get('mae')),
+            'rmse': _float(result.get('rmse')),
+        }
+        return hasil_prediksi, summary
+
+
+def run_job(job_id: int) -> str:
+    """
+    Menjalankan satu PrediksiJob (dipanggil di process pool worker)
+
+    Didefinisikan di level modul agar bisa dikirim ke process pool. Koneksi
+    database ditutup setelah selesai supaya proses worker yang berumur
+    panjang tidak menyimpan koneksi idle.
+
+    Returns:
+        Status akhir job
+    """
+    try:
+        job = PrediksiJob.objects.get(pk=job_id)
+        try:
+            hasil_prediksi, summary = PrediksiJobService.execute(job.tipe, job.parameter)
+        except Exception as e:
+            job.status = 'FAILED'
+            job.pesan_error = str(e)
+        else:
+            job.status = 'SUCCESS'
+            job.hasil_prediksi = hasil_prediksi
+            job.hasil = summary
+            job.pesan_error = None
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'hasil_prediksi', 'hasil', 'pesan_error', 'finished_at'])
+        return job.status
+    finally:
+        connections.close_all()
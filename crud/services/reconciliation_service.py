@@ -0,0 +1,230 @@
+"""
+Service rekonsiliasi forecast hierarki: global (jenis_kendaraan=NULL) = SUM per-jenis
+
+Series global dan semua series per-jenis dimuat sekaligus (SeriesStore) dan di-fit
+bersamaan dengan TripleExponentialSmoothing.predict_many (satu rekursi 2-D per
+panjang series). Setiap node di-fit pada datanya sendiri seperti prediksi/generate
+(bulan sebelum data pertama suatu jenis tidak ikut di-fit), sehingga base forecast
+berada dalam TripleExponentialSmoothing.BATCH_TOLERANCE dari PredictionService.predict_tes.
+Base forecast yang independen tidak saling menjumlah, sehingga direkonsiliasi
+dengan satu operasi matriks
+
+    y_tilde = S @ G @ y_hat
+
+dengan S matriks penjumlahan (baris pertama global, sisanya per-jenis) dan G
+proyeksi ke level per-jenis:
+
+- bottom_up: G mengambil base forecast per-jenis apa adanya
+- ols:       G = (S'S)^-1 S'
+- mint_wls:  G = (S'W^-1 S)^-1 S'W^-1, W = diag(varians residual in-sample)
+             (MinT dengan estimator diagonal)
+
+Hasilnya koheren: prediksi global selalu sama dengan jumlah prediksi per-jenis.
+"""
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from crud.services.backtest_service import BacktestService
+from crud.services.exponential_smoothing import TripleExponentialSmoothing
+from crud.services.prediction_service import PredictionService
+
+
+class ReconciliationService:
+    """
+    Forecast seluruh hierarki jenis kendaraan dalam satu batch lalu direkonsiliasi
+    """
+
+    METHODS = ('bottom_up', 'ols', 'mint_wls')
+    DEFAULT_METHOD = 'mint_wls'
+    MAX_HORIZON = 12
+
+    @staticmethod
+    def node_series(series: Dict[Hashable, List[Dict]]) -> Tuple[List[Optional[int]], Dict[Hashable, List[Dict]]]:
+        """
+        Menyusun data training setiap node hierarki
+
+        Setiap node memakai datanya sendiri apa adanya (sama seperti data yang
+        dipakai prediksi/generate untuk jenis tersebut), tanpa mengisi 0 bulan
+        sebelum data pertamanya. Jika series global tidak ada, nilainya disusun
+        dari jumlah per-jenis setiap periode.
+
+        Args:
+            series: Hasil BacktestService.load_series {jenis_id (None = global): list data}
+
+        Returns:
+            Tuple (keys, data) dengan keys[0] = None (global) dan
+            data {key: list {tahun, bulan, total_pendapatan}}
+        """
+        bottom_keys = sorted(key for key in series if key is not None)
+        if not bottom_keys:
+            raise ValueError('Data agregat per jenis kendaraan tidak ditemukan')
+
+        keys = [None] + bottom_keys
+        data = {key: list(series[key]) for key in bottom_keys}
+        data[None] = list(series.get(None) or [])
+        if not data[None]:
+            totals = {}
+            for key in bottom_keys:
+                for d in series[key]:
+                    period = (d['tahun'], d['bulan'])
+                    totals[period] = totals.get(period, 0.0) + d['total_pendapatan']
+            data[None] = [
+                {'tahun': tahun, 'bulan': bulan, 'total_pendapatan': total}
+                for (tahun, bulan), total in sorted(totals.items())
+            ]
+        return keys, data
+
+    @staticmethod
+    def summing_matrix(n_bottom: int) -> np.ndarray:
+        """
+        Matriks S: baris pertama global (jumlah semua jenis), sisanya identitas per-jenis
+        """
+        return np.vstack([np.ones((1, n_bottom)), np.eye(n_bottom)])
+
+    @staticmethod
+    def projection_matrix(n_bottom: int, method: str = DEFAULT_METHOD,
+                          residual_var: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Matriks G (jumlah jenis x jumlah node) yang memetakan base forecast ke level per-jenis
+
+        Args:
+            n_bottom: Jumlah series per-jenis
+            method: 'bottom_up', 'ols', atau 'mint_wls'
+            residual_var: Varians residual in-sample per node (wajib untuk mint_wls)
+        """
+        if method not in ReconciliationService.METHODS:
+            raise ValueError('Metode rekonsiliasi harus salah satu dari: ' + ', '.join(ReconciliationService.METHODS))
+
+        if method == 'bottom_up':
+            return np.hstack([np.zeros((n_bottom, 1)), np.eye(n_bottom)])
+
+        S = ReconciliationService.summing_matrix(n_bottom)
+        if method == 'ols':
+            weights = np.ones(n_bottom + 1)
+        else:
+            if residual_var is None:
+                raise ValueError('Varians residual diperlukan untuk mint_wls')
+            var = np.asarray(residual_var, dtype=float)
+            # Varians nol/tidak valid (series konstan) diganti varians positif terkecil
+            valid = np.isfinite(var) & (var > 0)
+            floor = var[valid].min() if valid.any() else 1.0
+            weights = 1.0 / np.where(valid, var, floor)
+
+        StW = S.T * weights
+        return np.linalg.solve(StW @ S, StW)
+
+    @staticmethod
+    def reconcile(base: np.ndarray, method: str = DEFAULT_METHOD,
+                  residual_var: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rekonsiliasi base forecast (node x langkah) menjadi forecast koheren
+
+        Prediksi per-jenis negatif dibatasi 0 sebelum dijumlahkan ulang dengan S,
+        sehingga hasil tetap koheren.
+        """
+        n_bottom = base.shape[0] - 1
+        G = ReconciliationService.projection_matrix(n_bottom, method, residual_var)
+        bottom = np.maximum(G @ base, 0.0)
+        return ReconciliationService.summing_matrix(n_bottom) @ bottom
+
+    @staticmethod
+    def predict_hierarchy(tahun_prediksi: int, bulan_prediksi: int,
+                          horizon: int = 1,
+                          method: str = DEFAULT_METHOD,
+                          seasonal_periods: int = 12) -> Dict:
+        """
+        Prediksi TES koheren untuk global dan semua jenis kendaraan
+
+        Args:
+            tahun_prediksi: Tahun periode pertama yang diprediksi
+            bulan_prediksi: Bulan periode pertama yang diprediksi
+            horizon: Jumlah bulan yang diprediksi mulai dari periode target
+            method: Metode rekonsiliasi ('bottom_up', 'ols', 'mint_wls')
+            seasonal_periods: Periode musiman TES
+
+        Returns:
+            Dictionary dengan keys: periods, nodes (base & rekonsiliasi per series),
+            incoherence (selisih global - jumlah per-jenis pada base forecast), info
+
+        Raises:
+            ValueError: Jika ada node dengan data kurang dari 2 x seasonal_periods
+        """
+        if method not in ReconciliationService.METHODS:
+            raise ValueError('Metode rekonsiliasi harus salah satu dari: ' + ', '.join(ReconciliationService.METHODS))
+        if not 1 <= horizon <= ReconciliationService.MAX_HORIZON:
+            raise ValueError(f'Horizon harus 1-{ReconciliationService.MAX_HORIZON}')
+
+        target_periods = []
+        tahun, bulan = tahun_prediksi, bulan_prediksi
+        for _ in range(horizon):
+            target_periods.append((tahun, bulan))
+            tahun, bulan = (tahun + 1, 1) if bulan == 12 else (tahun, bulan + 1)
+
+        # Semua series sampai periode target terakhir dimuat sekaligus;
+        # data training hanya sampai bulan sebelum target (mencegah data leakage)
+        loaded = BacktestService.load_series(
+            tahun_akhir=target_periods[-1][0], bulan_akhir=target_periods[-1][1]
+        )
+        series, actuals = {}, {}
+        for key, rows in loaded.items():
+            series[key] = [d for d in rows if (d['tahun'], d['bulan']) < target_periods[0]]
+            actuals[key] = {
+                (d['tahun'], d['bulan']): d['total_pendapatan']
+                for d in rows if (d['tahun'], d['bulan']) >= target_periods[0]
+            }
+        keys, data = ReconciliationService.node_series(series)
+
+        min_periods = 2 * seasonal_periods
+        short = [key for key in keys if len(data[key]) < min_periods]
+        if short:
+            names = ', '.join('global' if key is None else f'jenis {key}' for key in short)
+            raise ValueError(f"Data historis minimal {min_periods} periode untuk TES ({names})")
+
+        # Langkah dihitung dari data terakhir masing-masing node (seperti predict_tes)
+        offsets = {
+            key: PredictionService._calculate_steps(data[key], tahun_prediksi, bulan_prediksi) - 1
+            for key in keys
+        }
+        steps = max(offsets.values()) + horizon
+
+        # Base forecast semua node dalam satu batch
+        values = {key: [d['total_pendapatan'] for d in data[key]] for key in keys}
+        fits = TripleExponentialSmoothing.predict_many(
+            values, seasonal_periods=seasonal_periods, steps=steps
+        )
+        base = np.array([
+            fits[key][4]['future_forecasts'][offsets[key]:offsets[key] + horizon] for key in keys
+        ])
+        residual_var = np.array([
+            np.mean((np.array(values[key]) - np.array(fits[key][4]['forecast_values']))[seasonal_periods:] ** 2)
+            for key in keys
+        ])
+
+        reconciled = ReconciliationService.reconcile(base, method, residual_var)
+
+        nodes = []
+        for row, key in enumerate(keys):
+            actual_map = actuals.get(key, {})
+            nodes.append({
+                'jenis_kendaraan_id': key,
+                'best_config': fits[key][4]['best_config'],
+                'jumlah_data_training': len(data[key]),
+                'prediksi_base': [float(v) for v in base[row]],
+                'prediksi': [float(v) for v in reconciled[row]],
+                'nilai_aktual': [actual_map.get(period) for period in target_periods],
+            })
+
+        return {
+            'periods': [{'tahun': tahun, 'bulan': bulan} for tahun, bulan in target_periods],
+            'nodes': nodes,
+            'incoherence': [float(v) for v in base[0] - base[1:].sum(axis=0)],
+            'info': {
+                'method': method,
+                'engine': 'numpy-batch',
+                'series': len(keys),
+                'training_periods': max(len(rows) for rows in data.values()),
+                'seasonal_periods': seasonal_periods,
+                'tolerance': TripleExponentialSmoothing.BATCH_TOLERANCE,
+            },
+        }
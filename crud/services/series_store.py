@@ -0,0 +1,184 @@
+"""
+Store kolumnar in-process untuk series AgregatPendapatanBulanan
+
+Seluruh baris agregat dimuat sekali (satu query) menjadi array NumPy per
+jenis kendaraan: indeks periode (tahun * 12 + bulan - 1) dan total_pendapatan.
+Pengambilan data historis/nilai aktual cukup berupa slice array dengan
+np.searchsorted, tanpa query database.
+
+Store diberi versi AgregatVersion (token yang diganti setiap kali agregat
+ditulis dan di-commit). Jika token berubah, store dimuat ulang secara lazy
+pada pengambilan berikutnya.
+"""
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from crud.models import AgregatPendapatanBulanan
+from crud.services.model_cache import AgregatVersion
+
+
+def period_index(tahun: int, bulan: int) -> int:
+    """
+    Indeks periode bulanan (berurutan antar tahun)
+    """
+    return int(tahun) * 12 + int(bulan) - 1
+
+
+def _series_key(jenis_kendaraan_id) -> Optional[int]:
+    # ID dari query params/body bisa berupa string
+    return int(jenis_kendaraan_id) if jenis_kendaraan_id not in (None, '') else None
+
+
+def _slice(periods: np.ndarray, values: np.ndarray,
+           start: Optional[Tuple[int, int]], end: Optional[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    lo = np.searchsorted(periods, period_index(*start), 'left') if start else 0
+    hi = np.searchsorted(periods, period_index(*end), 'right') if end else len(periods)
+    return periods[lo:hi], values[lo:hi]
+
+
+class SeriesStore:
+    """
+    Array periode & nilai per jenis kendaraan (None = global) dengan reload lazy
+    """
+
+    _lock = threading.Lock()
+    _version: Optional[str] = None
+    _series: Dict[Hashable, Tuple[np.ndarray, np.ndarray]] = {}
+    _loads = 0
+
+    @staticmethod
+    def load() -> Dict[Hashable, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Memuat semua baris agregat dalam satu query
+
+        Returns:
+            Dictionary {jenis_kendaraan_id (None = global): (indeks periode, nilai)}
+        """
+        columns = defaultdict(lambda: ([], []))
+        rows = AgregatPendapatanBulanan.objects.order_by('tahun', 'bulan').values_list(
+            'jenis_kendaraan_id', 'tahun', 'bulan', 'total_pendapatan'
+        )
+        for jenis_id, tahun, bulan, total in rows:
+            periods, values = columns[jenis_id]
+            periods.append(period_index(tahun, bulan))
+            values.append(float(total))
+
+        return {
+            key: (np.array(periods, dtype=np.int64), np.array(values, dtype=float))
+            for key, (periods, values) in columns.items()
+        }
+
+    @staticmethod
+    def snapshot() -> Dict[Hashable, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Isi store untuk versi agregat saat ini (dimuat ulang jika versi berubah)
+        """
+        version = AgregatVersion.current()
+        if version == SeriesStore._version:
+            return SeriesStore._series
+
+        with SeriesStore._lock:
+            if version != SeriesStore._version:
+                # Versi dibaca sebelum load: perubahan selama load memicu reload berikutnya
+                SeriesStore._series = SeriesStore.load()
+                SeriesStore._version = version
+                SeriesStore._loads += 1
+            return SeriesStore._series
+
+    @staticmethod
+    def invalidate():
+        """
+        Membuang isi store di proses ini (dimuat ulang pada pengambilan berikutnya)
+        """
+        with SeriesStore._lock:
+            SeriesStore._version = None
+            SeriesStore._series = {}
+
+    @staticmethod
+    def get_series(jenis_kendaraan_id: Optional[int] = None,
+                   start: Optional[Tuple[int, int]] = None,
+                   end: Optional[Tuple[int, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Slice series untuk rentang periode (inklusif)
+
+        Args:
+            jenis_kendaraan_id: ID jenis kendaraan (None = global)
+            start: (tahun, bulan) awal (None = tidak dibatasi)
+            end: (tahun, bulan) akhir (None = tidak dibatasi)
+
+        Returns:
+            Tuple (indeks periode, nilai) berupa view array store
+        """
+        periods, values = SeriesStore.snapshot().get(
+            _series_key(jenis_kendaraan_id), (np.empty(0, dtype=np.int64), np.empty(0))
+        )
+        return _slice(periods, values, start, end)
+
+    @staticmethod
+    def last_period(jenis_kendaraan_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """
+        Periode agregat terbaru (tahun, bulan) untuk series, atau None jika belum ada
+        """
+        periods, _ = SeriesStore.get_series(jenis_kendaraan_id)
+        if not len(periods):
+            return None
+        period = int(periods[-1])
+        return period // 12, period % 12 + 1
+
+    @staticmethod
+    def get_historical_data(jenis_kendaraan_id: Optional[int] = None,
+                            start_date: Optional[date] = None,
+                            end_date: Optional[date] = None) -> List[Dict]:
+        """
+        Data historis dalam format PredictionService.get_historical_data
+
+        Returns:
+            List dictionary dengan keys: tahun, bulan, total_pendapatan, jenis_kendaraan_id
+        """
+        key = _series_key(jenis_kendaraan_id)
+        periods, values = SeriesStore.get_series(
+            key,
+            (start_date.year, start_date.month) if start_date else None,
+            (end_date.year, end_date.month) if end_date else None,
+        )
+        return [
+            {
+                'tahun': period // 12,
+                'bulan': period % 12 + 1,
+                'total_pendapatan': value,
+                'jenis_kendaraan_id': key,
+            }
+            for period, value in zip(periods.tolist(), values.tolist())
+        ]
+
+    @staticmethod
+    def get_values(jenis_kendaraan_id: Optional[int] = None,
+                   start: Optional[Tuple[int, int]] = None,
+                   end: Optional[Tuple[int, int]] = None) -> Dict[Tuple[int, int], float]:
+        """
+        Nilai per periode {(tahun, bulan): nilai} untuk rentang periode (inklusif)
+        """
+        periods, values = SeriesStore.get_series(jenis_kendaraan_id, start, end)
+        return {
+            (period // 12, period % 12 + 1): value
+            for period, value in zip(periods.tolist(), values.tolist())
+        }
+
+    @staticmethod
+    def series_by_key(end: Optional[Tuple[int, int]] = None) -> Dict[Hashable, List[Dict]]:
+        """
+        Semua series sampai periode `end` dalam format BacktestService.load_series
+        """
+        result = {}
+        for key, (periods, values) in SeriesStore.snapshot().items():
+            periods, values = _slice(periods, values, None, end)
+            if len(periods):
+                result[key] = [
+                    {'tahun': period // 12, 'bulan': period % 12 + 1, 'total_pendapatan': value}
+                    for period, value in zip(periods.tolist(), values.tolist())
+                ]
+        return result
@@ -0,0 +1,138 @@
+"""
+Process pool bersama untuk pekerjaan fitting model yang berat (CPU-bound)
+
+Pool dibuat sekali per proses (lazy) dan dipakai ulang antar request agar
+biaya membuat proses worker tidak dibayar pada setiap prediksi.
+
+Biaya proses: setiap proses yang memakai pool (setiap worker gunicorn) menahan
+sampai DEFAULT_MAX_WORKERS proses anak yang hidup sampai proses induk berhenti,
+ditambah satu proses forkserver. Dengan 4 worker gunicorn berarti sampai 20
+proses tambahan, masing-masing memuat Django, numpy, dan statsmodels.
+
+Start method:
+- 'forkserver' (default, untuk web): proses web menjalankan banyak thread,
+  sehingga fork langsung dari thread request berisiko deadlock (lock yang
+  sedang dipegang thread lain ikut tersalin) dan memicu DeprecationWarning di
+  Python 3.12+. Worker di-fork dari proses forkserver single-thread yang sudah
+  meng-import modul engine (EngineRegistry), lalu menjalankan django.setup().
+- 'fork' (management command single-thread): worker mewarisi semua modul yang
+  sudah di-load; koneksi database ditutup lebih dulu agar tidak ikut tersalin.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from django.db import connections
+
+from crud.services.engine_registry import EngineRegistry
+
+
+def _init_worker():
+    """
+    Initializer proses worker non-fork: setup Django dan load engine
+    (modul engine sudah di-import oleh forkserver, jadi preload hanya mengisi registry)
+    """
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    EngineRegistry.preload()
+
+
+class WorkerPool:
+    """
+    Pengelola ProcessPoolExecutor bersama dengan jumlah worker terbatas
+    """
+
+    DEFAULT_MAX_WORKERS = 4
+
+    # Start method pool; management command single-thread boleh memakai 'fork' (lihat configure)
+    START_METHOD = 'forkserver'
+
+    _executor = None
+    _max_workers = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def resolve_workers(max_workers: Optional[int] = None, tasks: Optional[int] = None) -> int:
+        """
+        Menentukan jumlah worker: dibatasi oleh DEFAULT_MAX_WORKERS/argumen,
+        jumlah CPU, dan jumlah task yang akan dijalankan
+        """
+        workers = max_workers or WorkerPool.DEFAULT_MAX_WORKERS
+        workers = min(workers, os.cpu_count() or 1)
+        if tasks is not None:
+            workers = min(workers, tasks)
+        return max(1, workers)
+
+    @staticmethod
+    def configure(start_method: str):
+        """
+        Mengganti start method pool (berlaku untuk pool yang dibuat berikutnya)
+
+        Args:
+            start_method: 'forkserver', 'fork', atau 'spawn'
+        """
+        with WorkerPool._lock:
+            WorkerPool.START_METHOD = start_method
+
+    @staticmethod
+    def _context():
+        """
+        Context multiprocessing sesuai START_METHOD (fallback ke default platform)
+        """
+        method = WorkerPool.START_METHOD
+        if method not in multiprocessing.get_all_start_methods():
+            return None
+        context = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            # Di-import sekali oleh proses forkserver, diwarisi semua worker
+            context.set_forkserver_preload(['django', *EngineRegistry.modules()])
+        return context
+
+    @staticmethod
+    def get(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """
+        Mengambil (atau membuat) process pool bersama
+
+        Args:
+            max_workers: Batas jumlah worker saat pool pertama kali dibuat
+                         (None = DEFAULT_MAX_WORKERS)
+
+        Returns:
+            ProcessPoolExecutor
+        """
+        workers = WorkerPool.resolve_workers(max_workers)
+        with WorkerPool._lock:
+            if WorkerPool._executor is None:
+                context = WorkerPool._context()
+                initializer = _init_worker
+                if context is not None and context.get_start_method() == 'fork':
+                    # Worker mewarisi modul yang sudah di-load (termasuk Django); engine
+                    # di-load sebelum fork dan koneksi database tidak boleh ikut tersalin
+                    EngineRegistry.preload()
+                    connections.close_all()
+                    initializer = None
+                WorkerPool._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=context, initializer=initializer
+                )
+                WorkerPool._max_workers = workers
+            return WorkerPool._executor
+
+    @staticmethod
+    def reset():
+        """
+        Membuang pool saat ini (misalnya setelah BrokenProcessPool)
+        """
+        with WorkerPool._lock:
+            if WorkerPool._executor is not None:
+                WorkerPool._executor.shutdown(wait=False, cancel_futures=True)
+            WorkerPool._executor = None
+            WorkerPool._max_workers = 0
+
+
+atexit.register(WorkerPool.reset)
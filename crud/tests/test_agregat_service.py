@@ -0,0 +1,188 @@
+"""
+Test pemeliharaan incremental agregat: hasilnya harus sama dengan agregasi penuh (query_groups)
+"""
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from crud.models import (
+    AgregatDirtyPeriod,
+    AgregatPendapatanBulanan,
+    JenisKendaraan,
+    KendaraanBermotor,
+    MapeBulanan,
+    MerekKendaraan,
+    TransaksiPajak,
+    TypeKendaraan,
+    WajibPajak,
+)
+from crud.services.agregat_service import AgregatService
+from crud.services.hybrid_prediction_service import HybridPredictionService
+from crud.services.mape_bulanan_service import MapeBulananService
+
+LOCMEM = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'prediksi': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-prediksi'},
+}
+
+
+@override_settings(CACHES=LOCMEM)
+class IncrementalAgregatTest(TestCase):
+    """Setiap perubahan TransaksiPajak/KendaraanBermotor menghasilkan agregat yang sama dengan rebuild"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.motor = JenisKendaraan.objects.create(nama='Motor', kategori='MOTOR')
+        cls.mobil = JenisKendaraan.objects.create(nama='Mobil', kategori='MOBIL')
+        type_kendaraan = TypeKendaraan.objects.create(
+            merek=MerekKendaraan.objects.create(nama='Honda'), nama='Beat'
+        )
+        wajib_pajak = WajibPajak.objects.create(nama='Budi', alamat='Jl. Merdeka')
+        cls.kendaraan = [
+            KendaraanBermotor.objects.create(
+                jenis=jenis, type_kendaraan=type_kendaraan, wajib_pajak=wajib_pajak,
+                no_polisi=f'B {i} XY', no_rangka=f'RANGKA{i}', no_mesin=f'MESIN{i}',
+                tahun_buat=2020, jml_cc=150, bbm='BENSIN'
+            )
+            for i, jenis in enumerate((cls.motor, cls.motor, cls.mobil))
+        ]
+
+    def setUp(self):
+        for alias in LOCMEM:
+            caches[alias].clear()
+
+    def _transaksi(self, kendaraan, tahun, bulan, pokok, denda=0):
+        return TransaksiPajak.objects.create(
+            kendaraan=kendaraan, tahun=tahun, bulan=bulan,
+            pokok_pkb=Decimal(pokok), denda_pkb=Decimal(denda), pokok_swdkllj=Decimal('35000'),
+            opsen_pokok_pkb=Decimal(pokok) / 2
+        )
+
+    def _seed(self):
+        motor_1, motor_2, mobil = self.kendaraan
+        return [
+            self._transaksi(motor_1, 2024, 1, '100000'),
+            self._transaksi(motor_1, 2024, 1, '50000', '5000'),
+            self._transaksi(motor_2, 2024, 1, '120000'),
+            self._transaksi(motor_2, 2024, 2, '120000'),
+            self._transaksi(mobil, 2024, 1, '900000', '10000'),
+            self._transaksi(mobil, 2024, 3, '900000'),
+        ]
+
+    def assertMatchesRebuild(self):
+        def as_dict(rows):
+            return {
+                (row['tahun'], row['bulan'], row['jenis_kendaraan_id']): tuple(
+                    Decimal(row[field]) for field in AgregatService.AGREGAT_FIELDS
+                )
+                for row in rows
+            }
+
+        groups = AgregatService.query_groups()
+        expected = as_dict(groups + [
+            {'tahun': r.tahun, 'bulan': r.bulan, 'jenis_kendaraan_id': None,
+             **{field: getattr(r, field) for field in AgregatService.AGREGAT_FIELDS}}
+            for r in AgregatService.global_records(groups)
+        ])
+        actual = as_dict(AgregatPendapatanBulanan.objects.values(
+            'tahun', 'bulan', 'jenis_kendaraan_id', *AgregatService.AGREGAT_FIELDS
+        ))
+        self.assertEqual(actual, expected)
+
+    def test_create(self):
+        self._seed()
+        self.assertMatchesRebuild()
+        self.assertEqual(
+            AgregatPendapatanBulanan.objects.filter(tahun=2024, bulan=1, jenis_kendaraan=None).count(), 1
+        )
+        # Selisih sudah diterapkan: periode tidak perlu di-rebuild
+        self.assertFalse(AgregatDirtyPeriod.objects.exists())
+
+    def test_update_amount(self):
+        transaksi = self._seed()[0]
+        transaksi.pokok_pkb = Decimal('175000')
+        transaksi.denda_pkb = Decimal('2500')
+        transaksi.save()
+        self.assertMatchesRebuild()
+
+    def test_update_period(self):
+        transaksi = self._seed()
+        # Satu-satunya transaksi 2024-03 pindah ke periode baru: baris lama ikut hilang
+        transaksi[5].tahun, transaksi[5].bulan = 2024, 4
+        transaksi[5].save()
+        transaksi[0].bulan = 2
+        transaksi[0].save()
+        self.assertMatchesRebuild()
+        self.assertFalse(AgregatPendapatanBulanan.objects.filter(tahun=2024, bulan=3).exists())
+
+    def test_update_kendaraan(self):
+        transaksi = self._seed()
+        # Pindah ke kendaraan lain dengan jenis sama (jumlah kendaraan berubah) dan beda jenis
+        transaksi[2].kendaraan = self.kendaraan[0]
+        transaksi[2].save()
+        transaksi[3].kendaraan = self.kendaraan[2]
+        transaksi[3].save()
+        self.assertMatchesRebuild()
+
+    def test_delete(self):
+        transaksi = self._seed()
+        transaksi[1].delete()
+        transaksi[3].delete()
+        self.assertMatchesRebuild()
+        self.assertFalse(AgregatPendapatanBulanan.objects.filter(tahun=2024, bulan=2).exists())
+
+    def test_kendaraan_jenis_change(self):
+        self._seed()
+        kendaraan = self.kendaraan[0]
+        kendaraan.jenis = self.mobil
+        kendaraan.save()
+        self.assertMatchesRebuild()
+
+        # Kendaraan terakhir jenis motor di 2024-02 pindah: grup motor periode itu hilang
+        kendaraan = self.kendaraan[1]
+        kendaraan.jenis = self.mobil
+        kendaraan.save()
+        self.assertMatchesRebuild()
+        self.assertFalse(AgregatPendapatanBulanan.objects.filter(jenis_kendaraan=self.motor).exists())
+
+    def test_kendaraan_jenis_change_deferred(self):
+        self._seed()
+        kendaraan = self.kendaraan[2]
+        with AgregatService.deferred() as periods:
+            kendaraan.jenis = self.motor
+            kendaraan.save()
+        self.assertEqual(periods, {(2024, 1), (2024, 3)})
+        self.assertEqual(set(AgregatService.dirty_periods()), periods)
+        AgregatService.rebuild_periods(periods)
+        self.assertMatchesRebuild()
+
+    def test_rebuild_periods_invalidates_mape(self):
+        self._seed()
+        motor_1, _, mobil = self.kendaraan
+        self._transaksi(motor_1, 2023, 1, '80000')
+        self._transaksi(mobil, 2023, 1, '700000')
+        self._transaksi(motor_1, 2023, 2, '90000')
+        MapeBulananService.rebuild()
+        before = set(MapeBulanan.objects.values_list('tahun', 'bulan', 'jenis_kendaraan_id', 'mape'))
+
+        with AgregatService.deferred() as periods:
+            self.kendaraan[2].jenis = self.motor
+            self.kendaraan[2].save()
+        AgregatService.rebuild_periods(periods)
+
+        # Hanya bulan yang di-rebuild yang diinvalidasi, bulan lain tidak disentuh
+        remaining = set(MapeBulanan.objects.values_list('tahun', 'bulan', 'jenis_kendaraan_id', 'mape'))
+        self.assertTrue(remaining)
+        self.assertEqual({row[1] for row in remaining}, {2})
+        self.assertLessEqual(remaining, before)
+
+        # Dibaca ulang on demand: sama dengan rebuild penuh
+        on_demand = {
+            (tahun, jenis_id): HybridPredictionService.get_monthly_mape(1, tahun, jenis_id)
+            for tahun in (2024, 2025) for jenis_id in (self.motor.id, self.mobil.id, None)
+        }
+        MapeBulananService.rebuild()
+        for (tahun, jenis_id), mape in on_demand.items():
+            self.assertEqual(MapeBulananService.get(tahun, 1, jenis_id)[1], mape)
+        self.assertIsNotNone(on_demand[(2025, None)])
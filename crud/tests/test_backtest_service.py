@@ -0,0 +1,94 @@
+"""
+Test backtest rolling-origin: dengan refit_every=1 setiap origin harus menilai model yang sama dengan predict_*
+"""
+import warnings
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from crud.services.backtest_service import BacktestService
+from crud.services.benchmark_service import BenchmarkService
+from crud.services.exponential_smoothing import (
+    DoubleExponentialSmoothing,
+    SimpleExponentialSmoothing,
+    TripleExponentialSmoothing,
+)
+from crud.services.holt_winters_engine import HoltWintersEngine
+
+
+class BacktestMatchesPredictTest(SimpleTestCase):
+    """Forecast per origin dalam BATCH_TOLERANCE dari predict_* pada data terpotong yang sama"""
+
+    LENGTH = 48
+    ORIGINS = 4
+    M = 12
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.batch = BenchmarkService.synthetic_series(cls.LENGTH, 3, seed=1)
+        series = {
+            i: [
+                {'tahun': 2020 + t // 12, 'bulan': t % 12 + 1, 'total_pendapatan': float(v)}
+                for t, v in enumerate(row)
+            ]
+            for i, row in enumerate(cls.batch)
+        }
+        cls.result = BacktestService.run(
+            series, origins=cls.ORIGINS, horizon=1, methods=('SES', 'DES', 'TES'), refit_every=1
+        )
+
+    def _cases(self):
+        for i, row in enumerate(self.batch):
+            for j, origin in enumerate(self.result['series'][i]['origins']):
+                yield i, row[:self.LENGTH - self.ORIGINS + j], origin['prediksi']
+
+    @staticmethod
+    def _sse(data, fitted, skip=0):
+        return float(np.sum((np.asarray(data) - np.asarray(fitted))[skip:] ** 2))
+
+    def _assert_within_tolerance(self, method, single, backtest, single_sse, engine_sse):
+        tolerance = TripleExponentialSmoothing.BATCH_TOLERANCE
+        if abs(backtest / single - 1) <= tolerance:
+            return True
+        # Di luar toleransi hanya jika fit engine lebih baik dari statsmodels
+        self.assertLess(engine_sse, single_sse, method)
+        return False
+
+    def test_smoothing_matches_predict(self):
+        within, total = 0, 0
+        for i, data, prediksi in self._cases():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                ses = SimpleExponentialSmoothing.predict(list(data))
+                des = DoubleExponentialSmoothing.predict(list(data))
+            for method, (prediction, info), trend in (
+                ('SES', (ses[0], ses[-1]), None), ('DES', (des[0], des[-1]), 'add')
+            ):
+                with self.subTest(series=i, n=len(data), method=method):
+                    engine = HoltWintersEngine.optimize(data[None], trend=trend, estimate_initial=True)
+                    within += self._assert_within_tolerance(
+                        method, prediction, prediksi[method],
+                        self._sse(data, info['forecast_values']), float(engine['sse'][0])
+                    )
+                    total += 1
+        self.assertGreaterEqual(within / total, 0.9)
+
+    def test_tes_matches_predict(self):
+        within, total = 0, 0
+        for i, data, prediksi in self._cases():
+            with self.subTest(series=i, n=len(data)):
+                many = TripleExponentialSmoothing.predict_many({0: list(data)}, self.M)[0]
+                # Backtest memakai fit yang sama dengan predict_many (selisih hanya numerik)
+                self.assertAlmostEqual(prediksi['TES'] / many[0], 1.0, places=3)
+
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    single = TripleExponentialSmoothing.predict(list(data), self.M)
+                within += self._assert_within_tolerance(
+                    'TES', single[0], prediksi['TES'],
+                    self._sse(data, single[-1]['forecast_values'], self.M),
+                    self._sse(data, many[4]['forecast_values'], self.M)
+                )
+                total += 1
+        self.assertGreaterEqual(within / total, 0.9)
@@ -0,0 +1,126 @@
+"""
+Test SES/DES/TES terhadap statsmodels: predict_many vs predict dan jalur parameter tetap
+"""
+import warnings
+
+import numpy as np
+from django.test import SimpleTestCase
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+from crud.services.benchmark_service import BenchmarkService
+from crud.services.exponential_smoothing import (
+    DoubleExponentialSmoothing,
+    SimpleExponentialSmoothing,
+    TripleExponentialSmoothing,
+)
+from crud.services.holt_winters_engine import HoltWintersEngine
+
+
+class PredictManyToleranceTest(SimpleTestCase):
+    """predict_many harus berada dalam BATCH_TOLERANCE dari predict"""
+
+    STEPS = 12
+    M = 12
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.series = {}
+        for length, seed in ((36, 0), (48, 1), (60, 2)):
+            batch = BenchmarkService.synthetic_series(length, 6, seed=seed)
+            for i, row in enumerate(batch):
+                cls.series[(length, i)] = [float(v) for v in row]
+
+        cls.many = TripleExponentialSmoothing.predict_many(cls.series, cls.M, steps=cls.STEPS)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            cls.single = {
+                key: TripleExponentialSmoothing.predict(data, cls.M, steps=cls.STEPS)
+                for key, data in cls.series.items()
+            }
+
+    def _sse(self, key, info):
+        residuals = np.asarray(self.series[key]) - np.asarray(info['forecast_values'])
+        return float(np.sum(residuals[self.M:] ** 2))
+
+    def test_forecast_within_tolerance(self):
+        tolerance = TripleExponentialSmoothing.BATCH_TOLERANCE
+        within = 0
+        for key in self.series:
+            with self.subTest(key=key):
+                single = self.single[key][4]
+                batch = self.many[key][4]
+                expected = np.asarray(single['future_forecasts'])
+                gap = np.max(np.abs(np.asarray(batch['future_forecasts']) / expected - 1))
+                if gap <= tolerance:
+                    within += 1
+                else:
+                    # Di luar toleransi hanya jika fit batch lebih baik dari statsmodels
+                    self.assertLess(self._sse(key, batch), self._sse(key, single))
+        self.assertGreaterEqual(within / len(self.series), 0.9)
+
+    def test_state_replays_future_forecasts(self):
+        for key, result in self.many.items():
+            with self.subTest(key=key):
+                info = result[4]
+                np.testing.assert_allclose(
+                    np.maximum(HoltWintersEngine.forecast_state(info['state'], self.STEPS), 0.0),
+                    info['future_forecasts'], rtol=1e-9
+                )
+
+
+class PredictFixedTest(SimpleTestCase):
+    """SES/DES parameter tetap (jalur NumPy) harus identik dengan statsmodels fit(optimized=False)"""
+
+    STEPS = 6
+    PARAMS = ((0.2, 0.05), (0.5, 0.1), (0.8, 0.3))
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.series = [
+            [float(v) for v in row] for row in BenchmarkService.synthetic_series(36, 3, seed=7)
+        ]
+
+    def _statsmodels(self, data, trend, alpha, beta=None):
+        fit_kwargs = {'smoothing_level': alpha, 'optimized': False}
+        if beta is not None:
+            fit_kwargs['smoothing_trend'] = beta
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return ExponentialSmoothing(np.asarray(data), trend=trend, seasonal=None).fit(**fit_kwargs)
+
+    def _assert_close(self, actual, expected):
+        np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float), rtol=1e-6)
+
+    def test_ses_matches_statsmodels(self):
+        for i, data in enumerate(self.series):
+            for alpha, _ in self.PARAMS:
+                with self.subTest(series=i, alpha=alpha):
+                    prediction, _, info = SimpleExponentialSmoothing.predict(data, alpha=alpha, steps=self.STEPS)
+                    fit = self._statsmodels(data, None, alpha)
+
+                    self.assertEqual(info['engine'], 'numpy-fixed')
+                    self._assert_close(info['forecast_values'], fit.fittedvalues)
+                    self._assert_close(info['future_forecasts'], fit.forecast(self.STEPS))
+                    self._assert_close(prediction, fit.forecast(1)[0])
+                    self._assert_close(info['state']['level'], fit.level[-1])
+
+    def test_des_matches_statsmodels(self):
+        for i, data in enumerate(self.series):
+            for alpha, beta in self.PARAMS:
+                with self.subTest(series=i, alpha=alpha, beta=beta):
+                    prediction, _, _, info = DoubleExponentialSmoothing.predict(
+                        data, alpha=alpha, beta=beta, steps=self.STEPS
+                    )
+                    fit = self._statsmodels(data, 'add', alpha, beta)
+
+                    self.assertEqual(info['engine'], 'numpy-fixed')
+                    self._assert_close(info['forecast_values'], fit.fittedvalues)
+                    self._assert_close(info['future_forecasts'], fit.forecast(self.STEPS))
+                    self._assert_close(prediction, fit.forecast(1)[0])
+                    self._assert_close(info['level_values'], fit.level)
+                    self._assert_close(info['trend_values'], fit.trend)
+                    self._assert_close(
+                        [info['state']['level'], info['state']['trend']], [fit.level[-1], fit.trend[-1]]
+                    )
@@ -0,0 +1,68 @@
+"""
+Test cache model terfit: key harus membedakan semua input yang mempengaruhi hasil fit
+"""
+from datetime import date
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from crud.models import HasilPrediksi
+from crud.services.benchmark_service import BenchmarkService
+from crud.services.model_cache import FittedModelCache
+from crud.services.prediction_service import PredictionService
+
+LOCMEM = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'prediksi': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-prediksi'},
+}
+
+
+@override_settings(CACHES=LOCMEM)
+class WarmStartCacheTest(TestCase):
+    """Hasil warm start tidak boleh dipakai untuk request cold start (dan sebaliknya)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        values = BenchmarkService.synthetic_series(36, 1, seed=3)[0].round(2)
+        cls.historical = [
+            {'tahun': 2021 + i // 12, 'bulan': i % 12 + 1, 'total_pendapatan': float(v)}
+            for i, v in enumerate(values)
+        ]
+        HasilPrediksi.objects.create(
+            metode='TES', tahun_prediksi=2023, bulan_prediksi=12, nilai_prediksi=1,
+            alpha='0.3', beta='0.1', gamma='0.2', seasonal_periods=12, mape='5',
+            data_training_dari=date(2021, 1, 1), data_training_sampai=date(2023, 11, 1),
+            jumlah_data_training=35
+        )
+
+    def setUp(self):
+        for alias in LOCMEM:
+            caches[alias].clear()
+
+    def _predict(self, warm_start):
+        return PredictionService.predict_tes(
+            tahun_prediksi=2024, bulan_prediksi=1, historical=self.historical,
+            warm_start=warm_start, actual_value=None, interval_paths=0
+        )['info']
+
+    def test_warm_and_cold_results_cached_separately(self):
+        warm = self._predict(warm_start=True)
+        self.assertEqual(warm['cache'], 'miss')
+        self.assertNotEqual(warm['warm_start'], 'cold')
+
+        cold = self._predict(warm_start=False)
+        self.assertEqual(cold['cache'], 'miss')
+        self.assertEqual(cold['warm_start'], 'cold')
+
+        self.assertEqual(self._predict(warm_start=True)['cache'], 'hit')
+        self.assertEqual(self._predict(warm_start=False)['warm_start'], 'cold')
+
+    def test_hit_reports_replay_time(self):
+        miss = self._predict(warm_start=False)
+        hit = self._predict(warm_start=False)
+        self.assertEqual(hit['cache'], 'hit')
+        # Cache hit melaporkan waktu replay, bukan waktu fit asli
+        self.assertLess(hit['fit_time_ms'], miss['fit_time_ms'])
+
+        FittedModelCache.set('test-key', {'alpha': 0.5, 'fit_time_ms': 12.5, 'cache': 'miss'})
+        self.assertEqual(FittedModelCache.get('test-key'), {'alpha': 0.5})
@@ -0,0 +1,97 @@
+"""
+Test update online state (HoltWintersEngine.update) terhadap refit statsmodels
+dengan parameter dan state awal yang sama
+"""
+import warnings
+
+import numpy as np
+from django.test import SimpleTestCase
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+from crud.services.exponential_smoothing import _statsmodels_state
+from crud.services.holt_winters_engine import HoltWintersEngine
+
+
+def _series(n=48, m=12, seed=7):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return 1_000_000 * (1 + 0.01 * t) * (1 + 0.2 * np.sin(2 * np.pi * t / m)) * rng.lognormal(0, 0.03, n)
+
+
+class UpdateMatchesRefitTest(SimpleTestCase):
+    """update() lalu forecast harus sama dengan fit ulang (parameter tetap) pada data + bulan baru"""
+
+    ALPHA, BETA, GAMMA, PHI = 0.3, 0.1, 0.2, 0.95
+    M = 12
+    NEW = 3
+
+    CASES = (
+        ('SES', {'trend': None, 'seasonal': None}),
+        ('DES', {'trend': 'add', 'seasonal': None}),
+        ('TES add+add', {'trend': 'add', 'seasonal': 'add'}),
+        ('TES add+mul', {'trend': 'add', 'seasonal': 'mul'}),
+        ('TES mul+mul', {'trend': 'mul', 'seasonal': 'mul'}),
+        ('TES damped_add+mul', {'trend': 'add', 'seasonal': 'mul', 'damped_trend': True}),
+    )
+
+    def _fit(self, y, trend, seasonal, damped_trend=False):
+        m = self.M
+        initial = {'initial_level': float(y[:m].mean())}
+        if trend:
+            initial['initial_trend'] = 1.002 if trend == 'mul' else float((y[m:2 * m] - y[:m]).mean() / m)
+        if seasonal:
+            initial['initial_seasonal'] = (
+                y[:m] / y[:m].mean() if seasonal == 'mul' else y[:m] - y[:m].mean()
+            )
+        model = ExponentialSmoothing(
+            y, trend=trend, seasonal=seasonal, damped_trend=damped_trend,
+            seasonal_periods=m if seasonal else None, initialization_method='known', **initial
+        )
+        params = {'smoothing_level': self.ALPHA}
+        if trend:
+            params['smoothing_trend'] = self.BETA
+        if seasonal:
+            params['smoothing_seasonal'] = self.GAMMA
+        if damped_trend:
+            params['damping_trend'] = self.PHI
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return model.fit(optimized=False, **params)
+
+    def test_update_then_forecast_equals_refit(self):
+        y = _series(m=self.M)
+        for name, config in self.CASES:
+            with self.subTest(name):
+                trend, seasonal = config['trend'], config['seasonal']
+                damped = config.get('damped_trend', False)
+                before = self._fit(y[:-self.NEW], **config)
+                after = self._fit(y, **config)
+
+                state = _statsmodels_state(before, trend, seasonal, self.M, damped)
+                for value in y[-self.NEW:]:
+                    _, state = HoltWintersEngine.update(
+                        state, value, self.ALPHA,
+                        self.BETA if trend else None, self.GAMMA if seasonal else None
+                    )
+
+                expected = _statsmodels_state(after, trend, seasonal, self.M, damped)
+                self.assertAlmostEqual(state['level'], expected['level'], delta=1e-6 * abs(expected['level']))
+                self.assertAlmostEqual(state['trend'], expected['trend'], delta=1e-6 * max(abs(expected['trend']), 1))
+                np.testing.assert_allclose(state['season'], expected['season'], rtol=1e-9, atol=1e-6)
+                np.testing.assert_allclose(
+                    HoltWintersEngine.forecast_state(state, 2 * self.M),
+                    np.asarray(after.forecast(2 * self.M)), rtol=1e-9
+                )
+
+    def test_state_forecast_matches_statsmodels(self):
+        y = _series(m=self.M)
+        for name, config in self.CASES:
+            with self.subTest(name):
+                fit = self._fit(y, **config)
+                state = _statsmodels_state(
+                    fit, config['trend'], config['seasonal'], self.M, config.get('damped_trend', False)
+                )
+                np.testing.assert_allclose(
+                    HoltWintersEngine.forecast_state(state, 2 * self.M),
+                    np.asarray(fit.forecast(2 * self.M)), rtol=1e-9
+                )
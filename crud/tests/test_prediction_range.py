@@ -0,0 +1,62 @@
+"""
+Test predict_range: prediction interval per bulan dari satu simulasi sepanjang rentang
+"""
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from crud.services.benchmark_service import BenchmarkService
+from crud.services.prediction_service import PredictionService
+
+LOCMEM = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'prediksi': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-prediksi'},
+}
+
+
+@override_settings(CACHES=LOCMEM)
+class PredictRangeIntervalTest(TestCase):
+    """Setiap bulan dalam rentang membawa interval langkahnya sendiri"""
+
+    METHODS = ['SES', 'DES', 'TES']
+
+    @classmethod
+    def setUpTestData(cls):
+        values = BenchmarkService.synthetic_series(36, 1, seed=4)[0].round(2)
+        cls.historical = [
+            {'tahun': 2021 + i // 12, 'bulan': i % 12 + 1, 'total_pendapatan': float(v)}
+            for i, v in enumerate(values)
+        ]
+
+    def setUp(self):
+        for alias in LOCMEM:
+            caches[alias].clear()
+
+    def _predict_range(self, **kwargs):
+        return PredictionService.predict_range(
+            self.METHODS, 2024, 1, 2024, 12,
+            historical=self.historical, actual_values={}, interval_paths=2000, **kwargs
+        )
+
+    def test_interval_per_month(self):
+        for metode, result in self._predict_range().items():
+            with self.subTest(metode=metode):
+                self.assertNotIn('error', result)
+                self.assertNotIn('interval', result)
+                prediksi = result['prediksi']
+                self.assertEqual(len(prediksi), 12)
+                for item in prediksi:
+                    interval = item['interval']
+                    self.assertEqual(interval['paths'], 2000)
+                    self.assertLessEqual(interval['lower'], float(item['nilai_prediksi']) * 1.05)
+                    self.assertGreaterEqual(interval['upper'], float(item['nilai_prediksi']) * 0.95)
+                # Ketidakpastian bertambah dengan horizon (TES: lebar ikut skala musiman)
+                width = lambda item: (item['interval']['upper'] - item['interval']['lower']) / float(item['nilai_prediksi'])
+                self.assertGreater(width(prediksi[-1]), width(prediksi[0]))
+
+    def test_without_interval(self):
+        results = PredictionService.predict_range(
+            self.METHODS, 2024, 1, 2024, 3, historical=self.historical, actual_values={}, interval_paths=0
+        )
+        for metode, result in results.items():
+            with self.subTest(metode=metode):
+                self.assertTrue(all(item['interval'] is None for item in result['prediksi']))
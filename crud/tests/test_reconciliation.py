@@ -0,0 +1,93 @@
+"""
+Test rekonsiliasi hierarki: koherensi dan kesesuaian base forecast dengan predict_tes
+"""
+import numpy as np
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from crud.models import AgregatPendapatanBulanan, JenisKendaraan
+from crud.services.benchmark_service import BenchmarkService
+from crud.services.exponential_smoothing import TripleExponentialSmoothing
+from crud.services.model_cache import AgregatVersion
+from crud.services.prediction_service import PredictionService
+from crud.services.reconciliation_service import ReconciliationService
+from crud.services.series_store import SeriesStore
+
+LOCMEM = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'prediksi': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-prediksi'},
+}
+
+
+@override_settings(CACHES=LOCMEM)
+class PredictHierarchyTest(TestCase):
+    """Jenis kedua baru punya data mulai 2021; global = jumlah per-jenis"""
+
+    M = 12
+    HORIZON = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.motor = JenisKendaraan.objects.create(nama='Motor', kategori='MOTOR')
+        cls.mobil = JenisKendaraan.objects.create(nama='Mobil', kategori='MOBIL')
+        motor = BenchmarkService.synthetic_series(48, 1, seed=5)[0].round(2)
+        mobil = BenchmarkService.synthetic_series(36, 1, seed=6, level=3_000_000)[0].round(2)
+
+        rows, totals = [], {}
+        for jenis, values, start in ((cls.motor, motor, 2020), (cls.mobil, mobil, 2021)):
+            for i, value in enumerate(values):
+                period = (start + i // 12, i % 12 + 1)
+                totals[period] = totals.get(period, 0.0) + float(value)
+                rows.append(AgregatPendapatanBulanan(
+                    jenis_kendaraan=jenis, tahun=period[0], bulan=period[1], total_pendapatan=value
+                ))
+        rows.extend(
+            AgregatPendapatanBulanan(tahun=tahun, bulan=bulan, total_pendapatan=round(total, 2))
+            for (tahun, bulan), total in totals.items()
+        )
+        AgregatPendapatanBulanan.objects.bulk_create(rows)
+
+    def setUp(self):
+        for alias in LOCMEM:
+            caches[alias].clear()
+        SeriesStore.invalidate()
+
+    def _predict(self, method=ReconciliationService.DEFAULT_METHOD):
+        return ReconciliationService.predict_hierarchy(2024, 1, horizon=self.HORIZON, method=method)
+
+    def test_reconciled_forecasts_are_coherent(self):
+        for method in ReconciliationService.METHODS:
+            with self.subTest(method=method):
+                nodes = self._predict(method)['nodes']
+                self.assertIsNone(nodes[0]['jenis_kendaraan_id'])
+                np.testing.assert_allclose(
+                    nodes[0]['prediksi'],
+                    np.sum([node['prediksi'] for node in nodes[1:]], axis=0),
+                    rtol=1e-9
+                )
+
+    def test_leading_months_without_data_are_not_fitted(self):
+        nodes = {node['jenis_kendaraan_id']: node for node in self._predict()['nodes']}
+        self.assertEqual(nodes[None]['jumlah_data_training'], 48)
+        self.assertEqual(nodes[self.motor.id]['jumlah_data_training'], 48)
+        self.assertEqual(nodes[self.mobil.id]['jumlah_data_training'], 36)
+
+    def test_base_forecasts_agree_with_predict_tes(self):
+        tolerance = TripleExponentialSmoothing.BATCH_TOLERANCE
+        for node in self._predict()['nodes']:
+            key = node['jenis_kendaraan_id']
+            with self.subTest(jenis=key):
+                result = PredictionService.predict_tes(
+                    jenis_kendaraan_id=key, tahun_prediksi=2024, bulan_prediksi=1,
+                    seasonal_periods=self.M, extra_steps=self.HORIZON - 1, interval_paths=0
+                )
+                expected = np.asarray(result['info']['future_forecasts'][:self.HORIZON])
+                self.assertLessEqual(
+                    np.max(np.abs(np.asarray(node['prediksi_base']) / expected - 1)), tolerance
+                )
+
+    def test_short_node_is_rejected(self):
+        AgregatPendapatanBulanan.objects.filter(jenis_kendaraan=self.mobil, tahun__lt=2023).delete()
+        AgregatVersion.bump()
+        with self.assertRaisesMessage(ValueError, f'jenis {self.mobil.id}'):
+            self._predict()
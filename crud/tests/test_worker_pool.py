@@ -0,0 +1,43 @@
+"""
+Test process pool bersama: worker forkserver harus siap menjalankan service (Django + engine)
+"""
+import multiprocessing
+import unittest
+
+from django.test import SimpleTestCase
+
+from crud.services.worker_pool import WorkerPool
+
+
+def _worker_state():
+    from django.apps import apps
+
+    from crud.services.engine_registry import EngineRegistry
+
+    return {
+        'apps_ready': apps.ready,
+        'engine_loaded': EngineRegistry.is_loaded('holt_winters'),
+    }
+
+
+@unittest.skipUnless('forkserver' in multiprocessing.get_all_start_methods(), 'forkserver tidak tersedia')
+class ForkserverPoolTest(SimpleTestCase):
+    """Pool default untuk proses web tidak fork langsung dari thread request"""
+
+    def setUp(self):
+        WorkerPool.reset()
+        self.addCleanup(WorkerPool.reset)
+        self.addCleanup(WorkerPool.configure, WorkerPool.START_METHOD)
+
+    def test_forkserver_worker_ready(self):
+        WorkerPool.configure('forkserver')
+        executor = WorkerPool.get(1)
+        self.assertEqual(executor._mp_context.get_start_method(), 'forkserver')
+
+        state = executor.submit(_worker_state).result(timeout=120)
+        self.assertTrue(state['apps_ready'])
+        self.assertTrue(state['engine_loaded'])
+
+    def test_configure_fork(self):
+        WorkerPool.configure('fork')
+        self.assertEqual(WorkerPool.get(1)._mp_context.get_start_method(), 'fork')
@@ -29,8 +29,14 @@ from .views import (
     HasilPrediksiListView,
     HasilPrediksiDetailView,
     GeneratePrediksiView,
+    GeneratePrediksiRangeView,
     ComparePrediksiView,
+    BacktestPrediksiView,
+    ReconcilePrediksiView,
+    PrecomputedPrediksiView,
     HybridPrediksiView,
+    PrediksiJobListView,
+    PrediksiJobDetailView,
     LaporanTotalPajakView,
     LaporanTotalPajakSummaryView,
     LaporanTotalPajakFilterOptionsView,
@@ -93,8 +99,14 @@ urlpatterns = [
     
     # Prediksi Endpoints
     path('prediksi/generate/', GeneratePrediksiView.as_view(), name='prediksi-generate'),
+    path('prediksi/generate-range/', GeneratePrediksiRangeView.as_view(), name='prediksi-generate-range'),
     path('prediksi/compare/', ComparePrediksiView.as_view(), name='prediksi-compare'),
+    path('prediksi/backtest/', BacktestPrediksiView.as_view(), name='prediksi-backtest'),
+    path('prediksi/rekonsiliasi/', ReconcilePrediksiView.as_view(), name='prediksi-rekonsiliasi'),
+    path('prediksi/precomputed/', PrecomputedPrediksiView.as_view(), name='prediksi-precomputed'),
     path('prediksi/hybrid/generate/', HybridPrediksiView.as_view(), name='prediksi-hybrid-generate'),
+    path('prediksi/jobs/', PrediksiJobListView.as_view(), name='prediksi-job-list'),
+    path('prediksi/jobs/<int:pk>/', PrediksiJobDetailView.as_view(), name='prediksi-job-detail'),
     
     # Laporan Total Pajak
     path('laporan-total-pajak/', LaporanTotalPajakView.as_view(), name='laporan-total-pajak'),
@@ -1,6 +1,7 @@
 from .permissions import IsAdmin
 from .response import APIResponse
 from .metrics import calculate_mape, calculate_mae, calculate_rmse, calculate_all_metrics
+from .compact import compact_result, parse_options
 
 __all__ = [
     'IsAdmin',
@@ -8,6 +9,8 @@ __all__ = [
     'calculate_mape',
     'calculate_mae',
     'calculate_rmse',
-    'calculate_all_metrics'
+    'calculate_all_metrics',
+    'compact_result',
+    'parse_options'
 ]
 
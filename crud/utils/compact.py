@@ -0,0 +1,131 @@
+"""
+Utility functions untuk mode response ringkas endpoint prediksi
+
+Hasil prediksi berisi info['forecast_values'], ['level_values'],
+['trend_values'], dan ['seasonal_values'] sepanjang data historis. Klien yang
+hanya butuh angka utama bisa memilih field, membuang komponen tersebut, atau
+meminta array angka dikirim sebagai base64 (float32/float64 little-endian).
+"""
+import base64
+from decimal import Decimal
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Array komponen model di info (sepanjang data historis)
+COMPONENT_KEYS = ('forecast_values', 'level_values', 'trend_values', 'seasonal_values')
+
+# Encoding array angka: json = list biasa, f32/f64 = base64 typed array little-endian
+ENCODINGS = {'json': None, 'f32': '<f4', 'f64': '<f8'}
+
+# Panjang minimum list angka yang di-encode base64 (list pendek tetap JSON)
+MIN_ENCODED_LENGTH = 4
+
+
+def parse_options(params: Mapping) -> Dict:
+    """
+    Membaca opsi response ringkas dari query params / body request
+
+    Args:
+        params: request.query_params atau request.data dengan key opsional
+                fields (list atau string dipisah koma), include_components (bool),
+                dan encoding ('json', 'f32', 'f64')
+
+    Returns:
+        Dictionary fields (set atau None), include_components, encoding
+    """
+    fields = params.get('fields')
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+    if fields is not None and not isinstance(fields, (list, tuple)):
+        raise ValueError('fields harus berupa list atau string dipisah koma')
+
+    include_components = params.get('include_components', True)
+    if isinstance(include_components, str):
+        include_components = include_components.lower() not in ('false', '0', 'no')
+
+    encoding = str(params.get('encoding', 'json')).lower()
+    if encoding not in ENCODINGS:
+        raise ValueError('encoding harus salah satu dari: ' + ', '.join(ENCODINGS))
+
+    return {
+        'fields': set(fields) if fields else None,
+        'include_components': bool(include_components),
+        'encoding': encoding,
+    }
+
+
+def is_default(options: Dict) -> bool:
+    """
+    True jika opsi sama dengan response penuh (tidak perlu diproses)
+    """
+    return options['fields'] is None and options['include_components'] and options['encoding'] == 'json'
+
+
+def encode_array(values: Sequence[float], encoding: str) -> Dict:
+    """
+    Encode list angka menjadi base64 typed array
+
+    Returns:
+        Dictionary dtype, length, dan data (base64)
+    """
+    dtype = ENCODINGS[encoding]
+    arr = np.asarray(values, dtype=dtype)
+    return {
+        'dtype': 'float32' if encoding == 'f32' else 'float64',
+        'length': int(arr.size),
+        'data': base64.b64encode(arr.tobytes()).decode('ascii'),
+    }
+
+
+def _is_number_list(value) -> bool:
+    return (
+        isinstance(value, (list, tuple)) and len(value) >= MIN_ENCODED_LENGTH
+        and all(isinstance(v, (int, float, Decimal)) and not isinstance(v, bool) for v in value)
+    )
+
+
+def _encode(value, encoding: str):
+    """
+    Encode rekursif: list angka -> base64, Decimal -> float
+    """
+    if isinstance(value, dict):
+        return {k: _encode(v, encoding) for k, v in value.items()}
+    if _is_number_list(value):
+        return encode_array([float(v) for v in value], encoding)
+    if isinstance(value, (list, tuple)):
+        return [_encode(v, encoding) for v in value]
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def compact_result(result: Dict, fields: Optional[set] = None,
+                   include_components: bool = True, encoding: str = 'json') -> Dict:
+    """
+    Meringkas satu hasil prediksi
+
+    Args:
+        result: Hasil prediksi (dict dengan 'info' opsional)
+        fields: Field top-level yang dipertahankan (None = semua)
+        include_components: False = buang COMPONENT_KEYS dari info
+        encoding: 'json' (apa adanya), 'f32' atau 'f64' (list angka sebagai base64
+                  dan Decimal sebagai angka)
+
+    Returns:
+        Dictionary hasil ringkas
+    """
+    if not isinstance(result, dict):
+        return result
+
+    if fields is not None:
+        result = {k: v for k, v in result.items() if k in fields}
+
+    if not include_components and isinstance(result.get('info'), dict):
+        result = dict(result)
+        result['info'] = {k: v for k, v in result['info'].items() if k not in COMPONENT_KEYS}
+
+    if encoding != 'json':
+        result = _encode(result, encoding)
+
+    return result
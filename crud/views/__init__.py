@@ -37,9 +37,14 @@ from .agregat_pendapatan_bulanan_view import (
 from .hasil_prediksi_view import HasilPrediksiListView, HasilPrediksiDetailView
 from .prediksi_view import (
     GeneratePrediksiView,
+    GeneratePrediksiRangeView,
     ComparePrediksiView,
+    BacktestPrediksiView,
+    ReconcilePrediksiView,
+    PrecomputedPrediksiView,
     HybridPrediksiView
 )
+from .prediksi_job_view import PrediksiJobListView, PrediksiJobDetailView
 from .laporan_total_pajak_view import (
     LaporanTotalPajakView,
     LaporanTotalPajakSummaryView,
@@ -4,9 +4,13 @@ from rest_framework.permissions import IsAuthenticated
 from django.core.paginator import Paginator
 from django.db.models import Sum, Count, Q, F
 from django.db import transaction
+from django.utils import timezone
 
-from crud.models import AgregatPendapatanBulanan, TransaksiPajak, JenisKendaraan
+from crud.models import AgregatPendapatanBulanan, AgregatDirtyPeriod, TransaksiPajak, JenisKendaraan
 from crud.serializers.agregat_pendapatan_bulanan_serializer import AgregatPendapatanBulananSerializer
+from crud.services.agregat_service import AgregatService
+from crud.services.mape_bulanan_service import MapeBulananService
+from crud.services.model_cache import AgregatVersion, FittedModelCache
 from crud.utils.response import APIResponse
 from crud.utils.permissions import IsAdmin
 from decimal import Decimal
@@ -132,43 +136,48 @@ class AgregatPendapatanBulananRegenerateView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
     
     @staticmethod
-    def _generate_global_records():
+    def _generate_global_records(groups=None, **filters):
         """
         Generate record global (jenis_kendaraan=NULL) dari SUM per-jenis records.
         Karena data TransaksiPajak sudah di-smoothing, cukup menjumlahkan
         record per-jenis untuk mendapatkan total bulanan yang konsisten.
+        
+        Jika `groups` diberikan (hasil agregasi per-jenis yang baru ditulis dan
+        mewakili seluruh periode), total dihitung di Python tanpa query tambahan.
+        Jika tidak, dijumlahkan dari record per-jenis yang tersimpan (sesuai
+        `filters`). Semua record global dibuat dengan satu bulk_create.
         """
-        monthly_totals = AgregatPendapatanBulanan.objects.filter(
-            jenis_kendaraan__isnull=False
-        ).values('tahun', 'bulan').annotate(
-            total_pendapatan=Sum('total_pendapatan'),
-            total_pokok_pkb=Sum('total_pokok_pkb'),
-            total_denda_pkb=Sum('total_denda_pkb'),
-            total_swdkllj=Sum('total_swdkllj'),
-            total_bbnkb=Sum('total_bbnkb'),
-            total_opsen=Sum('total_opsen'),
-            sum_transaksi=Sum('jumlah_transaksi'),
-            sum_kendaraan=Sum('jumlah_kendaraan'),
-        ).order_by('tahun', 'bulan')
+        if groups is None:
+            groups = AgregatPendapatanBulanan.objects.filter(
+                jenis_kendaraan__isnull=False, **filters
+            ).values('tahun', 'bulan', *AgregatService.AGREGAT_FIELDS)
         
-        created = 0
-        for m in monthly_totals:
-            AgregatPendapatanBulanan.objects.create(
-                tahun=m['tahun'],
-                bulan=m['bulan'],
-                jenis_kendaraan=None,
-                total_pendapatan=m['total_pendapatan'] or Decimal('0'),
-                total_pokok_pkb=m['total_pokok_pkb'] or Decimal('0'),
-                total_denda_pkb=m['total_denda_pkb'] or Decimal('0'),
-                total_swdkllj=m['total_swdkllj'] or Decimal('0'),
-                total_bbnkb=m['total_bbnkb'] or Decimal('0'),
-                total_opsen=m['total_opsen'] or Decimal('0'),
-                jumlah_transaksi=m['sum_transaksi'] or 0,
-                jumlah_kendaraan=m['sum_kendaraan'] or 0,
-            )
-            created += 1
+        records = AgregatService.global_records(groups)
+        AgregatPendapatanBulanan.objects.bulk_create(records, batch_size=1000)
+        
+        return len(records)
+    
+    def _regenerate_dirty(self):
+        """
+        Rebuild hanya periode yang ditandai dirty (per-jenis dan global)
+        """
+        result = AgregatService.rebuild_periods(AgregatService.dirty_periods())
+        
+        if result['periods']:
+            # Data agregat berubah: model yang di-cache sudah tidak valid
+            FittedModelCache.invalidate()
         
-        return created
+        return APIResponse.success(
+            data={
+                'mode': 'dirty',
+                'periods': result['periods'],
+                'records': result['records'],
+                'global_records': result['global_records'],
+                'total': result['records'] + result['global_records'],
+            },
+            message=f'Agregat berhasil di-rebuild untuk {len(result["periods"])} periode dirty',
+            status_code=status.HTTP_200_OK
+        )
     
     def post(self, request):
         """
@@ -178,6 +187,7 @@ class AgregatPendapatanBulananRegenerateView(APIView):
         - bulan (optional): Regenerate untuk bulan tertentu
         - jenis_kendaraan_id (optional): Regenerate untuk jenis kendaraan tertentu
         - all (optional): Regenerate semua data
+        - mode (optional): 'dirty' untuk rebuild hanya periode yang berubah
         """
         try:
             tahun = request.query_params.get('tahun', '')
@@ -185,6 +195,12 @@ class AgregatPendapatanBulananRegenerateView(APIView):
             jenis_kendaraan_id = request.query_params.get('jenis_kendaraan_id', '')
             
             # Bisa dari query params atau body
+            mode = request.query_params.get('mode', '')
+            if not mode and request.data:
+                mode = request.data.get('mode', '')
+            if str(mode).lower() == 'dirty':
+                return self._regenerate_dirty()
+            
             all_param = request.query_params.get('all', '')
             if not all_param and request.data:
                 all_param = request.data.get('all', '')
@@ -199,90 +215,75 @@ class AgregatPendapatanBulananRegenerateView(APIView):
             if bulan:
                 transaksi_filter['bulan'] = bulan
             
-            # Query TransaksiPajak dengan aggregasi per jenis kendaraan
-            queryset = TransaksiPajak.objects.filter(
-                kendaraan__isnull=False
-            ).values(
-                'tahun', 'bulan', 'kendaraan__jenis'
-            ).annotate(
-                total_pendapatan=Sum('total_bayar'),
-                total_pokok_pkb=Sum('pokok_pkb'),
-                total_denda_pkb=Sum('denda_pkb'),
-                total_swdkllj=Sum(F('pokok_swdkllj') + F('denda_swdkllj')),
-                total_bbnkb=Sum(F('pokok_bbnkb') + F('denda_bbnkb')),
-                total_opsen=Sum(
-                    F('opsen_pokok_pkb') + F('opsen_denda_pkb') + 
-                    F('opsen_pokok_bbnkb') + F('opsen_denda_bbnkb')
-                ),
-                jumlah_transaksi=Count('id'),
-                jumlah_kendaraan=Count('kendaraan', distinct=True)
-            ).order_by('tahun', 'bulan', 'kendaraan__jenis')
-            
-            # Apply filters
-            if transaksi_filter:
-                queryset = queryset.filter(**transaksi_filter)
-            
-            # Filter by jenis_kendaraan jika ada
-            if jenis_kendaraan_id:
-                queryset = queryset.filter(kendaraan__jenis_id=jenis_kendaraan_id)
+            # Hitung berapa grup yang sudah ada (untuk laporan dibuat vs diupdate)
+            existing_keys = set()
+            if not regenerate_all:
+                existing_queryset = AgregatPendapatanBulanan.objects.filter(
+                    jenis_kendaraan__isnull=False, **transaksi_filter
+                )
+                if jenis_kendaraan_id:
+                    existing_queryset = existing_queryset.filter(jenis_kendaraan_id=jenis_kendaraan_id)
+                existing_keys = set(existing_queryset.values_list('tahun', 'bulan', 'jenis_kendaraan_id'))
             
-            # Jika regenerate_all, hapus semua data terlebih dahulu
+            started = timezone.now()
             deleted_count = 0
-            if regenerate_all:
-                count_before = AgregatPendapatanBulanan.objects.all().count()
-                deleted, _ = AgregatPendapatanBulanan.objects.all().delete()
-                deleted_count = deleted
-            
-            # Regenerate data per jenis kendaraan
-            created_count = 0
-            updated_count = 0
             
             with transaction.atomic():
-                for item in queryset:
-                    tahun_val = item['tahun']
-                    bulan_val = item['bulan']
-                    jenis_kendaraan_id_val = item['kendaraan__jenis']
-                    
-                    agregat, created = AgregatPendapatanBulanan.objects.get_or_create(
-                        tahun=tahun_val,
-                        bulan=bulan_val,
-                        jenis_kendaraan_id=jenis_kendaraan_id_val,
-                        defaults={
-                            'total_pendapatan': item['total_pendapatan'] or Decimal('0'),
-                            'total_pokok_pkb': item['total_pokok_pkb'] or Decimal('0'),
-                            'total_denda_pkb': item['total_denda_pkb'] or Decimal('0'),
-                            'total_swdkllj': item['total_swdkllj'] or Decimal('0'),
-                            'total_bbnkb': item['total_bbnkb'] or Decimal('0'),
-                            'total_opsen': item['total_opsen'] or Decimal('0'),
-                            'jumlah_transaksi': item['jumlah_transaksi'] or 0,
-                            'jumlah_kendaraan': item['jumlah_kendaraan'] or 0,
-                        }
-                    )
-                    
-                    if not created:
-                        agregat.total_pendapatan = item['total_pendapatan'] or Decimal('0')
-                        agregat.total_pokok_pkb = item['total_pokok_pkb'] or Decimal('0')
-                        agregat.total_denda_pkb = item['total_denda_pkb'] or Decimal('0')
-                        agregat.total_swdkllj = item['total_swdkllj'] or Decimal('0')
-                        agregat.total_bbnkb = item['total_bbnkb'] or Decimal('0')
-                        agregat.total_opsen = item['total_opsen'] or Decimal('0')
-                        agregat.jumlah_transaksi = item['jumlah_transaksi'] or 0
-                        agregat.jumlah_kendaraan = item['jumlah_kendaraan'] or 0
-                        agregat.save()
-                        updated_count += 1
-                    else:
-                        created_count += 1
+                # Jika regenerate_all, hapus semua data terlebih dahulu
+                if regenerate_all:
+                    deleted, _ = AgregatPendapatanBulanan.objects.all().delete()
+                    deleted_count = deleted
+                
+                # Agregasi TransaksiPajak per jenis kendaraan (satu query)
+                groups = AgregatService.query_groups(
+                    jenis_kendaraan_id=jenis_kendaraan_id or None, **transaksi_filter
+                )
+                AgregatService.upsert(
+                    AgregatPendapatanBulanan,
+                    [AgregatPendapatanBulanan(**g) for g in groups],
+                    unique_fields=['tahun', 'bulan', 'jenis_kendaraan'],
+                    update_fields=AgregatService.AGREGAT_FIELDS + ['tanggal_agregasi'],
+                )
                 
                 # PENTING: Generate record global (jenis_kendaraan=NULL) 
                 # dengan data yang sudah di-smoothing untuk prediksi
-                # Hapus record global yang lama dulu
-                AgregatPendapatanBulanan.objects.filter(
-                    jenis_kendaraan__isnull=True
-                ).delete()
+                # Hapus record global yang lama dulu (hanya periode yang di-regenerate)
+                old_global = AgregatPendapatanBulanan.objects.filter(
+                    jenis_kendaraan__isnull=True, **transaksi_filter
+                )
+                global_keys = set(old_global.values_list('tahun', 'bulan', 'jenis_kendaraan_id'))
+                old_global.delete()
                 
-                # Generate record global baru
-                global_created = self._generate_global_records()
-                created_count += global_created
+                # Generate record global baru (setelah regenerate all, groups = isi tabel)
+                global_created = self._generate_global_records(
+                    groups if regenerate_all else None, **transaksi_filter
+                )
+                
+                # Periode yang sudah di-regenerate penuh tidak perlu rebuild lagi
+                if not jenis_kendaraan_id:
+                    AgregatDirtyPeriod.objects.filter(
+                        ditandai_pada__lte=started, **transaksi_filter
+                    ).delete()
+                
+                # Monthly MAPE untuk Hybrid: rebuild penuh hanya untuk regenerate all,
+                # selain itu baris yang terdampak diinvalidasi dan dihitung ulang saat dibaca
+                if regenerate_all:
+                    MapeBulananService.rebuild()
+                else:
+                    MapeBulananService.invalidate(
+                        existing_keys | global_keys
+                        | {(g['tahun'], g['bulan'], g['jenis_kendaraan_id']) for g in groups}
+                    )
+                transaction.on_commit(AgregatVersion.bump)
+            
+            updated_count = sum(
+                1 for g in groups
+                if (g['tahun'], g['bulan'], g['jenis_kendaraan_id']) in existing_keys
+            )
+            created_count = len(groups) - updated_count + global_created
+            
+            # Data agregat berubah: model yang di-cache sudah tidak valid
+            FittedModelCache.invalidate()
             
             return APIResponse.success(
                 data={
@@ -0,0 +1,152 @@
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from django.core.paginator import Paginator
+
+from crud.models import PrediksiJob
+from crud.serializers.prediksi_job_serializer import PrediksiJobSerializer
+from crud.services.prediksi_job_service import PrediksiJobService
+from crud.utils.response import APIResponse
+from crud.utils.permissions import IsAdmin
+
+
+class PrediksiJobListView(APIView):
+    """
+    API endpoint untuk antrian job prediksi
+    GET: List job (dengan pagination dan filter status)
+    POST: Submit job prediksi baru (diproses oleh run_prediksi_worker)
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        """
+        Get list job prediksi dengan pagination dan filter
+        """
+        try:
+            page = request.query_params.get('page', 1)
+            page_size = request.query_params.get('page_size', 10)
+            status_param = request.query_params.get('status', '')
+            tipe = request.query_params.get('tipe', '')
+
+            queryset = PrediksiJob.objects.select_related('dibuat_oleh').all()
+
+            if status_param:
+                queryset = queryset.filter(status=status_param.upper())
+
+            if tipe:
+                queryset = queryset.filter(tipe=tipe.upper())
+
+            queryset = queryset.order_by('-created_at')
+
+            # Pagination
+            paginator = Paginator(queryset, page_size)
+            page_obj = paginator.get_page(page)
+
+            serializer = PrediksiJobSerializer(page_obj, many=True)
+
+            return APIResponse.paginated_success(
+                data=serializer.data,
+                message='Data job prediksi berhasil diambil',
+                pagination_data={
+                    'page': page_obj.number,
+                    'page_size': int(page_size),
+                    'total_pages': paginator.num_pages,
+                    'total_count': paginator.count,
+                    'has_next': page_obj.has_next(),
+                    'has_previous': page_obj.has_previous(),
+                }
+            )
+
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat mengambil data job prediksi',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def post(self, request):
+        """
+        Submit job prediksi baru
+
+        Body:
+        {
+            "tipe": "PREDIKSI" | "HYBRID",
+            "tahun_prediksi": int,
+            "bulan_prediksi": int,
+            "jenis_kendaraan_id": int (optional),
+            "speed": "fast" | "balanced" | "accurate" (optional, default: "accurate"),
+
+            // tipe PREDIKSI (sama seperti /prediksi/generate/)
+            "metode": "SES" | "DES" | "TES",
+            "alpha", "beta", "gamma": float (optional),
+            "seasonal_periods": int (optional, default: 12),
+            "optimize": bool (optional, default: true),
+            "warm_start": bool (optional, default: false),
+
+            // tipe HYBRID (sama seperti /prediksi/hybrid/generate/)
+            "training_periods": int (optional, default: 24),
+            "selected_scenario": str (optional, default: "base"),
+
+            "keterangan": string (optional)
+        }
+        """
+        try:
+            tipe = str(request.data.get('tipe', 'PREDIKSI')).upper()
+            parameter = {key: value for key, value in request.data.items() if key != 'tipe'}
+
+            error = PrediksiJobService.validate(tipe, parameter)
+            if error:
+                return APIResponse.error(
+                    message=error,
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+
+            job = PrediksiJobService.submit(tipe, parameter, user=request.user)
+            serializer = PrediksiJobSerializer(job)
+
+            return APIResponse.success(
+                data=serializer.data,
+                message=f'Job prediksi #{job.id} berhasil dibuat dan menunggu diproses',
+                status_code=status.HTTP_202_ACCEPTED
+            )
+
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat membuat job prediksi',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class PrediksiJobDetailView(APIView):
+    """
+    API endpoint untuk status job prediksi
+    GET: Status dan hasil job
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, pk):
+        """
+        Get status job prediksi by ID
+        """
+        try:
+            try:
+                job = PrediksiJob.objects.select_related('dibuat_oleh').get(pk=pk)
+            except PrediksiJob.DoesNotExist:
+                return APIResponse.error(
+                    message='Job prediksi tidak ditemukan',
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+
+            serializer = PrediksiJobSerializer(job)
+            return APIResponse.success(
+                data=serializer.data,
+                message='Status job prediksi berhasil diambil'
+            )
+
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat mengambil status job prediksi',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
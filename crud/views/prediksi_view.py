@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
 from datetime import datetime, date
 from decimal import Decimal
@@ -8,7 +9,15 @@ from decimal import Decimal
 from crud.models import HasilPrediksi, AgregatPendapatanBulanan, JenisKendaraan
 from crud.serializers.hasil_prediksi_serializer import HasilPrediksiSerializer
 from crud.services.prediction_service import PredictionService
+from crud.services.compare_service import CompareService
+from crud.services.backtest_service import BacktestService
+from crud.services.exponential_smoothing import (
+    DEFAULT_SPEED, INTERVAL_MAX_PATHS, INTERVAL_PATHS, INTERVAL_QUANTILES, SPEED_PRESETS
+)
 from crud.services.hybrid_prediction_service import HybridPredictionService
+from crud.services.precompute_service import PrecomputeService
+from crud.services.reconciliation_service import ReconciliationService
+from crud.utils.compact import compact_result, is_default, parse_options
 from crud.utils.response import APIResponse
 from crud.utils.permissions import IsAdmin
 
@@ -35,7 +44,15 @@ class GeneratePrediksiView(APIView):
             "gamma": float (optional),
             "seasonal_periods": int (optional, default: 12),
             "optimize": bool (optional, default: true),
-            "keterangan": string (optional)
+            "parallel": bool (optional, default: false, khusus TES),
+            "warm_start": bool (optional, default: false, khusus TES) - mulai optimasi dari parameter prediksi terakhir,
+            "speed": "fast" | "balanced" | "accurate" (optional, default: "accurate") - preset optimizer,
+            "interval_paths": int (optional, default: 10000) - jumlah path simulasi prediction interval, 0 = tanpa interval,
+            "interval_quantiles": [float] (optional, default: [0.025, 0.975]) - kuantil prediction interval,
+            "keterangan": string (optional),
+            "fields": [str] | "a,b" (optional) - hanya field top-level ini yang dikirim,
+            "include_components": bool (optional, default: true) - false = tanpa array komponen info,
+            "encoding": "json" | "f32" | "f64" (optional, default: "json") - array angka sebagai base64
         }
         """
         try:
@@ -48,9 +65,19 @@ class GeneratePrediksiView(APIView):
             gamma = request.data.get('gamma')
             seasonal_periods = request.data.get('seasonal_periods', 12)
             optimize = request.data.get('optimize', True)
+            parallel = request.data.get('parallel', False)
+            warm_start = request.data.get('warm_start', False)
+            speed = request.data.get('speed', DEFAULT_SPEED)
+            interval_paths = request.data.get('interval_paths', INTERVAL_PATHS)
+            interval_quantiles = request.data.get('interval_quantiles', list(INTERVAL_QUANTILES))
             keterangan = request.data.get('keterangan', '')
             
             # Validasi
+            try:
+                compact = parse_options(request.data)
+            except ValueError as e:
+                return APIResponse.error(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+            
             if not tahun_prediksi or not bulan_prediksi:
                 return APIResponse.error(
                     message='Tahun dan bulan prediksi harus diisi',
@@ -63,6 +90,25 @@ class GeneratePrediksiView(APIView):
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
             
+            if speed not in SPEED_PRESETS:
+                return APIResponse.error(
+                    message='Speed harus salah satu dari: ' + ', '.join(SPEED_PRESETS),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            try:
+                interval_paths = int(interval_paths)
+                interval_quantiles = [float(q) for q in interval_quantiles]
+            except (TypeError, ValueError):
+                interval_paths, interval_quantiles = -1, []
+            if not 0 <= interval_paths <= INTERVAL_MAX_PATHS or not interval_quantiles \
+                    or any(not 0 < q < 1 for q in interval_quantiles):
+                return APIResponse.error(
+                    message=f'interval_paths harus 0-{INTERVAL_MAX_PATHS} dan interval_quantiles '
+                            'berupa list angka di antara 0 dan 1',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
             # Convert jenis_kendaraan_id
             jenis_kendaraan = None
             if jenis_kendaraan_id:
@@ -81,7 +127,10 @@ class GeneratePrediksiView(APIView):
                     tahun_prediksi=tahun_prediksi,
                     bulan_prediksi=bulan_prediksi,
                     alpha=float(alpha) if alpha else None,
-                    optimize=optimize
+                    optimize=optimize,
+                    speed=speed,
+                    interval_paths=interval_paths,
+                    interval_quantiles=interval_quantiles
                 )
             elif metode == 'DES':
                 result = PredictionService.predict_des(
@@ -90,7 +139,10 @@ class GeneratePrediksiView(APIView):
                     bulan_prediksi=bulan_prediksi,
                     alpha=float(alpha) if alpha else None,
                     beta=float(beta) if beta else None,
-                    optimize=optimize
+                    optimize=optimize,
+                    speed=speed,
+                    interval_paths=interval_paths,
+                    interval_quantiles=interval_quantiles
                 )
             else:  # TES
                 result = PredictionService.predict_tes(
@@ -101,7 +153,12 @@ class GeneratePrediksiView(APIView):
                     alpha=float(alpha) if alpha else None,
                     beta=float(beta) if beta else None,
                     gamma=float(gamma) if gamma else None,
-                    optimize=optimize
+                    optimize=optimize,
+                    parallel=parallel,
+                    warm_start=warm_start,
+                    speed=speed,
+                    interval_paths=interval_paths,
+                    interval_quantiles=interval_quantiles
                 )
             
             # Get actual value jika sudah ada
@@ -111,7 +168,7 @@ class GeneratePrediksiView(APIView):
             
             if actual_value:
                 result['nilai_aktual'] = actual_value
-                result['error_absolut'] = abs(result['nilai_prediksi'] - actual_value)
+                result['error_absolut'] = abs(float(result['nilai_prediksi']) - actual_value)
                 result['error_persentase'] = (result['error_absolut'] / actual_value * 100) if actual_value > 0 else 0
                 result['akurasi'] = 100 - result['error_persentase']
             
@@ -137,7 +194,10 @@ class GeneratePrediksiView(APIView):
             )
             
             result['id'] = hasil_prediksi.id
-            result['created_at'] = hasil_prediksi.created_at
+            result['created_at'] = hasil_prediksi.tanggal_prediksi
+            
+            if not is_default(compact):
+                result = compact_result(result, **compact)
             
             return APIResponse.success(
                 data=result,
@@ -153,6 +213,157 @@ class GeneratePrediksiView(APIView):
             )
 
 
+class GeneratePrediksiRangeView(APIView):
+    """
+    API endpoint untuk generate prediksi rentang periode (misalnya 12 bulan)
+    POST: Fit model sekali per metode, simpan semua bulan ke database
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    MAX_RANGE_MONTHS = 36
+    
+    def post(self, request):
+        """
+        Generate prediksi untuk rentang periode
+        
+        Body:
+        {
+            "metode": "SES" | "DES" | "TES" | ["SES", "DES", "TES"],
+            "jenis_kendaraan_id": int (optional),
+            "tahun_mulai": int,
+            "bulan_mulai": int,
+            "tahun_akhir": int,
+            "bulan_akhir": int,
+            "seasonal_periods": int (optional, default: 12),
+            "optimize": bool (optional, default: true),
+            "parallel": bool (optional, default: false, khusus TES),
+            "save": bool (optional, default: true),
+            "keterangan": string (optional)
+        }
+        """
+        try:
+            metode = request.data.get('metode', 'TES')
+            jenis_kendaraan_id = request.data.get('jenis_kendaraan_id')
+            tahun_mulai = request.data.get('tahun_mulai')
+            bulan_mulai = request.data.get('bulan_mulai')
+            tahun_akhir = request.data.get('tahun_akhir')
+            bulan_akhir = request.data.get('bulan_akhir')
+            seasonal_periods = int(request.data.get('seasonal_periods', 12))
+            optimize = request.data.get('optimize', True)
+            parallel = request.data.get('parallel', False)
+            save = request.data.get('save', True)
+            keterangan = request.data.get('keterangan', '')
+            
+            # Validasi
+            if not all([tahun_mulai, bulan_mulai, tahun_akhir, bulan_akhir]):
+                return APIResponse.error(
+                    message='Periode awal dan akhir (tahun & bulan) harus diisi',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            tahun_mulai, bulan_mulai = int(tahun_mulai), int(bulan_mulai)
+            tahun_akhir, bulan_akhir = int(tahun_akhir), int(bulan_akhir)
+            n_months = (tahun_akhir - tahun_mulai) * 12 + (bulan_akhir - bulan_mulai) + 1
+            if not (1 <= bulan_mulai <= 12 and 1 <= bulan_akhir <= 12) or n_months < 1:
+                return APIResponse.error(
+                    message='Rentang periode tidak valid',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            if n_months > self.MAX_RANGE_MONTHS:
+                return APIResponse.error(
+                    message=f'Rentang periode maksimal {self.MAX_RANGE_MONTHS} bulan',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            metode_list = metode if isinstance(metode, list) else [metode]
+            metode_list = [m.upper() for m in metode_list]
+            if not metode_list or any(m not in ['SES', 'DES', 'TES'] for m in metode_list):
+                return APIResponse.error(
+                    message='Metode harus salah satu dari: SES, DES, TES',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Convert jenis_kendaraan_id
+            jenis_kendaraan = None
+            if jenis_kendaraan_id:
+                try:
+                    jenis_kendaraan = JenisKendaraan.objects.get(pk=jenis_kendaraan_id)
+                except JenisKendaraan.DoesNotExist:
+                    return APIResponse.error(
+                        message='Jenis kendaraan tidak ditemukan',
+                        status_code=status.HTTP_404_NOT_FOUND
+                    )
+            
+            # Generate prediction (satu fit per metode)
+            results = PredictionService.predict_range(
+                metode_list=metode_list,
+                tahun_mulai=tahun_mulai,
+                bulan_mulai=bulan_mulai,
+                tahun_akhir=tahun_akhir,
+                bulan_akhir=bulan_akhir,
+                jenis_kendaraan_id=jenis_kendaraan_id,
+                seasonal_periods=seasonal_periods,
+                optimize=optimize,
+                parallel=parallel
+            )
+            
+            # Save to database dalam satu transaksi
+            saved_count = 0
+            if save:
+                objects = []
+                for metode_item, result in results.items():
+                    if 'error' in result:
+                        continue
+                    for item in result['prediksi']:
+                        objects.append(HasilPrediksi(
+                            jenis_kendaraan=jenis_kendaraan,
+                            tahun_prediksi=item['tahun_prediksi'],
+                            bulan_prediksi=item['bulan_prediksi'],
+                            metode=metode_item,
+                            nilai_prediksi=item['nilai_prediksi'],
+                            alpha=result.get('alpha'),
+                            beta=result.get('beta'),
+                            gamma=result.get('gamma'),
+                            seasonal_periods=result.get('seasonal_periods') or 12,
+                            mape=result.get('mape'),
+                            mae=result.get('mae'),
+                            rmse=result.get('rmse'),
+                            nilai_aktual=item['nilai_aktual'],
+                            data_training_dari=result.get('data_training_dari'),
+                            data_training_sampai=result.get('data_training_sampai'),
+                            jumlah_data_training=result.get('jumlah_data_training'),
+                            keterangan=keterangan or f'Prediksi rentang {tahun_mulai}-{bulan_mulai:02d} s/d {tahun_akhir}-{bulan_akhir:02d}'
+                        ))
+                
+                with transaction.atomic():
+                    HasilPrediksi.objects.bulk_create(objects)
+                saved_count = len(objects)
+            
+            if all('error' in result for result in results.values()):
+                return APIResponse.error(
+                    message='Gagal generate prediksi untuk semua metode',
+                    errors={m: r['error'] for m, r in results.items()},
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            return APIResponse.success(
+                data={
+                    'results': results,
+                    'jumlah_bulan': n_months,
+                    'saved': saved_count,
+                },
+                message=f'Prediksi {n_months} bulan berhasil dibuat',
+                status_code=status.HTTP_201_CREATED
+            )
+            
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat generate prediksi rentang',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class ComparePrediksiView(APIView):
     """
     API endpoint untuk membandingkan semua metode prediksi
@@ -169,83 +380,67 @@ class ComparePrediksiView(APIView):
         - bulan_prediksi: int (required)
         - jenis_kendaraan_id: int (optional)
         - seasonal_periods: int (optional, default: 12)
+        - concurrent: bool (optional, default: true) - jalankan keempat metode bersamaan
+        - parallel: bool (optional, default: false) - evaluasi konfigurasi TES bersamaan (jika concurrent=false)
+        - budget_ms: int (optional) - mode auto dengan batas waktu: SNAIVE, SES, DES lalu
+          konfigurasi TES selama waktu masih ada (hasil ditandai partial jika terpotong)
+        - fields: str (optional) - field top-level per metode, dipisah koma
+        - include_components: bool (optional, default: true) - false = tanpa array komponen info
+        - encoding: "json" | "f32" | "f64" (optional, default: "json") - array angka sebagai base64
         """
         try:
             tahun_prediksi = request.query_params.get('tahun_prediksi')
             bulan_prediksi = request.query_params.get('bulan_prediksi')
             jenis_kendaraan_id = request.query_params.get('jenis_kendaraan_id')
             seasonal_periods = int(request.query_params.get('seasonal_periods', 12))
+            parallel = request.query_params.get('parallel', '').lower() == 'true'
+            concurrent = request.query_params.get('concurrent', 'true').lower() != 'false'
+            budget_ms = request.query_params.get('budget_ms')
             
             # Validasi
+            try:
+                compact = parse_options(request.query_params)
+            except ValueError as e:
+                return APIResponse.error(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+            
             if not tahun_prediksi or not bulan_prediksi:
                 return APIResponse.error(
                     message='Tahun dan bulan prediksi harus diisi',
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Generate prediksi untuk setiap metode
-            results = {}
-            
-            # SES
-            try:
-                result_ses = PredictionService.predict_ses(
-                    jenis_kendaraan_id=jenis_kendaraan_id,
-                    tahun_prediksi=int(tahun_prediksi),
-                    bulan_prediksi=int(bulan_prediksi),
-                    optimize=True
+            if budget_ms is not None and (not budget_ms.isdigit() or int(budget_ms) <= 0):
+                return APIResponse.error(
+                    message='budget_ms harus bilangan bulat positif',
+                    status_code=status.HTTP_400_BAD_REQUEST
                 )
-                results['SES'] = result_ses
-            except Exception as e:
-                results['SES'] = {'error': str(e)}
             
-            # DES
-            try:
-                result_des = PredictionService.predict_des(
-                    jenis_kendaraan_id=jenis_kendaraan_id,
+            auto = None
+            if budget_ms is not None:
+                # Mode auto: baseline murah dulu, TES selama budget masih tersedia
+                results, actual_value, auto = CompareService.auto_select(
                     tahun_prediksi=int(tahun_prediksi),
                     bulan_prediksi=int(bulan_prediksi),
-                    optimize=True
-                )
-                results['DES'] = result_des
-            except Exception as e:
-                results['DES'] = {'error': str(e)}
-            
-            # TES
-            try:
-                result_tes = PredictionService.predict_tes(
                     jenis_kendaraan_id=jenis_kendaraan_id,
-                    tahun_prediksi=int(tahun_prediksi),
-                    bulan_prediksi=int(bulan_prediksi),
                     seasonal_periods=seasonal_periods,
-                    optimize=True
+                    budget_ms=int(budget_ms)
                 )
-                results['TES'] = result_tes
-            except Exception as e:
-                results['TES'] = {'error': str(e)}
-            
-            # Hybrid
-            try:
-                result_hybrid = HybridPredictionService.predict_hybrid(
+            else:
+                # Generate prediksi untuk setiap metode (history & nilai aktual dimuat sekali,
+                # keempat model di-fit bersamaan)
+                results, actual_value = CompareService.compare(
                     tahun_prediksi=int(tahun_prediksi),
                     bulan_prediksi=int(bulan_prediksi),
                     jenis_kendaraan_id=jenis_kendaraan_id,
-                    training_periods=24,
-                    selected_scenario='base',
-                    return_details=True
+                    seasonal_periods=seasonal_periods,
+                    concurrent=concurrent,
+                    parallel=parallel
                 )
-                results['HYBRID'] = result_hybrid
-            except Exception as e:
-                results['HYBRID'] = {'error': str(e)}
-            
-            # Get actual value
-            actual_value = PredictionService.get_actual_value(
-                int(tahun_prediksi), int(bulan_prediksi), jenis_kendaraan_id
-            )
             
             if actual_value:
                 for key in results:
                     if 'error' not in results[key]:
-                        prediksi = results[key]['nilai_prediksi']
+                        prediksi = float(results[key]['nilai_prediksi'])
                         results[key]['error_absolut'] = abs(prediksi - actual_value)
                         results[key]['error_persentase'] = (results[key]['error_absolut'] / actual_value * 100) if actual_value > 0 else 0
                         results[key]['akurasi'] = 100 - results[key]['error_persentase']
@@ -264,6 +459,14 @@ class ComparePrediksiView(APIView):
                 
                 results['recommendation'] = best_metode
             
+            if auto is not None:
+                results['auto'] = auto
+            
+            if not is_default(compact):
+                for key in results:
+                    if isinstance(results[key], dict) and key != 'auto':
+                        results[key] = compact_result(results[key], **compact)
+            
             return APIResponse.success(
                 data=results,
                 message='Perbandingan metode prediksi berhasil dibuat'
@@ -277,6 +480,236 @@ class ComparePrediksiView(APIView):
             )
 
 
+class BacktestPrediksiView(APIView):
+    """
+    API endpoint untuk backtest rolling-origin (evaluasi out-of-sample)
+    GET: Error per-origin dan leaderboard metode
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    MAX_ORIGINS = 60
+    
+    def get(self, request):
+        """
+        Backtest SES, DES, TES, dan HYBRID pada N bulan terakhir
+        
+        Query params:
+        - jenis_kendaraan_id: int (optional, default: global + semua jenis kendaraan)
+        - origins: int (optional, default: 24) - jumlah bulan terakhir yang dievaluasi
+        - horizon: int (optional, default: 1) - jarak prediksi dari origin
+        - metode: str (optional, default: SES,DES,TES,HYBRID)
+        - seasonal_periods: int (optional, default: 12)
+        - refit_every: int (optional, default: 6) - optimasi ulang parameter setiap N origin
+        - tahun_akhir, bulan_akhir: int (optional) - batas akhir data
+        """
+        try:
+            jenis_kendaraan_id = request.query_params.get('jenis_kendaraan_id') or None
+            origins = int(request.query_params.get('origins', BacktestService.DEFAULT_ORIGINS))
+            horizon = int(request.query_params.get('horizon', 1))
+            seasonal_periods = int(request.query_params.get('seasonal_periods', 12))
+            refit_every = int(request.query_params.get('refit_every', BacktestService.DEFAULT_REFIT_EVERY))
+            tahun_akhir = request.query_params.get('tahun_akhir')
+            bulan_akhir = request.query_params.get('bulan_akhir')
+            metode = request.query_params.get('metode', '')
+            methods = [m.strip().upper() for m in metode.split(',') if m.strip()] or BacktestService.METHODS
+            
+            # Validasi
+            if not 1 <= origins <= self.MAX_ORIGINS:
+                return APIResponse.error(
+                    message=f'Jumlah origin harus antara 1 dan {self.MAX_ORIGINS}',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            invalid = [m for m in methods if m not in BacktestService.METHODS]
+            if invalid:
+                return APIResponse.error(
+                    message='Metode harus salah satu dari: ' + ', '.join(BacktestService.METHODS),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            try:
+                result = BacktestService.backtest(
+                    jenis_kendaraan_id=int(jenis_kendaraan_id) if jenis_kendaraan_id else None,
+                    origins=origins,
+                    horizon=horizon,
+                    methods=methods,
+                    seasonal_periods=seasonal_periods,
+                    refit_every=refit_every,
+                    tahun_akhir=int(tahun_akhir) if tahun_akhir else None,
+                    bulan_akhir=int(bulan_akhir) if bulan_akhir else None
+                )
+            except ValueError as e:
+                return APIResponse.error(
+                    message=str(e),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Series global (None) lebih dulu, lalu per jenis kendaraan
+            nama_jenis = dict(JenisKendaraan.objects.values_list('id', 'nama'))
+            series = []
+            for key in sorted(result['series'], key=lambda k: (k is not None, k or 0)):
+                series.append({
+                    'jenis_kendaraan_id': key,
+                    'jenis_kendaraan_nama': nama_jenis.get(key, 'Semua') if key is not None else 'Semua',
+                    **result['series'][key]
+                })
+            
+            return APIResponse.success(
+                data={
+                    'leaderboard': result['leaderboard'],
+                    'series': series,
+                    'info': result['info'],
+                },
+                message='Backtest metode prediksi berhasil dibuat'
+            )
+            
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat menjalankan backtest',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ReconcilePrediksiView(APIView):
+    """
+    API endpoint untuk prediksi koheren seluruh hierarki jenis kendaraan
+    GET: Base forecast TES global & per-jenis beserta hasil rekonsiliasinya
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        """
+        Prediksi global dan semua jenis kendaraan dalam satu batch, lalu direkonsiliasi
+        sehingga prediksi global = jumlah prediksi per jenis kendaraan
+        
+        Query params:
+        - tahun_prediksi: int (required)
+        - bulan_prediksi: int (required)
+        - metode: "bottom_up" | "ols" | "mint_wls" (optional, default: "mint_wls")
+        - horizon: int (optional, default: 1, maks 12) - jumlah bulan mulai dari periode target
+        - seasonal_periods: int (optional, default: 12)
+        """
+        try:
+            tahun_prediksi = request.query_params.get('tahun_prediksi')
+            bulan_prediksi = request.query_params.get('bulan_prediksi')
+            metode = request.query_params.get('metode', ReconciliationService.DEFAULT_METHOD).lower()
+            horizon = int(request.query_params.get('horizon', 1))
+            seasonal_periods = int(request.query_params.get('seasonal_periods', 12))
+            
+            # Validasi
+            if not tahun_prediksi or not bulan_prediksi:
+                return APIResponse.error(
+                    message='Tahun dan bulan prediksi harus diisi',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            if metode not in ReconciliationService.METHODS:
+                return APIResponse.error(
+                    message='Metode rekonsiliasi harus salah satu dari: ' + ', '.join(ReconciliationService.METHODS),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            if not 1 <= horizon <= ReconciliationService.MAX_HORIZON:
+                return APIResponse.error(
+                    message=f'Horizon harus antara 1 dan {ReconciliationService.MAX_HORIZON}',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            try:
+                result = ReconciliationService.predict_hierarchy(
+                    tahun_prediksi=int(tahun_prediksi),
+                    bulan_prediksi=int(bulan_prediksi),
+                    horizon=horizon,
+                    method=metode,
+                    seasonal_periods=seasonal_periods
+                )
+            except ValueError as e:
+                return APIResponse.error(
+                    message=str(e),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            nama_jenis = dict(JenisKendaraan.objects.values_list('id', 'nama'))
+            for node in result['nodes']:
+                key = node['jenis_kendaraan_id']
+                node['jenis_kendaraan_nama'] = nama_jenis.get(key, 'Semua') if key is not None else 'Semua'
+            
+            return APIResponse.success(
+                data=result,
+                message='Rekonsiliasi prediksi berhasil dibuat'
+            )
+            
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat rekonsiliasi prediksi',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class PrecomputedPrediksiView(APIView):
+    """
+    API endpoint untuk membaca hasil precompute (manage.py precompute_prediksi)
+    GET: Prediksi terbaru untuk (jenis, tahun, bulan, metode) tanpa fitting model
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        """
+        Mengambil hasil precompute terbaru
+        
+        Query params:
+        - tahun_prediksi: int (required)
+        - bulan_prediksi: int (required)
+        - jenis_kendaraan_id: int (optional, default: global)
+        - metode: "SES" | "DES" | "TES" (optional, default: semua metode)
+        """
+        try:
+            tahun_prediksi = request.query_params.get('tahun_prediksi')
+            bulan_prediksi = request.query_params.get('bulan_prediksi')
+            jenis_kendaraan_id = request.query_params.get('jenis_kendaraan_id') or None
+            metode = request.query_params.get('metode', '').upper() or None
+            
+            # Validasi
+            if not tahun_prediksi or not bulan_prediksi:
+                return APIResponse.error(
+                    message='Tahun dan bulan prediksi harus diisi',
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            if metode is not None and metode not in PrecomputeService.METHODS:
+                return APIResponse.error(
+                    message='Metode harus salah satu dari: ' + ', '.join(PrecomputeService.METHODS),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            hasil = PrecomputeService.get_latest(
+                tahun_prediksi=int(tahun_prediksi),
+                bulan_prediksi=int(bulan_prediksi),
+                jenis_kendaraan_id=int(jenis_kendaraan_id) if jenis_kendaraan_id else None,
+                metode=metode
+            )
+            
+            if not hasil:
+                return APIResponse.error(
+                    message='Hasil precompute untuk periode ini tidak ditemukan',
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            
+            return APIResponse.success(
+                data=HasilPrediksiSerializer(hasil, many=True).data,
+                message='Hasil precompute berhasil diambil'
+            )
+            
+        except Exception as e:
+            return APIResponse.error(
+                message='Terjadi kesalahan saat mengambil hasil precompute',
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class HybridPrediksiView(APIView):
     """
     API endpoint untuk prediksi menggunakan Hybrid Approach
@@ -295,7 +728,11 @@ class HybridPrediksiView(APIView):
             "bulan_prediksi": int,
             "training_periods": int (optional, default: 24),
             "selected_scenario": str (optional, default: "base"),
-            "save_to_db": bool (optional, default: false)
+            "speed": "fast" | "balanced" | "accurate" (optional, default: "accurate") - preset optimizer TES,
+            "save_to_db": bool (optional, default: false),
+            "fields": [str] | "a,b" (optional) - hanya field top-level ini yang dikirim,
+            "include_components": bool (optional, default: true) - false = tanpa array komponen info,
+            "encoding": "json" | "f32" | "f64" (optional, default: "json") - array angka sebagai base64
         }
         """
         try:
@@ -304,15 +741,27 @@ class HybridPrediksiView(APIView):
             bulan_prediksi = request.data.get('bulan_prediksi')
             training_periods = request.data.get('training_periods', 24)
             selected_scenario = request.data.get('selected_scenario', 'base')
+            speed = request.data.get('speed', DEFAULT_SPEED)
             save_to_db = request.data.get('save_to_db', False)
             
             # Validasi
+            try:
+                compact = parse_options(request.data)
+            except ValueError as e:
+                return APIResponse.error(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+            
             if not tahun_prediksi or not bulan_prediksi:
                 return APIResponse.error(
                     message='Tahun dan bulan prediksi harus diisi',
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
             
+            if speed not in SPEED_PRESETS:
+                return APIResponse.error(
+                    message='Speed harus salah satu dari: ' + ', '.join(SPEED_PRESETS),
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
             if selected_scenario not in ['conservative', 'base', 'moderate', 'optimistic']:
                 selected_scenario = 'base'
             
@@ -334,7 +783,8 @@ class HybridPrediksiView(APIView):
                 jenis_kendaraan_id=jenis_kendaraan_id,
                 training_periods=training_periods,
                 selected_scenario=selected_scenario,
-                return_details=True
+                return_details=True,
+                speed=speed
             )
             
             # Save to database jika diminta
@@ -360,7 +810,10 @@ class HybridPrediksiView(APIView):
                 )
                 
                 result['id'] = hasil_prediksi.id
-                result['created_at'] = hasil_prediksi.created_at
+                result['created_at'] = hasil_prediksi.tanggal_prediksi
+            
+            if not is_default(compact):
+                result = compact_result(result, **compact)
             
             return APIResponse.success(
                 data=result,